@@ -18,6 +18,8 @@ const MAX_HISTORY = 10;
 // Store loaded prompts
 let availablePrompts = [];
 let currentPrompt = 'normal';
+// True when prompts come from the server registry (only the prompt ID is sent)
+let promptsFromServer = false;
 
 // Store last sent content for quick resend
 let lastSentContent = null;
@@ -123,12 +125,42 @@ function handleResend() {
     sendRequest(lastSentContent);
 }
 
+/**
+ * Check whether a prompt triggers AI processing
+ * @param {object} promptInfo - Prompt entry from the registry or prompts.json
+ * @returns {boolean}
+ */
+function isAIPrompt(promptInfo) {
+    return Boolean(promptInfo && promptInfo.id !== 'normal' &&
+        (promptInfo.ai_processing || promptInfo.prompt));
+}
+
+/**
+ * Fetch the prompt list, preferring the server registry (no prompt bodies)
+ * and falling back to the static prompts.json
+ */
+async function fetchPrompts() {
+    try {
+        const response = await fetch('/prompts');
+        const data = await response.json();
+        if (data.prompts && data.prompts.length) {
+            promptsFromServer = true;
+            return data.prompts;
+        }
+    } catch (error) {
+        console.warn('Prompt registry unavailable, using prompts.json:', error);
+    }
+
+    promptsFromServer = false;
+    const response = await fetch('/static/config/prompts.json');
+    const data = await response.json();
+    return data.prompts;
+}
+
 // Load prompts configuration
 async function loadPrompts() {
     try {
-        const response = await fetch('/static/config/prompts.json');
-        const data = await response.json();
-        availablePrompts = data.prompts;
+        availablePrompts = await fetchPrompts();
 
         // Clear existing options
         promptSelect.innerHTML = '';
@@ -165,6 +197,9 @@ window.onload = function() {
         input.focus();
     });
 
+    // Open the WebSocket channel (HTTP is used until it is ready)
+    channel.connect();
+
     // Load last sent content for resend area
     loadLastSentContent();
     renderResendArea();
@@ -299,6 +334,135 @@ function handleSwipe() {
     }
 }
 
+// WebSocket channel
+// Messages go over one persistent socket when it is open; otherwise (or when
+// the server only speaks HTTP) they fall back to POST /type.
+const WS_HEARTBEAT_MS = 15000;
+const WS_RESULT_TIMEOUT_MS = 90000;
+const WS_MAX_BACKOFF_MS = 10000;
+const WS_MAX_FAILURES = 5;
+
+const channel = {
+    socket: null,
+    session: sessionStorage.getItem('wsSession'),
+    ready: false,
+    pending: new Map(),
+    backoff: 1000,
+    failures: 0,
+    heartbeatTimer: null,
+    lastPong: 0,
+    nextId: 0,
+
+    connect() {
+        if (!('WebSocket' in window)) return;
+        const scheme = location.protocol === 'https:' ? 'wss' : 'ws';
+        const socket = new WebSocket(`${scheme}://${location.host}/ws`);
+        this.socket = socket;
+
+        socket.onopen = () => {
+            socket.send(JSON.stringify({ type: 'hello', session: this.session }));
+        };
+        socket.onmessage = (event) => this.onFrame(JSON.parse(event.data));
+        socket.onclose = () => {
+            if (!this.ready) this.failures++;
+            this.ready = false;
+            clearInterval(this.heartbeatTimer);
+            // Server without a WebSocket endpoint: stay on HTTP
+            if (this.failures >= WS_MAX_FAILURES && this.pending.size === 0) return;
+            if (this.socket === socket) {
+                setTimeout(() => this.connect(), this.backoff);
+                this.backoff = Math.min(this.backoff * 2, WS_MAX_BACKOFF_MS);
+            }
+        };
+    },
+
+    onFrame(frame) {
+        if (frame.type === 'welcome') {
+            this.session = frame.session;
+            sessionStorage.setItem('wsSession', frame.session);
+            this.ready = true;
+            this.backoff = 1000;
+            this.failures = 0;
+            this.startHeartbeat();
+            // Resume: re-send messages that never got a result; the server
+            // replays stored results instead of typing them twice
+            for (const [id, entry] of this.pending) {
+                this.socket.send(JSON.stringify({ type: 'send', id: id, body: entry.body }));
+            }
+        } else if (frame.type === 'pong') {
+            this.lastPong = Date.now();
+        } else if (frame.type === 'progress' || frame.type === 'error') {
+            const entry = this.pending.get(frame.id);
+            if (entry && entry.onProgress) entry.onProgress(frame);
+        } else if (frame.type === 'result' || frame.type === 'busy') {
+            const entry = this.pending.get(frame.id);
+            if (entry) {
+                this.pending.delete(frame.id);
+                clearTimeout(entry.timer);
+                entry.resolve(frame.data);
+            }
+        }
+    },
+
+    startHeartbeat() {
+        clearInterval(this.heartbeatTimer);
+        this.lastPong = Date.now();
+        this.heartbeatTimer = setInterval(() => {
+            if (Date.now() - this.lastPong > WS_HEARTBEAT_MS * 2) {
+                // Connection silently dropped (e.g. Wi-Fi switch): reconnect
+                this.socket.close();
+                return;
+            }
+            this.socket.send(JSON.stringify({ type: 'ping', t: Date.now() }));
+        }, WS_HEARTBEAT_MS);
+    },
+
+    send(body, onProgress) {
+        return new Promise((resolve, reject) => {
+            const id = `${Date.now().toString(36)}-${(this.nextId++).toString(36)}`;
+            const timer = setTimeout(() => {
+                this.pending.delete(id);
+                // Not a network error: the server may still finish and paste,
+                // so callers must not resend the text
+                const error = new Error('Result timed out');
+                error.timedOut = true;
+                reject(error);
+            }, WS_RESULT_TIMEOUT_MS);
+            this.pending.set(id, { body, resolve, reject, onProgress, timer });
+            this.socket.send(JSON.stringify({ type: 'send', id: id, body: body }));
+        });
+    }
+};
+
+/**
+ * Send a /type request over the WebSocket channel, or HTTP as a fallback
+ * @param {Object} body - Request body (same fields as POST /type)
+ * @param {Function} [onProgress] - Called with progress frames (WebSocket only)
+ * @returns {Promise<Object>} The /type response
+ */
+function postType(body, onProgress) {
+    if (channel.ready) {
+        return channel.send(body, onProgress);
+    }
+    return fetch('/type', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(body)
+    }).then(response => response.json());
+}
+
+// Loading text for each /type stage event pushed by the server
+const STAGE_MESSAGES = {
+    queued: '排队中...',
+    ai_started: 'AI处理中...',
+    first_token: 'AI输出中...',
+    ai_done: '正在粘贴...',
+    clipboard_set: '正在粘贴...',
+    pasted: '已粘贴',
+    submitted: '已提交',
+    error: 'AI输出中断，正在粘贴原文...'
+};
+
 // Core functions
 function handleSend() {
     // Prevent submission if already loading
@@ -331,7 +495,7 @@ function sendRequest(text) {
     let loadingMessage = "发送中...";
 
     // Determine loading message based on processing mode
-    if (promptInfo && promptInfo.prompt && promptInfo.id !== 'normal') {
+    if (isAIPrompt(promptInfo)) {
         loadingMessage = "AI处理中...";
         if (braveMode) {
             loadingMessage = "AI处理中... (勇敢模式)";
@@ -344,8 +508,11 @@ function sendRequest(text) {
     const requestBody = { text: text };
 
     // Add AI processing parameters if not in normal mode
-    if (promptInfo && promptInfo.prompt && promptInfo.id !== 'normal') {
-        requestBody.prompt = promptInfo.prompt;
+    if (isAIPrompt(promptInfo)) {
+        // The server resolves the prompt body from its registry by ID
+        if (!promptsFromServer) {
+            requestBody.prompt = promptInfo.prompt;
+        }
         requestBody.mode = promptInfo.id;
         requestBody.provider = 'zai';
     }
@@ -354,12 +521,11 @@ function sendRequest(text) {
         requestBody.auto_submit = true;
     }
 
-    fetch('/type', {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify(requestBody)
+    postType(requestBody, (frame) => {
+        if (STAGE_MESSAGES[frame.stage]) {
+            loadingText.textContent = `${STAGE_MESSAGES[frame.stage]} (${(frame.elapsed_ms / 1000).toFixed(1)}s)`;
+        }
     })
-    .then(response => response.json())
     .then(data => {
         hideLoading();
 
@@ -387,12 +553,39 @@ function sendRequest(text) {
                 input.focus();
             }, 1500);
         } else {
-            throw new Error(data.error || "Server error");
+            const error = new Error(data.error || "Server error");
+            error.busy = data.busy;
+            throw error;
         }
     })
     .catch(err => {
         hideLoading();
 
+        // Server injection queue is full: nothing was typed, just retry later
+        if (err.busy) {
+            status.innerText = "✕ 服务繁忙，请稍后重试";
+            status.style.color = "#ff3b30";
+            setTimeout(() => {
+                status.innerText = "";
+                input.focus();
+            }, 2000);
+            updateLastSentContent(text);
+            return;
+        }
+
+        // No result in time, but the request may still be pasted: never
+        // offer to resend it
+        if (err.timedOut) {
+            status.innerText = "… 仍在处理中，请留意目标窗口";
+            status.style.color = "#ff9500";
+            setTimeout(() => {
+                status.innerText = "";
+                input.focus();
+            }, 3000);
+            updateLastSentContent(text);
+            return;
+        }
+
         // Check if it's a network error
         if (err.message === 'Failed to fetch' || err.name === 'TypeError') {
             status.innerText = "✕ 网络错误，请检查连接";
@@ -436,12 +629,7 @@ function sendPlainRequest(text, braveMode) {
         auto_submit: braveMode
     };
 
-    fetch('/type', {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify(plainRequestBody)
-    })
-    .then(response => response.json())
+    postType(plainRequestBody)
     .then(data => {
         hideLoading();
 
@@ -455,9 +643,9 @@ function sendPlainRequest(text, braveMode) {
             }, 1500);
         }
     })
-    .catch(() => {
+    .catch(err => {
         hideLoading();
-        status.innerText = "✕ 发送失败";
+        status.innerText = err.timedOut ? "… 仍在处理中，请留意目标窗口" : "✕ 发送失败";
         status.style.color = "#ff3b30";
         setTimeout(() => {
             status.innerText = "";
@@ -4,5 +4,24 @@ from .processor import AIProcessor
 from .processing_service import ProcessingService
 from .zai_processor import ZAIProcessor
 from .anthropic_processor import AnthropicProcessor
+from .session_pool import SessionPool
+from .result_cache import ResultCache
+from .latency import LatencyTracker
+from .circuit_breaker import CircuitBreaker
+from .prompt_registry import PromptRegistry, PromptTemplate
+from .token_budget import TokenBudget, estimate_tokens
 
-__all__ = ['AIProcessor', 'ProcessingService', 'ZAIProcessor', 'AnthropicProcessor']
\ No newline at end of file
+__all__ = [
+    'AIProcessor',
+    'ProcessingService',
+    'ZAIProcessor',
+    'AnthropicProcessor',
+    'SessionPool',
+    'ResultCache',
+    'LatencyTracker',
+    'CircuitBreaker',
+    'PromptRegistry',
+    'PromptTemplate',
+    'TokenBudget',
+    'estimate_tokens',
+]
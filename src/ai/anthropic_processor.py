@@ -1,9 +1,11 @@
 import os
 import asyncio
-from typing import Optional
+from typing import AsyncIterator, Optional
 import aiohttp
 import json
 from .processor import AIProcessor
+from .streaming import iter_text_deltas
+from .prompt_registry import render_user_message
 
 
 class AnthropicProcessor(AIProcessor):
@@ -23,18 +25,49 @@ class AnthropicProcessor(AIProcessor):
         self.base_url = base_url or os.getenv("ANTHROPIC_API_BASE_URL", "https://api.anthropic.com/v1/messages")
         self.timeout = int(os.getenv("AI_PROCESSING_TIMEOUT", "30"))
         self.max_tokens = 4000  # Claude's max tokens limit
+        self.temperature = 0.7
 
     def is_configured(self) -> bool:
         """Check if processor has valid API key"""
         return bool(self.api_key)
 
-    async def process_text(self, text: str, prompt: str) -> Optional[str]:
+    def _build_payload(self, text: str, prompt: str, stream: bool = False, max_tokens: Optional[int] = None) -> dict:
+        """Build the Messages API request payload"""
+        # Prepare the full message
+        user_message = render_user_message(prompt, text)
+
+        # Prepare request payload for Claude API
+        payload = {
+            "model": self.model,
+            "max_tokens": max_tokens or self.max_tokens,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": user_message
+                }
+            ],
+            "temperature": self.temperature
+        }
+        if stream:
+            payload["stream"] = True
+        return payload
+
+    def _build_headers(self) -> dict:
+        """Build the Messages API request headers"""
+        return {
+            "x-api-key": self.api_key,
+            "anthropic-version": "2023-06-01",
+            "Content-Type": "application/json"
+        }
+
+    async def process_text(self, text: str, prompt: str, max_tokens: Optional[int] = None) -> Optional[str]:
         """
         Process text using Anthropic API
 
         Args:
             text: Input text to process
             prompt: Processing prompt
+            max_tokens: Output token budget (uses self.max_tokens if None)
 
         Returns:
             Processed text or None if failed
@@ -47,37 +80,22 @@ class AnthropicProcessor(AIProcessor):
             return text
 
         try:
-            # Prepare the full message
-            user_message = prompt.replace("{user_input}", f"<user_input>\n{text}\n</user_input>")
-
-            # Prepare request payload for Claude API
-            payload = {
-                "model": self.model,
-                "max_tokens": self.max_tokens,
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": user_message
-                    }
-                ],
-                "temperature": 0.7
-            }
-
-            headers = {
-                "x-api-key": self.api_key,
-                "anthropic-version": "2023-06-01",
-                "Content-Type": "application/json"
-            }
+            payload = self._build_payload(text, prompt, max_tokens=max_tokens)
+            headers = self._build_headers()
 
             # Make async request with retries
             max_retries = 2
             for attempt in range(max_retries + 1):
                 try:
-                    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout)) as session:
-                        async with session.post(self.base_url, json=payload, headers=headers) as response:
+                    async with self.open_session(self.base_url) as session:
+                        async with session.post(self.base_url, json=payload, headers=headers,
+                                                timeout=aiohttp.ClientTimeout(total=self.attempt_timeout())) as response:
                             if response.status == 200:
                                 data = await response.json()
 
+                                if self.is_truncated(data):
+                                    return await self._retry_truncated(text, prompt, payload["max_tokens"])
+
                                 # Extract processed text from Claude response
                                 if "content" in data and data["content"]:
                                     if data["content"][0]["type"] == "text":
@@ -97,6 +115,7 @@ class AnthropicProcessor(AIProcessor):
                             elif response.status == 429:
                                 # Rate limited, wait and retry
                                 if attempt < max_retries:
+                                    self.retries += 1
                                     await asyncio.sleep(2 ** attempt)  # Exponential backoff
                                     continue
                                 print("[Anthropic Error] Rate limit exceeded")
@@ -115,6 +134,7 @@ class AnthropicProcessor(AIProcessor):
                                 error_text = await response.text()
                                 print(f"[Anthropic Error] HTTP {response.status}: {error_text}")
                                 if attempt < max_retries:
+                                    self.retries += 1
                                     await asyncio.sleep(1)
                                     continue
                                 return None
@@ -122,6 +142,7 @@ class AnthropicProcessor(AIProcessor):
                 except asyncio.TimeoutError:
                     if attempt < max_retries:
                         print(f"[Anthropic Error] Request timed out, retrying... (attempt {attempt + 1}/{max_retries})")
+                        self.retries += 1
                         await asyncio.sleep(1)
                         continue
                     print("[Anthropic Error] Request timed out after retries")
@@ -131,6 +152,48 @@ class AnthropicProcessor(AIProcessor):
             print(f"[Anthropic Error] Processing failed: {str(e)}")
             return None
 
+    async def _retry_truncated(self, text: str, prompt: str, max_tokens: int) -> Optional[str]:
+        """Retry a truncated request once at the model cap; None if that is cut off too"""
+        if max_tokens < self.max_tokens:
+            print(f"[Anthropic] Output truncated at max_tokens={max_tokens}, retrying with {self.max_tokens}")
+            return await self.process_text(text, prompt, max_tokens=self.max_tokens)
+        print(f"[Anthropic Error] Output truncated at max_tokens={max_tokens}")
+        return None
+
+    async def stream_text(self, text: str, prompt: str, max_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        """
+        Process text using Anthropic API, yielding output as it is generated
+
+        Args:
+            text: Input text to process
+            prompt: Processing prompt
+            max_tokens: Output token budget (uses self.max_tokens if None)
+
+        Yields:
+            Fragments of processed text
+        """
+        if not self.is_configured():
+            raise ValueError("Anthropic API key not configured")
+
+        if not prompt:
+            yield text
+            return
+
+        payload = self._build_payload(text, prompt, stream=True, max_tokens=max_tokens)
+        async with self.open_session(self.base_url) as session:
+            async with session.post(self.base_url, json=payload, headers=self._build_headers(),
+                                    # No total limit: a steady stream may outlast it; stalls are
+                                    # caught per read here and per fragment by the service
+                                    timeout=aiohttp.ClientTimeout(total=None, sock_connect=self.attempt_timeout(),
+                                                                  sock_read=self.timeout)) as response:
+                if response.status != 200:
+                    error_text = await response.text()
+                    print(f"[Anthropic Error] Stream HTTP {response.status}: {error_text}")
+                    return
+
+                async for delta in iter_text_deltas(response):
+                    yield delta
+
     async def __aenter__(self):
         return self
 
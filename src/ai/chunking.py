@@ -0,0 +1,137 @@
+import re
+from dataclasses import dataclass
+from typing import List, Tuple
+
+from .streaming import SENTENCE_END
+
+
+PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+WHITESPACE = re.compile(r"\s")
+
+
+@dataclass
+class TextChunk:
+    """A piece of a long input and the separator that follows it"""
+    text: str
+    joiner: str = ""
+
+
+def _hard_split(sentence: str, max_chars: int) -> List[Tuple[str, bool]]:
+    """
+    Split a run-on sentence without any terminator into pieces of at most
+    max_chars, at the last whitespace before the limit
+
+    Text without whitespace (CJK, long URLs) is cut between characters;
+    such pieces are flagged so they are joined back without a separator.
+
+    Returns:
+        (piece, glued) pairs; glued means the piece continues the previous
+        one directly
+    """
+    pieces = []
+    glued = False
+    while len(sentence) > max_chars:
+        cut = None
+        for match in WHITESPACE.finditer(sentence, 1, max_chars + 1):
+            cut = match.start()
+        if cut is None:
+            pieces.append((sentence[:max_chars], glued))
+            sentence = sentence[max_chars:]
+            glued = True
+        else:
+            pieces.append((sentence[:cut], glued))
+            sentence = sentence[cut:]
+            glued = False
+    pieces.append((sentence, glued))
+    return pieces
+
+
+def _sentences(paragraph: str, max_chars: int) -> List[Tuple[str, bool]]:
+    """
+    Split a paragraph into sentences no longer than max_chars
+
+    Returns:
+        (sentence, glued) pairs, see _hard_split()
+    """
+    sentences = []
+    start = 0
+    for match in SENTENCE_END.finditer(paragraph):
+        sentences.append(paragraph[start:match.end()])
+        start = match.end()
+    if start < len(paragraph):
+        sentences.append(paragraph[start:])
+
+    pieces = []
+    for sentence in sentences:
+        for piece, glued in _hard_split(sentence, max_chars):
+            if piece.strip():
+                pieces.append((piece, glued))
+    return pieces
+
+
+def _sentence_joiner(left: str, right: str) -> str:
+    """Separator between two sentences that were processed separately"""
+    if not left or not right:
+        return ""
+    # CJK text needs no space between sentences; Latin text does
+    if ord(left[-1]) > 0x2E7F or ord(right[0]) > 0x2E7F:
+        return ""
+    return " "
+
+
+def split_text(text: str, max_chars: int) -> List[TextChunk]:
+    """
+    Split a long input into chunks on paragraph, then sentence, boundaries
+
+    Paragraphs are packed together up to max_chars; paragraphs that are
+    longer are split between sentences.
+
+    Args:
+        text: Input text
+        max_chars: Target maximum chunk length in characters
+
+    Returns:
+        Chunks in order; joining ``chunk.text + chunk.joiner`` restores the
+        structure of the input
+    """
+    text = text.strip()
+    if len(text) <= max_chars:
+        return [TextChunk(text)]
+
+    chunks: List[TextChunk] = []
+    current = ""
+
+    def emit(piece: str, joiner: str):
+        chunks.append(TextChunk(piece.strip(), joiner))
+
+    for paragraph in PARAGRAPH_BREAK.split(text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+
+        if len(paragraph) > max_chars:
+            if current:
+                emit(current, "\n\n")
+                current = ""
+            sentences = _sentences(paragraph, max_chars)
+            buffer = ""
+            for sentence, glued in sentences:
+                if buffer and len(buffer) + len(sentence) > max_chars:
+                    emit(buffer, "" if glued else _sentence_joiner(buffer.strip(), sentence.strip()))
+                    buffer = ""
+                buffer += sentence
+            if buffer:
+                emit(buffer, "\n\n")
+            continue
+
+        if current and len(current) + 2 + len(paragraph) > max_chars:
+            emit(current, "\n\n")
+            current = ""
+        current = f"{current}\n\n{paragraph}" if current else paragraph
+
+    if current:
+        emit(current, "\n\n")
+
+    if chunks:
+        chunks[-1].joiner = ""
+    return chunks
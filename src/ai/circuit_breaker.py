@@ -0,0 +1,108 @@
+import os
+import time
+import threading
+from typing import Dict, Optional
+
+
+class CircuitBreaker:
+    """Per-provider circuit breaker.
+
+    closed     -> requests flow normally; consecutive failures are counted
+    open       -> requests are rejected immediately until the cooldown ends
+    half_open  -> a limited number of trial requests probe the provider;
+                  a success closes the circuit, a failure re-opens it
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: Optional[int] = None, cooldown: Optional[float] = None,
+                 half_open_trials: Optional[int] = None):
+        """
+        Initialize circuit breaker
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+                (if None, will try to get from environment)
+            cooldown: Seconds the circuit stays open before probing
+                (if None, will try to get from environment)
+            half_open_trials: Concurrent trial requests allowed while half-open
+                (if None, will try to get from environment)
+        """
+        self.failure_threshold = failure_threshold or int(os.getenv("AI_CIRCUIT_FAILURE_THRESHOLD", "3"))
+        self.cooldown = cooldown or float(os.getenv("AI_CIRCUIT_COOLDOWN", "30"))
+        self.half_open_trials = half_open_trials or int(os.getenv("AI_CIRCUIT_HALF_OPEN_TRIALS", "1"))
+
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trials_in_flight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Current state, moving from open to half-open once the cooldown ends"""
+        with self._lock:
+            self._refresh()
+            return self._state
+
+    def _refresh(self):
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.cooldown:
+            self._state = self.HALF_OPEN
+            self._trials_in_flight = 0
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a request may be sent now
+
+        In the half-open state this reserves one of the trial slots, so
+        every allowed request must be followed by record_success() or
+        record_failure().
+
+        Returns:
+            True if the request may proceed
+        """
+        with self._lock:
+            self._refresh()
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and self._trials_in_flight < self.half_open_trials:
+                self._trials_in_flight += 1
+                return True
+            return False
+
+    def record_success(self):
+        """Record a successful request, closing the circuit"""
+        with self._lock:
+            if self._state != self.CLOSED:
+                print("[CircuitBreaker] Provider recovered, closing circuit")
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trials_in_flight = 0
+
+    def record_failure(self):
+        """Record a failed request, opening the circuit when the threshold is reached"""
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    print(f"[CircuitBreaker] Opening circuit for {self.cooldown:.0f}s after {self._failures} failures")
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._trials_in_flight = 0
+
+    def release(self):
+        """Give back a half-open trial slot for a request that was abandoned"""
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._trials_in_flight > 0:
+                self._trials_in_flight -= 1
+
+    def snapshot(self) -> Dict[str, object]:
+        """Return the breaker state for reporting"""
+        with self._lock:
+            self._refresh()
+            return {
+                "state": self._state,
+                "consecutive_failures": self._failures,
+            }
@@ -0,0 +1,45 @@
+import threading
+from collections import deque
+from typing import Optional
+
+
+class LatencyTracker:
+    """Rolling window of recent request latencies for one provider"""
+
+    def __init__(self, window: int = 100):
+        """
+        Initialize latency tracker
+
+        Args:
+            window: Number of most recent samples to keep
+        """
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        """Record one successful request latency in seconds"""
+        with self._lock:
+            self._samples.append(seconds)
+
+    def count(self) -> int:
+        """Number of samples currently in the window"""
+        with self._lock:
+            return len(self._samples)
+
+    def percentile(self, p: float, min_samples: int = 1) -> Optional[float]:
+        """
+        Get a latency percentile over the window
+
+        Args:
+            p: Percentile in the range 0-100
+            min_samples: Return None until at least this many samples exist
+
+        Returns:
+            Latency in seconds, or None if there are too few samples
+        """
+        with self._lock:
+            if len(self._samples) < max(min_samples, 1):
+                return None
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))
+        return ordered[index]
@@ -1,7 +1,17 @@
 import os
+import time
 import asyncio
-from typing import Optional, Dict, Type
+import threading
+from typing import AsyncIterator, Optional, Dict, List, Tuple, Type
+import aiohttp
 from .processor import AIProcessor
+from .session_pool import SessionPool
+from .result_cache import ResultCache
+from .latency import LatencyTracker
+from .circuit_breaker import CircuitBreaker
+from .token_budget import TokenBudget
+from .chunking import TextChunk, split_text
+from .streaming import SentenceBuffer, StreamInterrupted
 from .zai_processor import ZAIProcessor
 from .anthropic_processor import AnthropicProcessor
 
@@ -9,13 +19,73 @@ from .anthropic_processor import AnthropicProcessor
 class ProcessingService:
     """Service for managing AI text processing"""
 
-    def __init__(self):
-        """Initialize processing service with available processors"""
+    def __init__(self, data_dir: Optional[str] = None):
+        """
+        Initialize processing service with available processors
+
+        Args:
+            data_dir: Application data directory for the persistent result
+                cache (memory-only cache if None)
+        """
         self.processors: Dict[str, Type[AIProcessor]] = {}
         self._instances: Dict[str, AIProcessor] = {}
         self.default_provider = os.getenv("AI_PROCESSOR_DEFAULT", "anthropic")
         self.timeout = int(os.getenv("AI_PROCESSING_TIMEOUT", "30"))
 
+        # Shared keep-alive connection pools, owned by a persistent event loop
+        # so connections survive across requests (each Flask async view runs
+        # on its own throwaway loop)
+        self.session_pool = SessionPool()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._loop_lock = threading.Lock()
+
+        # Result cache for repeated (provider, model, prompt, text) requests
+        self.cache: Optional[ResultCache] = None
+        if os.getenv("AI_CACHE_ENABLED", "true").lower() == "true":
+            db_path = None
+            if data_dir and os.getenv("AI_CACHE_PERSIST", "false").lower() == "true":
+                db_path = os.path.join(data_dir, "ai_cache.sqlite3")
+            self.cache = ResultCache(db_path=db_path)
+
+        # Hedging: if the primary provider is slower than its own recent p95,
+        # race the same request against the next configured provider
+        self.latency: Dict[str, LatencyTracker] = {}
+        self.hedging_enabled = os.getenv("AI_HEDGING", "true").lower() == "true"
+        self.hedge_percentile = float(os.getenv("AI_HEDGE_PERCENTILE", "95"))
+        self.hedge_default_delay = float(os.getenv("AI_HEDGE_DELAY", "5"))
+        self.hedge_min_delay = float(os.getenv("AI_HEDGE_MIN_DELAY", "1"))
+        hedge_providers = os.getenv("AI_HEDGE_PROVIDERS", "")
+        self.hedge_providers = [p.strip() for p in hedge_providers.split(",") if p.strip()]
+
+        # Circuit breakers fail fast on degraded providers; per-attempt HTTP
+        # timeouts are derived from each provider's observed latency
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.adaptive_timeout = os.getenv("AI_ADAPTIVE_TIMEOUT", "true").lower() == "true"
+        self.adaptive_timeout_factor = float(os.getenv("AI_ADAPTIVE_TIMEOUT_FACTOR", "3"))
+        self.adaptive_timeout_min = float(os.getenv("AI_ADAPTIVE_TIMEOUT_MIN", "5"))
+
+        # Per-request max_tokens sized from input length and prompt mode
+        self.token_budget = TokenBudget()
+
+        # Long inputs in chunk-safe modes are split and processed concurrently
+        self.chunk_chars = int(os.getenv("AI_CHUNK_CHARS", "600"))
+        self.chunk_concurrency = int(os.getenv("AI_CHUNK_CONCURRENCY", "4"))
+        chunk_modes = os.getenv("AI_CHUNK_MODES", "general-refine,translate-en")
+        self.chunk_modes = [m.strip() for m in chunk_modes.split(",") if m.strip()]
+
+        # Single-flight: identical concurrent requests share one provider call
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.coalesced_requests = 0
+
+        # Hedging and circuit breaker rerouting counters
+        self.hedged_requests = 0
+        self.hedge_wins = 0
+        self.rerouted_requests = 0
+
+        # Connection pre-warming state per provider
+        self._warm: Dict[str, Dict[str, object]] = {}
+
         # Register built-in processors
         self.register_processor("anthropic", AnthropicProcessor)
         self.register_processor("zai", ZAIProcessor)
@@ -57,6 +127,10 @@ class ProcessingService:
                 # For future processors, might need different initialization
                 instance = processor_class()
 
+            # Share pooled connections across processors
+            instance.session_pool = self.session_pool
+            instance.timeout_policy = lambda: self._attempt_timeout(provider)
+
             # Cache instance
             self._instances[provider] = instance
             return instance
@@ -65,10 +139,38 @@ class ProcessingService:
             print(f"[ProcessingService] Failed to initialize {provider}: {str(e)}")
             return None
 
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the service event loop thread on first use"""
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(
+                    target=self._run_loop, name="ai-processing-loop", daemon=True
+                )
+                self._loop_thread.start()
+            return self._loop
+
+    def get_event_loop(self) -> asyncio.AbstractEventLoop:
+        """
+        Get the service event loop, starting it if needed
+
+        Other long-lived async components (e.g. the web server) can run on
+        this loop so they share pooled connections with the AI providers.
+        """
+        return self._ensure_loop()
+
+    def _run_loop(self):
+        """Run the service event loop forever"""
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
     async def process(self, text: str, prompt: str, provider: Optional[str] = None, mode: Optional[str] = None) -> Optional[str]:
         """
         Process text with AI
 
+        The call is executed on the service's own event loop so that pooled
+        connections can be reused, whichever loop the caller is running on.
+
         Args:
             text: Input text
             prompt: Processing prompt
@@ -78,6 +180,32 @@ class ProcessingService:
         Returns:
             Processed text or None if failed
         """
+        loop = self._ensure_loop()
+        coro = self._process_coalesced(text, prompt, provider, mode)
+        if asyncio.get_running_loop() is loop:
+            return await coro
+
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        return await asyncio.wrap_future(future)
+
+    async def _process_coalesced(self, text: str, prompt: str, provider: Optional[str],
+                                 mode: Optional[str]) -> Optional[str]:
+        """Run _process(), joining an identical request that is already in flight"""
+        key = ResultCache.make_key(provider or self.default_provider, mode or "", prompt, text, None)
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced_requests += 1
+            print("[AI Processing] Joining identical in-flight request")
+            return await asyncio.shield(inflight)
+
+        task = asyncio.ensure_future(self._process(text, prompt, provider, mode))
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded so one caller going away does not cancel the others
+        return await asyncio.shield(task)
+
+    async def _process(self, text: str, prompt: str, provider: Optional[str], mode: Optional[str]) -> Optional[str]:
+        """Process text with AI on the service event loop"""
         # Log the mode for analytics/debugging purposes
         if mode:
             print(f"[AI Processing] Using mode: {mode}")
@@ -90,31 +218,548 @@ class ProcessingService:
             print("[AI Processing] No prompt provided, returning original text")
             return text
 
-        # Get processor
-        processor = self.get_processor(provider)
+        processor = self._resolve_processor(provider)
         if not processor:
-            print(f"[AI Processing] Unknown provider: {provider}")
             return None
 
-        # Check if processor is configured
-        if not processor.is_configured():
-            print(f"[AI Processing] Provider {provider} not configured")
+        chunks = self._split_for_mode(text, mode)
+        if len(chunks) > 1:
+            return await self._process_chunked(provider, processor, text, chunks, prompt, mode)
+
+        return await self._process_single(provider, processor, text, prompt, mode)
+
+    async def _process_single(self, provider: str, processor: AIProcessor, text: str, prompt: str,
+                              mode: Optional[str]) -> Optional[str]:
+        """Process one piece of text: cache, budget, circuit breaker, hedging and timeout"""
+        cache_key = self._cache_key(provider, processor, prompt, text)
+        if cache_key:
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                print("[AI Processing] Cache hit")
+                return cached
+
+        if not self._fits_context(processor, text, prompt, mode):
+            return None
+
+        selected = self._select_provider(provider, processor)
+        if not selected:
             return None
+        provider, processor = selected
 
         try:
             # Process with timeout
-            result = await asyncio.wait_for(
-                processor.process_text(text, prompt),
+            result, producer = await asyncio.wait_for(
+                self._process_hedged(provider, processor, text, prompt, mode),
                 timeout=self.timeout
             )
+            if result and self.cache is not None:
+                # Keyed by the provider that answered, which differs from the
+                # requested one after a reroute or a won hedge
+                self.cache.put(self._cache_key(producer, self.get_processor(producer), prompt, text), result)
             return result
         except asyncio.TimeoutError:
             print(f"[AI Processing] Processing timed out after {self.timeout} seconds")
+            self.get_circuit_breaker(provider).record_failure()
             return None
         except Exception as e:
             print(f"[AI Processing] Error during processing: {str(e)}")
             return None
 
+    def _select_provider(self, provider: str, processor: AIProcessor) -> Optional[Tuple[str, AIProcessor]]:
+        """
+        Pick the provider to call, rerouting away from an open circuit
+
+        Fails fast (or reroutes) instead of burning the retry ladder on a
+        provider whose circuit is open. On success the chosen provider's
+        breaker has granted the request.
+
+        Returns:
+            (provider, processor) to call, or None if every circuit is open
+        """
+        if self.get_circuit_breaker(provider).allow_request():
+            return provider, processor
+
+        rerouted = next(
+            (name for name in self._hedge_candidates(provider)
+             if self.get_circuit_breaker(name).allow_request()),
+            None
+        )
+        if not rerouted:
+            print(f"[AI Processing] Circuit open for {provider}, failing fast")
+            return None
+        print(f"[AI Processing] Circuit open for {provider}, rerouting to {rerouted}")
+        self.rerouted_requests += 1
+        return rerouted, self.get_processor(rerouted)
+
+    def _split_for_mode(self, text: str, mode: Optional[str]) -> List[TextChunk]:
+        """Split long inputs in chunk-safe modes; other inputs stay whole"""
+        if mode not in self.chunk_modes or len(text) <= self.chunk_chars:
+            return [TextChunk(text)]
+        return split_text(text, self.chunk_chars)
+
+    def _launch_chunks(self, provider: str, processor: AIProcessor, chunks: List[TextChunk],
+                       prompt: str, mode: Optional[str]) -> List[asyncio.Task]:
+        """Start processing all chunks, at most chunk_concurrency at a time"""
+        semaphore = asyncio.Semaphore(max(self.chunk_concurrency, 1))
+
+        async def run(chunk: TextChunk) -> Optional[str]:
+            async with semaphore:
+                return await self._process_single(provider, processor, chunk.text, prompt, mode)
+
+        print(f"[AI Processing] Split input into {len(chunks)} chunks")
+        return [asyncio.ensure_future(run(chunk)) for chunk in chunks]
+
+    @staticmethod
+    def _stitch(chunk: TextChunk, result: Optional[str], index: int) -> str:
+        """Output for one chunk, keeping the original text if processing failed"""
+        if result is None:
+            print(f"[AI Processing] Chunk {index + 1} failed, keeping original text")
+            result = chunk.text
+        return result + chunk.joiner
+
+    async def _process_chunked(self, provider: str, processor: AIProcessor, text: str,
+                               chunks: List[TextChunk], prompt: str, mode: Optional[str]) -> Optional[str]:
+        """
+        Process chunks concurrently and stitch the results back in order
+
+        Each chunk is cached by _process_single() under the provider that
+        answered it, so the stitched output (which may mix providers after
+        a hedge or reroute) is not cached as a whole.
+        """
+        tasks = self._launch_chunks(provider, processor, chunks, prompt, mode)
+        try:
+            results = [await task for task in tasks]
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        if all(result is None for result in results):
+            return None
+
+        return "".join(
+            self._stitch(chunk, result, index)
+            for index, (chunk, result) in enumerate(zip(chunks, results))
+        )
+
+    async def _stream_chunked(self, provider: str, processor: AIProcessor, text: str,
+                              chunks: List[TextChunk], prompt: str, mode: Optional[str]) -> AsyncIterator[str]:
+        """Process chunks concurrently, yielding each as soon as every chunk before it is done"""
+        tasks = self._launch_chunks(provider, processor, chunks, prompt, mode)
+        try:
+            for index, (chunk, task) in enumerate(zip(chunks, tasks)):
+                result = await task
+                if result is None:
+                    if index == 0:
+                        # Nothing pasted yet: let the caller fall back to the raw text
+                        return
+                yield self._stitch(chunk, result, index)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def get_latency_tracker(self, provider: str) -> LatencyTracker:
+        """Get (or create) the latency tracker for a provider"""
+        tracker = self.latency.get(provider)
+        if tracker is None:
+            tracker = self.latency[provider] = LatencyTracker()
+        return tracker
+
+    def get_circuit_breaker(self, provider: str) -> CircuitBreaker:
+        """Get (or create) the circuit breaker for a provider"""
+        breaker = self.breakers.get(provider)
+        if breaker is None:
+            breaker = self.breakers[provider] = CircuitBreaker()
+        return breaker
+
+    def _attempt_timeout(self, provider: str) -> float:
+        """Per-attempt HTTP timeout for a provider, derived from its p99 latency"""
+        if not self.adaptive_timeout:
+            return self.timeout
+        p99 = self.get_latency_tracker(provider).percentile(99, min_samples=10)
+        if p99 is None:
+            return self.timeout
+        return min(max(p99 * self.adaptive_timeout_factor, self.adaptive_timeout_min), self.timeout)
+
+    def _max_tokens(self, processor: AIProcessor, text: str, mode: Optional[str]) -> int:
+        """Output token budget for a request, capped by the processor's limit"""
+        return self.token_budget.max_output_tokens(text, mode, getattr(processor, "max_tokens", 4000))
+
+    def _fits_context(self, processor: AIProcessor, text: str, prompt: str, mode: Optional[str]) -> bool:
+        """Check the request against the context window, logging if it is too long"""
+        if self.token_budget.fits(text, prompt, self._max_tokens(processor, text, mode)):
+            return True
+        print(f"[AI Processing] Input too long for the context window "
+              f"(~{len(text)} chars, limit {self.token_budget.context_tokens} tokens)")
+        return False
+
+    async def _timed_process(self, provider: str, processor: AIProcessor, text: str, prompt: str,
+                             mode: Optional[str] = None) -> Optional[str]:
+        """
+        Call a processor, recording its latency and the outcome in its
+        circuit breaker
+
+        The caller must have obtained permission via allow_request().
+        """
+        breaker = self.get_circuit_breaker(provider)
+        start = time.perf_counter()
+        try:
+            result = await processor.process_text(
+                text, prompt, max_tokens=self._max_tokens(processor, text, mode)
+            )
+        except asyncio.CancelledError:
+            # Hedge loser or overall timeout: not a verdict on the provider
+            breaker.release()
+            raise
+        except Exception:
+            breaker.record_failure()
+            raise
+
+        if result:
+            self.get_latency_tracker(provider).record(time.perf_counter() - start)
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+        return result
+
+    def _hedge_delay(self, provider: str) -> float:
+        """Seconds to wait on a provider before firing a hedged request"""
+        delay = self.get_latency_tracker(provider).percentile(self.hedge_percentile, min_samples=5)
+        if delay is None:
+            delay = self.hedge_default_delay
+        return min(max(delay, self.hedge_min_delay), self.timeout)
+
+    def _hedge_candidates(self, provider: str) -> List[str]:
+        """Configured backup providers for a primary, in preference order"""
+        order = self.hedge_providers or self.list_providers()
+        candidates = []
+        for name in order:
+            if name == provider or name not in self.processors:
+                continue
+            processor = self.get_processor(name)
+            if not processor or not processor.is_configured():
+                continue
+            if self.get_circuit_breaker(name).state == CircuitBreaker.OPEN:
+                continue
+            candidates.append(name)
+        return candidates
+
+    async def _process_hedged(self, provider: str, processor: AIProcessor, text: str, prompt: str,
+                              mode: Optional[str] = None) -> Tuple[Optional[str], str]:
+        """
+        Process text, hedging against slow or failing providers
+
+        The primary provider gets a head start equal to its recent latency
+        percentile. If it has not answered by then (or has already failed),
+        the same request is sent to the next backup provider. The first
+        non-empty answer wins and the remaining requests are cancelled.
+
+        Returns:
+            (result or None, name of the provider that produced it)
+        """
+        backups = self._hedge_candidates(provider) if self.hedging_enabled else []
+        if not backups:
+            return await self._timed_process(provider, processor, text, prompt, mode), provider
+
+        tasks: Dict[asyncio.Task, str] = {}
+
+        def launch(name: str, proc: AIProcessor):
+            task = asyncio.ensure_future(self._timed_process(name, proc, text, prompt, mode))
+            tasks[task] = name
+
+        launch(provider, processor)
+        wait_timeout = self._hedge_delay(provider)
+        try:
+            while True:
+                pending = {task for task in tasks if not task.done()}
+                if not pending and not backups:
+                    return None, provider
+
+                done = set()
+                if pending:
+                    done, _ = await asyncio.wait(
+                        pending,
+                        timeout=wait_timeout if backups else None,
+                        return_when=asyncio.FIRST_COMPLETED
+                    )
+
+                for task in done:
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        print(f"[AI Processing] Provider {tasks[task]} failed: {str(e)}")
+                        continue
+                    if result:
+                        if tasks[task] != provider:
+                            print(f"[AI Processing] Hedged request won by {tasks[task]}")
+                            self.hedge_wins += 1
+                        return result, tasks[task]
+
+                # Hedge when the head start elapsed, or when nothing is left in flight
+                in_flight = any(not task.done() for task in tasks)
+                if not done or not in_flight:
+                    while backups:
+                        name = backups.pop(0)
+                        if self.get_circuit_breaker(name).allow_request():
+                            print(f"[AI Processing] Hedging request to {name}")
+                            self.hedged_requests += 1
+                            launch(name, self.get_processor(name))
+                            wait_timeout = self._hedge_delay(name)
+                            break
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def _resolve_processor(self, provider: str) -> Optional[AIProcessor]:
+        """Get a configured processor for a provider, logging why if unavailable"""
+        # Get processor
+        processor = self.get_processor(provider)
+        if not processor:
+            print(f"[AI Processing] Unknown provider: {provider}")
+            return None
+
+        # Check if processor is configured
+        if not processor.is_configured():
+            print(f"[AI Processing] Provider {provider} not configured")
+            return None
+
+        return processor
+
+    def _cache_key(self, provider: str, processor: AIProcessor, prompt: str, text: str) -> Optional[str]:
+        """Build the result cache key for a request, or None if caching is off"""
+        if self.cache is None:
+            return None
+        return ResultCache.make_key(
+            provider,
+            getattr(processor, "model", ""),
+            prompt,
+            text,
+            getattr(processor, "temperature", None)
+        )
+
+    async def stream(self, text: str, prompt: str, provider: Optional[str] = None, mode: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Process text with AI, yielding complete sentences as they are generated
+
+        Like process(), the provider call runs on the service event loop;
+        chunks are handed back to the caller's loop as they arrive. A failure
+        before any output simply ends the stream, so an empty stream means the
+        caller should fall back to the original text.
+
+        Args:
+            text: Input text
+            prompt: Processing prompt
+            provider: AI provider (uses default if None)
+            mode: Processing mode (for logging)
+
+        Yields:
+            Chunks of processed text ending on sentence boundaries
+
+        Raises:
+            StreamInterrupted: The provider failed or stalled after some
+                output was already yielded (the output is incomplete)
+        """
+        loop = self._ensure_loop()
+        if asyncio.get_running_loop() is loop:
+            async for chunk in self._stream(text, prompt, provider, mode):
+                yield chunk
+            return
+
+        caller_loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        done = object()
+
+        def put(item):
+            try:
+                caller_loop.call_soon_threadsafe(queue.put_nowait, item)
+            except RuntimeError:
+                # Caller loop already closed
+                pass
+
+        async def pump():
+            try:
+                async for chunk in self._stream(text, prompt, provider, mode):
+                    put(chunk)
+            except StreamInterrupted as e:
+                # Re-raised on the caller's loop after the chunks before it
+                put(e)
+            finally:
+                put(done)
+
+        future = asyncio.run_coroutine_threadsafe(pump(), loop)
+        try:
+            while True:
+                item = await queue.get()
+                if item is done:
+                    break
+                if isinstance(item, StreamInterrupted):
+                    raise item
+                yield item
+        finally:
+            future.cancel()
+
+    async def _stream(self, text: str, prompt: str, provider: Optional[str], mode: Optional[str]) -> AsyncIterator[str]:
+        """Stream processed sentences on the service event loop"""
+        if mode:
+            print(f"[AI Processing] Using mode: {mode} (streaming)")
+
+        provider = provider or self.default_provider
+
+        if not prompt or not prompt.strip():
+            print("[AI Processing] No prompt provided, returning original text")
+            yield text
+            return
+
+        processor = self._resolve_processor(provider)
+        if not processor:
+            return
+
+        chunks = self._split_for_mode(text, mode)
+        if len(chunks) > 1:
+            async for piece in self._stream_chunked(provider, processor, text, chunks, prompt, mode):
+                yield piece
+            return
+
+        cache_key = self._cache_key(provider, processor, prompt, text)
+        if cache_key:
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                print("[AI Processing] Cache hit")
+                yield cached
+                return
+
+        if not self._fits_context(processor, text, prompt, mode):
+            return
+
+        # Same open-circuit rerouting as process(); streams are not hedged
+        # or coalesced, since a second stream cannot take over sentences
+        # that were already pasted
+        selected = self._select_provider(provider, processor)
+        if not selected:
+            return
+        provider, processor = selected
+        breaker = self.get_circuit_breaker(provider)
+        cache_key = self._cache_key(provider, processor, prompt, text)
+
+        sentences = SentenceBuffer()
+        emitted = []
+        deltas = processor.stream_text(
+            text, prompt, max_tokens=self._max_tokens(processor, text, mode)
+        ).__aiter__()
+        try:
+            while True:
+                # Every fragment must arrive within the timeout
+                try:
+                    delta = await asyncio.wait_for(deltas.__anext__(), timeout=self.timeout)
+                except StopAsyncIteration:
+                    break
+
+                chunk = sentences.feed(delta)
+                if chunk:
+                    if not emitted:
+                        chunk = chunk.lstrip()
+                    emitted.append(chunk)
+                    yield chunk
+
+            chunk = sentences.flush()
+            if chunk:
+                if not emitted:
+                    chunk = chunk.lstrip()
+                emitted.append(chunk)
+                yield chunk
+
+            if emitted:
+                breaker.record_success()
+            else:
+                breaker.record_failure()
+
+            # Only complete streams are cached
+            if cache_key and emitted:
+                self.cache.put(cache_key, "".join(emitted))
+        except (asyncio.CancelledError, GeneratorExit):
+            breaker.release()
+            raise
+        except asyncio.TimeoutError:
+            print(f"[AI Processing] Streaming stalled for {self.timeout} seconds")
+            breaker.record_failure()
+            if emitted:
+                raise StreamInterrupted(f"stalled for {self.timeout} seconds")
+        except Exception as e:
+            print(f"[AI Processing] Error during streaming: {str(e)}")
+            breaker.record_failure()
+            if emitted:
+                raise StreamInterrupted(str(e)) from e
+        finally:
+            await deltas.aclose()
+
+    def warm_up(self):
+        """
+        Pre-resolve and pre-connect to every configured provider
+
+        Non-blocking: the probes run on the service event loop. Call at
+        startup and periodically (the keep-alive thread does) so the first
+        request after an idle period finds an open connection.
+        """
+        loop = self._ensure_loop()
+        asyncio.run_coroutine_threadsafe(self._warm_up(), loop)
+
+    async def _warm_up(self):
+        """Probe all configured providers concurrently"""
+        names = []
+        for name in self.list_providers():
+            processor = self.get_processor(name)
+            if processor and processor.is_configured() and getattr(processor, "base_url", None):
+                names.append(name)
+        await asyncio.gather(*(self._warm_provider(name) for name in names))
+
+    async def _warm_provider(self, provider: str):
+        """Open a pooled connection to a provider with a cheap HEAD request"""
+        url = self.get_processor(provider).base_url
+        start = time.perf_counter()
+        try:
+            session = self.session_pool.get(url)
+            async with session.head(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+                await response.read()
+            self._warm[provider] = {
+                "warmed_at": time.time(),
+                "connect_ms": round((time.perf_counter() - start) * 1000, 1),
+                "error": None,
+            }
+        except Exception as e:
+            print(f"[AI Processing] Pre-warming {provider} failed: {str(e)}")
+            self._warm[provider] = {"warmed_at": None, "connect_ms": None, "error": str(e)}
+
+    def warm_status(self) -> Dict[str, Dict[str, object]]:
+        """
+        Report whether each provider has a recently opened connection
+
+        A provider is "warm" if its last probe succeeded within the pool's
+        keep-alive timeout, otherwise "cold".
+        """
+        now = time.time()
+        status = {}
+        for provider, probe in self._warm.items():
+            warmed_at = probe["warmed_at"]
+            warm = warmed_at is not None and now - warmed_at < self.session_pool.keepalive_timeout
+            status[provider] = dict(probe, state="warm" if warm else "cold")
+        return status
+
+    def stats(self) -> Dict[str, object]:
+        """Return cache, coalescing, hedging, retry and circuit breaker counters"""
+        return {
+            "cache": self.cache.stats() if self.cache else None,
+            "coalesced_requests": self.coalesced_requests,
+            "hedged_requests": self.hedged_requests,
+            "hedge_wins": self.hedge_wins,
+            "rerouted_requests": self.rerouted_requests,
+            "retries": {name: processor.retries for name, processor in self._instances.items()},
+            "in_flight": len(self._inflight),
+            "circuit_breakers": {
+                name: breaker.snapshot() for name, breaker in self.breakers.items()
+            },
+            "connections": self.warm_status(),
+        }
+
     def list_providers(self) -> list:
         """List available providers"""
         return list(self.processors.keys())
@@ -131,4 +776,30 @@ class ProcessingService:
         """
         provider = provider or self.default_provider
         processor = self.get_processor(provider)
-        return processor.is_configured() if processor else False
\ No newline at end of file
+        return processor.is_configured() if processor else False
+
+    def close(self):
+        """
+        Close pooled connections and stop the service event loop
+
+        Must not be called from the service loop itself.
+        """
+        with self._loop_lock:
+            loop, thread = self._loop, self._loop_thread
+            self._loop, self._loop_thread = None, None
+
+        if self.cache is not None:
+            self.cache.close()
+
+        if loop is None:
+            return
+
+        try:
+            asyncio.run_coroutine_threadsafe(self.session_pool.close(), loop).result(timeout=5)
+        except Exception as e:
+            print(f"[ProcessingService] Failed to close sessions: {str(e)}")
+
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        if not loop.is_running():
+            loop.close()
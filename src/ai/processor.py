@@ -1,24 +1,75 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+import aiohttp
 
 
 class AIProcessor(ABC):
     """Abstract base class for AI text processors"""
 
+    # Shared SessionPool assigned by ProcessingService (None = standalone use)
+    session_pool = None
+
+    # Callable returning the per-attempt timeout in seconds, assigned by
+    # ProcessingService from observed latency (None = use self.timeout)
+    timeout_policy = None
+
+    # Request attempts retried after a rate limit, HTTP error or timeout
+    retries = 0
+
     @abstractmethod
-    async def process_text(self, text: str, prompt: str) -> Optional[str]:
+    async def process_text(self, text: str, prompt: str, max_tokens: Optional[int] = None) -> Optional[str]:
         """
         Process text using AI with given prompt
 
         Args:
             text: The input text to process
             prompt: The prompt to guide processing
+            max_tokens: Output token budget (processor default if None)
 
         Returns:
             Processed text or None if processing fails
         """
         pass
 
+    async def stream_text(self, text: str, prompt: str, max_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        """
+        Process text and yield the output incrementally as it is generated
+
+        The default implementation yields the complete result of
+        process_text() at once; processors that support streaming override it.
+
+        Args:
+            text: The input text to process
+            prompt: The prompt to guide processing
+            max_tokens: Output token budget (processor default if None)
+
+        Yields:
+            Fragments of processed text in order
+        """
+        result = await self.process_text(text, prompt, max_tokens=max_tokens)
+        if result:
+            yield result
+
+    @staticmethod
+    def is_truncated(data: dict) -> bool:
+        """
+        Check whether a response stopped at its max_tokens limit
+
+        Recognises the Anthropic ``stop_reason`` and the OpenAI
+        ``finish_reason`` forms.
+
+        Args:
+            data: Decoded response body
+
+        Returns:
+            True if the output was cut off by the token budget
+        """
+        if data.get("stop_reason") == "max_tokens":
+            return True
+        choices = data.get("choices") or []
+        return bool(choices) and choices[0].get("finish_reason") == "length"
+
     @abstractmethod
     def is_configured(self) -> bool:
         """
@@ -27,4 +78,33 @@ class AIProcessor(ABC):
         Returns:
             True if processor has valid configuration
         """
-        pass
\ No newline at end of file
+        pass
+
+    def attempt_timeout(self) -> float:
+        """
+        Get the timeout for a single HTTP attempt
+
+        Returns:
+            Timeout in seconds
+        """
+        if self.timeout_policy is not None:
+            return self.timeout_policy()
+        return getattr(self, "timeout", 30)
+
+    @asynccontextmanager
+    async def open_session(self, url: str):
+        """
+        Yield an HTTP session for the given URL
+
+        Uses the shared pooled session when one is attached, otherwise
+        falls back to a short-lived session that is closed afterwards.
+
+        Args:
+            url: Request URL (selects the per-origin pool)
+        """
+        if self.session_pool is not None:
+            yield self.session_pool.get(url)
+            return
+
+        async with aiohttp.ClientSession() as session:
+            yield session
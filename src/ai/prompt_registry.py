@@ -0,0 +1,168 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+
+PLACEHOLDER = "{user_input}"
+
+
+@lru_cache(maxsize=64)
+def split_template(prompt: str) -> Tuple[str, ...]:
+    """
+    Pre-split a prompt template around the user input placeholder
+
+    Args:
+        prompt: Prompt template text
+
+    Returns:
+        Literal segments; the user input goes between consecutive segments
+    """
+    return tuple(prompt.split(PLACEHOLDER))
+
+
+def render_user_message(prompt: str, text: str) -> str:
+    """
+    Build the user message for a prompt template and input text
+
+    Equivalent to ``prompt.replace("{user_input}", ...)`` with the input
+    wrapped in <user_input> tags, but reuses the pre-split template.
+
+    Args:
+        prompt: Prompt template text
+        text: User input
+
+    Returns:
+        Rendered user message
+    """
+    return f"<user_input>\n{text}\n</user_input>".join(split_template(prompt))
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    """A registered prompt, pre-split around its placeholder"""
+    id: str
+    name: str
+    description: str
+    prompt: str
+    version: str
+
+    @property
+    def is_ai(self) -> bool:
+        """True if this prompt triggers AI processing"""
+        return bool(self.prompt.strip())
+
+    def render(self, text: str) -> str:
+        """Render the user message for the given input"""
+        return render_user_message(self.prompt, text)
+
+
+class PromptRegistry:
+    """Prompt definitions loaded once from prompts.json.
+
+    Clients refer to prompts by id (``mode``) instead of sending the whole
+    prompt body. The file is re-read when its modification time changes,
+    checked at most once per ``reload_interval`` seconds.
+    """
+
+    def __init__(self, path: str, reload_interval: float = 1.0):
+        """
+        Initialize prompt registry
+
+        Args:
+            path: Path to prompts.json
+            reload_interval: Minimum seconds between file change checks
+        """
+        self.path = path
+        self.reload_interval = reload_interval
+        self.version = ""
+        self._prompts: Dict[str, PromptTemplate] = {}
+        self._order: List[str] = []
+        self._mtime: Optional[float] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        """Load and compile the prompt file"""
+        try:
+            mtime = os.path.getmtime(self.path)
+            with open(self.path, "rb") as f:
+                raw = f.read()
+            data = json.loads(raw.decode("utf-8"))
+        except Exception as e:
+            print(f"[PromptRegistry] Failed to load {self.path}: {str(e)}")
+            return
+
+        version = hashlib.sha256(raw).hexdigest()[:12]
+        prompts = {}
+        order = []
+        for entry in data.get("prompts", []):
+            prompt_id = entry.get("id")
+            if not prompt_id:
+                continue
+            template = PromptTemplate(
+                id=prompt_id,
+                name=entry.get("name", prompt_id),
+                description=entry.get("description", ""),
+                prompt=entry.get("prompt", ""),
+                version=version,
+            )
+            split_template(template.prompt)
+            prompts[prompt_id] = template
+            order.append(prompt_id)
+
+        self._prompts, self._order = prompts, order
+        self._mtime, self.version = mtime, version
+        print(f"[PromptRegistry] Loaded {len(prompts)} prompts (version {version})")
+
+    def _maybe_reload(self):
+        """Reload the file if it changed since the last check"""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._checked_at < self.reload_interval:
+                return
+            self._checked_at = now
+            try:
+                mtime = os.path.getmtime(self.path)
+            except OSError:
+                return
+            if mtime != self._mtime:
+                self._load()
+
+    def get(self, prompt_id: str) -> Optional[PromptTemplate]:
+        """
+        Look up a prompt by id
+
+        Args:
+            prompt_id: Prompt id (the client's ``mode``)
+
+        Returns:
+            Prompt template or None if unknown
+        """
+        self._maybe_reload()
+        return self._prompts.get(prompt_id)
+
+    def list(self) -> List[PromptTemplate]:
+        """List prompts in file order"""
+        self._maybe_reload()
+        return [self._prompts[prompt_id] for prompt_id in self._order]
+
+    def to_client(self) -> dict:
+        """Prompt list for the phone page, without prompt bodies"""
+        return {
+            "version": self.version,
+            "prompts": [
+                {
+                    "id": template.id,
+                    "name": template.name,
+                    "description": template.description,
+                    "ai_processing": template.is_ai,
+                }
+                for template in self.list()
+            ],
+        }
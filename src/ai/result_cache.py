@@ -0,0 +1,293 @@
+import os
+import time
+import asyncio
+import json
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+
+class ResultCache:
+    """Content-addressed cache for AI results.
+
+    Entries are keyed by a hash of everything that determines the output
+    (provider, model, prompt, text, temperature). Lookups hit an in-memory
+    LRU tier first and, when a database path is given, a SQLite tier that
+    survives restarts. Both tiers honour the same TTL.
+
+    The SQLite tier is owned by a single writer thread: disk reads, writes
+    and commits never run on the caller's event loop, and ``last_used``
+    updates from disk hits are batched into one commit.
+    """
+
+    # Disk hits buffered before their last_used update is committed
+    TOUCH_BATCH = 32
+
+    def __init__(self, max_entries: Optional[int] = None, ttl: Optional[float] = None,
+                 db_path: Optional[str] = None, max_disk_entries: Optional[int] = None):
+        """
+        Initialize result cache
+
+        Args:
+            max_entries: In-memory LRU capacity (if None, will try to get from environment)
+            ttl: Entry lifetime in seconds, 0 disables expiry (if None, will try to get from environment)
+            db_path: SQLite file for the persistent tier (None = memory only)
+            max_disk_entries: Persistent tier capacity (if None, will try to get from environment)
+        """
+        self.max_entries = max_entries if max_entries is not None else int(os.getenv("AI_CACHE_MAX_ENTRIES", "256"))
+        self.ttl = ttl if ttl is not None else float(os.getenv("AI_CACHE_TTL", "86400"))
+        self.max_disk_entries = max_disk_entries if max_disk_entries is not None else int(os.getenv("AI_CACHE_DISK_MAX_ENTRIES", "5000"))
+        self.db_path = db_path
+
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        # Persistent tier state, only touched on the writer thread
+        self._db: Optional[sqlite3.Connection] = None
+        self._touched: Dict[str, float] = {}
+        self._disk_entries: Optional[int] = None
+        self._writer: Optional[ThreadPoolExecutor] = None
+
+        if db_path:
+            self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="result-cache")
+            self._writer.submit(self._open_db, db_path)
+
+    @staticmethod
+    def make_key(provider: str, model: str, prompt: str, text: str, temperature: float) -> str:
+        """
+        Build the content hash for a request
+
+        Args:
+            provider: Provider name
+            model: Model name
+            prompt: Processing prompt
+            text: Input text
+            temperature: Sampling temperature
+
+        Returns:
+            Hex SHA-256 digest identifying the request
+        """
+        material = json.dumps([provider, model, prompt, text, temperature], ensure_ascii=False)
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _open_db(self, db_path: str):
+        """Open (and create if needed) the persistent tier (writer thread)"""
+        try:
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created REAL NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._db.commit()
+            self._count_disk_entries()
+        except Exception as e:
+            print(f"[ResultCache] Persistent cache disabled: {str(e)}")
+            self._db = None
+
+    def _expired(self, created: float, now: float) -> bool:
+        return self.ttl > 0 and now - created > self.ttl
+
+    async def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached result
+
+        Memory hits return without leaving the event loop; the disk tier is
+        read on the writer thread.
+
+        Args:
+            key: Key from make_key()
+
+        Returns:
+            Cached result or None on miss
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, created = entry
+                if not self._expired(created, now):
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._memory[key]
+
+        row = None
+        writer = self._writer
+        if writer is not None:
+            loop = asyncio.get_running_loop()
+            try:
+                row = await loop.run_in_executor(writer, self._read_disk, key, now)
+            except RuntimeError:
+                # Writer already shut down by close()
+                row = None
+
+        with self._lock:
+            if row is not None:
+                value, created = row
+                self._remember(key, value, created)
+                self.hits += 1
+                self.disk_hits += 1
+                return value
+            self.misses += 1
+            return None
+
+    def _read_disk(self, key: str, now: float) -> Optional[Tuple[str, float]]:
+        """Fetch a live entry from the persistent tier (writer thread)"""
+        if self._db is None:
+            return None
+        try:
+            row = self._db.execute(
+                "SELECT value, created FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if not self._expired(row[1], now):
+                self._touched[key] = now
+                if len(self._touched) >= self.TOUCH_BATCH:
+                    self._flush_touched()
+                    self._db.commit()
+                return row
+            self._db.execute("DELETE FROM results WHERE key = ?", (key,))
+            self._db.commit()
+            self._count_disk_entries()
+        except sqlite3.Error as e:
+            print(f"[ResultCache] Read failed: {str(e)}")
+        return None
+
+    def put(self, key: str, value: str):
+        """
+        Store a result in both tiers
+
+        The memory tier is updated immediately; the disk write is queued on
+        the writer thread and does not block the caller.
+
+        Args:
+            key: Key from make_key()
+            value: Result text
+        """
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+        self._submit(self._write_disk, key, value, now)
+
+    def _write_disk(self, key: str, value: str, now: float):
+        """Insert an entry and enforce the disk capacity (writer thread)"""
+        if self._db is None:
+            return
+        try:
+            # Pending last_used updates first, so eviction sees them
+            self._flush_touched()
+            self._db.execute(
+                "INSERT OR REPLACE INTO results (key, value, created, last_used) VALUES (?, ?, ?, ?)",
+                (key, value, now, now)
+            )
+            self._db.execute(
+                "DELETE FROM results WHERE key IN ("
+                "SELECT key FROM results ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_disk_entries,)
+            )
+            self._db.commit()
+            self._count_disk_entries()
+        except sqlite3.Error as e:
+            print(f"[ResultCache] Write failed: {str(e)}")
+
+    def _flush_touched(self):
+        """Write buffered last_used updates; the caller commits (writer thread)"""
+        if self._touched:
+            self._db.executemany(
+                "UPDATE results SET last_used = ? WHERE key = ?",
+                [(used, key) for key, used in self._touched.items()]
+            )
+            self._touched.clear()
+
+    def _count_disk_entries(self):
+        self._disk_entries = self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def _submit(self, func, *args):
+        """Queue a persistent tier operation, if the tier is enabled"""
+        writer = self._writer
+        if writer is None:
+            return None
+        try:
+            return writer.submit(func, *args)
+        except RuntimeError:
+            # Writer already shut down by close()
+            return None
+
+    def _remember(self, key: str, value: str, created: float):
+        """Insert into the LRU tier, evicting the least recently used entries"""
+        if self.max_entries <= 0:
+            return
+        self._memory[key] = (value, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def clear(self):
+        """Drop all cached entries"""
+        with self._lock:
+            self._memory.clear()
+        self._submit(self._clear_disk)
+
+    def _clear_disk(self):
+        if self._db is None:
+            return
+        try:
+            self._touched.clear()
+            self._db.execute("DELETE FROM results")
+            self._db.commit()
+            self._disk_entries = 0
+        except sqlite3.Error as e:
+            print(f"[ResultCache] Clear failed: {str(e)}")
+
+    def flush(self):
+        """Block until queued disk operations and last_used updates are written"""
+        future = self._submit(self._commit_touched)
+        if future is not None:
+            future.result()
+
+    def _commit_touched(self):
+        if self._db is None:
+            return
+        try:
+            self._flush_touched()
+            self._db.commit()
+        except sqlite3.Error as e:
+            print(f"[ResultCache] Write failed: {str(e)}")
+
+    def stats(self) -> Dict[str, object]:
+        """Return hit/miss counters and tier sizes"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                # Refreshed by the writer thread after each disk change
+                "disk_entries": self._disk_entries,
+            }
+
+    def close(self):
+        """Write pending updates and close the persistent tier"""
+        writer, self._writer = self._writer, None
+        if writer is None:
+            return
+        writer.submit(self._close_db)
+        writer.shutdown(wait=True)
+
+    def _close_db(self):
+        if self._db is not None:
+            self._commit_touched()
+            self._db.close()
+            self._db = None
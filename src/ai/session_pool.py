@@ -0,0 +1,76 @@
+import os
+import asyncio
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+import aiohttp
+
+
+class SessionPool:
+    """Long-lived aiohttp sessions shared by all AI processors.
+
+    One keep-alive connection pool is kept per provider origin
+    (scheme://host:port), so repeated requests reuse DNS results, TCP
+    connections and TLS sessions instead of paying for them on every call.
+    Sessions are bound to the event loop that created them and must only
+    be used from that loop.
+    """
+
+    def __init__(self, limit_per_host: Optional[int] = None, keepalive_timeout: Optional[float] = None):
+        """
+        Initialize session pool
+
+        Args:
+            limit_per_host: Max concurrent connections per origin, 0 = no limit
+                (if None, will try to get from environment)
+            keepalive_timeout: Seconds an idle connection is kept open
+                (if None, will try to get from environment)
+        """
+        self.limit_per_host = limit_per_host if limit_per_host is not None else int(os.getenv("AI_POOL_LIMIT_PER_HOST", "8"))
+        self.keepalive_timeout = keepalive_timeout if keepalive_timeout is not None else float(os.getenv("AI_POOL_KEEPALIVE_TIMEOUT", "120"))
+        self._sessions: Dict[str, aiohttp.ClientSession] = {}
+
+    @staticmethod
+    def origin_of(url: str) -> str:
+        """Return the scheme://host:port part of a URL used as pool key"""
+        parts = urlsplit(url)
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        return f"{parts.scheme}://{parts.hostname}:{port}"
+
+    def get(self, url: str) -> aiohttp.ClientSession:
+        """
+        Get (or lazily create) the pooled session for a URL's origin
+
+        Must be called from within the event loop that owns the pool.
+
+        Args:
+            url: Request URL
+
+        Returns:
+            Shared aiohttp session
+        """
+        key = self.origin_of(url)
+        session = self._sessions.get(key)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=300,
+            )
+            session = aiohttp.ClientSession(connector=connector)
+            self._sessions[key] = session
+        return session
+
+    def origins(self) -> list:
+        """List origins that currently have an open session"""
+        return [key for key, session in self._sessions.items() if not session.closed]
+
+    async def close(self):
+        """Close every pooled session and its connections"""
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+        for session in sessions:
+            if not session.closed:
+                await session.close()
+        # Give SSL transports a moment to shut down cleanly
+        if sessions:
+            await asyncio.sleep(0.25)
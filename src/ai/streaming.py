@@ -0,0 +1,136 @@
+import re
+import json
+from typing import AsyncIterator, List, Optional, Tuple
+
+
+# Sentence boundaries: CJK/ASCII terminators, newlines, and ASCII '.', ';', ':'
+# only when followed by whitespace (so "3.14" or "e.g" are not split)
+SENTENCE_END = re.compile(r"[。！？!?；\n]|[.;:](?=\s)")
+
+
+class StreamInterrupted(Exception):
+    """Raised after the last chunk when a stream failed part-way through"""
+
+
+async def iter_sse_events(response) -> AsyncIterator[Tuple[Optional[str], str]]:
+    """
+    Parse a server-sent events body into (event, data) pairs
+
+    Args:
+        response: aiohttp response with a text/event-stream body
+
+    Yields:
+        Tuple of event name (None if absent) and joined data payload
+    """
+    event = None
+    data_lines: List[str] = []
+
+    async for raw in response.content:
+        line = raw.decode("utf-8").rstrip("\r\n")
+        if not line:
+            if data_lines:
+                yield event, "\n".join(data_lines)
+            event, data_lines = None, []
+            continue
+        if line.startswith(":"):
+            # Comment / keep-alive line
+            continue
+
+        field, _, value = line.partition(":")
+        if value.startswith(" "):
+            value = value[1:]
+        if field == "event":
+            event = value
+        elif field == "data":
+            data_lines.append(value)
+
+    if data_lines:
+        yield event, "\n".join(data_lines)
+
+
+async def iter_text_deltas(response) -> AsyncIterator[str]:
+    """
+    Extract text deltas from a Messages API event stream
+
+    Understands Anthropic ``content_block_delta`` events and, for
+    compatible providers, OpenAI-style ``choices[].delta.content`` chunks.
+
+    Args:
+        response: aiohttp response with a text/event-stream body
+
+    Yields:
+        Text fragments in generation order
+    """
+    async for event, data in iter_sse_events(response):
+        if data == "[DONE]":
+            break
+
+        try:
+            payload = json.loads(data)
+        except ValueError:
+            continue
+
+        event_type = payload.get("type") or event
+        if event_type == "content_block_delta":
+            delta = payload.get("delta", {})
+            if delta.get("type") == "text_delta" and delta.get("text"):
+                yield delta["text"]
+        elif event_type == "message_stop":
+            break
+        elif event_type == "error":
+            message = payload.get("error", {}).get("message", "Unknown error")
+            raise RuntimeError(f"Stream error: {message}")
+        elif payload.get("choices"):
+            content = (payload["choices"][0].get("delta") or {}).get("content")
+            if content:
+                yield content
+
+
+class SentenceBuffer:
+    """Accumulates streamed text and releases it at sentence boundaries"""
+
+    def __init__(self, min_chars: int = 1):
+        """
+        Initialize sentence buffer
+
+        Args:
+            min_chars: Minimum length of a released chunk, so very short
+                fragments are merged with the following sentence
+        """
+        self.min_chars = min_chars
+        self._buffer = ""
+
+    def feed(self, delta: str) -> Optional[str]:
+        """
+        Add a text fragment
+
+        Args:
+            delta: Newly generated text
+
+        Returns:
+            All complete sentences accumulated so far, or None
+        """
+        self._buffer += delta
+
+        end = None
+        for match in SENTENCE_END.finditer(self._buffer):
+            end = match.end()
+        if end is None:
+            return None
+
+        chunk = self._buffer[:end]
+        if not chunk.strip() or len(chunk.strip()) < self.min_chars:
+            return None
+
+        self._buffer = self._buffer[end:]
+        return chunk
+
+    def flush(self) -> Optional[str]:
+        """
+        Release whatever text is left at the end of the stream
+
+        Returns:
+            Remaining text with trailing whitespace removed, or None
+        """
+        chunk, self._buffer = self._buffer.rstrip(), ""
+        return chunk or None
@@ -0,0 +1,96 @@
+import os
+import math
+from typing import Dict, Optional
+
+
+def _is_cjk(char: str) -> bool:
+    """Check whether a character is CJK (including full-width punctuation)"""
+    code = ord(char)
+    return (
+        0x4E00 <= code <= 0x9FFF or      # CJK Unified Ideographs
+        0x3400 <= code <= 0x4DBF or      # Extension A
+        0x3000 <= code <= 0x303F or      # CJK punctuation
+        0x3040 <= code <= 0x30FF or      # Hiragana / Katakana
+        0xAC00 <= code <= 0xD7AF or      # Hangul
+        0xFF00 <= code <= 0xFFEF         # Full-width forms
+    )
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the token count of a text without a tokenizer
+
+    CJK characters are counted as roughly one token each; other
+    non-whitespace characters as roughly four per token.
+
+    Args:
+        text: Input text
+
+    Returns:
+        Estimated token count
+    """
+    cjk = 0
+    other = 0
+    for char in text:
+        if _is_cjk(char):
+            cjk += 1
+        elif not char.isspace():
+            other += 1
+    return cjk + math.ceil(other / 4)
+
+
+class TokenBudget:
+    """Sizes max_tokens per request from the input length and prompt mode"""
+
+    # Expected output tokens per input token for each built-in prompt mode
+    MODE_RATIOS: Dict[str, float] = {
+        "general-refine": 1.2,
+        "translate-en": 1.6,
+        "agent-task": 2.0,
+    }
+
+    def __init__(self, context_tokens: Optional[int] = None, default_ratio: Optional[float] = None,
+                 headroom: Optional[int] = None, min_tokens: Optional[int] = None):
+        """
+        Initialize token budget
+
+        Args:
+            context_tokens: Model context window in tokens (if None, will try to get from environment)
+            default_ratio: Output/input ratio for unknown modes (if None, will try to get from environment)
+            headroom: Extra output tokens added to every budget (if None, will try to get from environment)
+            min_tokens: Smallest max_tokens ever requested (if None, will try to get from environment)
+        """
+        self.context_tokens = context_tokens or int(os.getenv("AI_CONTEXT_TOKENS", "128000"))
+        self.default_ratio = default_ratio or float(os.getenv("AI_OUTPUT_RATIO", "2.0"))
+        self.headroom = headroom if headroom is not None else int(os.getenv("AI_OUTPUT_HEADROOM", "200"))
+        self.min_tokens = min_tokens or int(os.getenv("AI_MIN_MAX_TOKENS", "256"))
+
+    def max_output_tokens(self, text: str, mode: Optional[str], cap: int) -> int:
+        """
+        Compute max_tokens for a request
+
+        Args:
+            text: User input
+            mode: Prompt mode id (None = default ratio)
+            cap: Upper bound, usually the processor's own max_tokens
+
+        Returns:
+            Output token budget
+        """
+        ratio = self.MODE_RATIOS.get(mode or "", self.default_ratio)
+        budget = math.ceil(estimate_tokens(text) * ratio) + self.headroom
+        return max(self.min_tokens, min(budget, cap))
+
+    def fits(self, text: str, prompt: str, max_tokens: int) -> bool:
+        """
+        Check whether prompt, input and output budget fit in the context window
+
+        Args:
+            text: User input
+            prompt: Prompt template
+            max_tokens: Output budget
+
+        Returns:
+            True if the request fits
+        """
+        return estimate_tokens(prompt) + estimate_tokens(text) + max_tokens <= self.context_tokens
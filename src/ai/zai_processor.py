@@ -1,9 +1,11 @@
 import os
 import asyncio
-from typing import Optional
+from typing import AsyncIterator, Optional
 import aiohttp
 import json
 from .processor import AIProcessor
+from .streaming import iter_text_deltas
+from .prompt_registry import render_user_message
 
 
 class ZAIProcessor(AIProcessor):
@@ -28,18 +30,49 @@ class ZAIProcessor(AIProcessor):
         self.base_url = base
         self.timeout = int(os.getenv("AI_PROCESSING_TIMEOUT", "30"))
         self.max_tokens = 4000
+        self.temperature = 0.7
 
     def is_configured(self) -> bool:
         """Check if processor has valid API key"""
         return bool(self.api_key)
 
-    async def process_text(self, text: str, prompt: str) -> Optional[str]:
+    def _build_payload(self, text: str, prompt: str, stream: bool = False, max_tokens: Optional[int] = None) -> dict:
+        """Build the Anthropic-compatible request payload"""
+        # Prepare the full message
+        user_message = render_user_message(prompt, text)
+
+        # Prepare request payload using Anthropic-compatible format
+        payload = {
+            "model": self.model,
+            "max_tokens": max_tokens or self.max_tokens,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": user_message
+                }
+            ],
+            "temperature": self.temperature
+        }
+        if stream:
+            payload["stream"] = True
+        return payload
+
+    def _build_headers(self) -> dict:
+        """Build the Anthropic-compatible request headers"""
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+            "anthropic-version": "2023-06-01"
+        }
+
+    async def process_text(self, text: str, prompt: str, max_tokens: Optional[int] = None) -> Optional[str]:
         """
         Process text using ZAI API with Anthropic-compatible protocol
 
         Args:
             text: Input text to process
             prompt: Processing prompt
+            max_tokens: Output token budget (uses self.max_tokens if None)
 
         Returns:
             Processed text or None if failed
@@ -52,27 +85,8 @@ class ZAIProcessor(AIProcessor):
             return text
 
         try:
-            # Prepare the full message
-            user_message = prompt.replace("{user_input}", f"<user_input>\n{text}\n</user_input>")
-
-            # Prepare request payload using Anthropic-compatible format
-            payload = {
-                "model": self.model,
-                "max_tokens": self.max_tokens,
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": user_message
-                    }
-                ],
-                "temperature": 0.7
-            }
-
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-                "anthropic-version": "2023-06-01"
-            }
+            payload = self._build_payload(text, prompt, max_tokens=max_tokens)
+            headers = self._build_headers()
 
             # Make async request with retries
             max_retries = 2
@@ -88,8 +102,9 @@ class ZAIProcessor(AIProcessor):
                         print(f"Payload: {json.dumps(payload, indent=2, ensure_ascii=False)}")
                         print("=" * 40)
 
-                    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout)) as session:
-                        async with session.post(self.base_url, json=payload, headers=headers) as response:
+                    async with self.open_session(self.base_url) as session:
+                        async with session.post(self.base_url, json=payload, headers=headers,
+                                                timeout=aiohttp.ClientTimeout(total=self.attempt_timeout())) as response:
                             if response.status == 200:
                                 data = await response.json()
 
@@ -97,6 +112,9 @@ class ZAIProcessor(AIProcessor):
                                 print(f"[ZAI Debug] Response status: 200")
                                 print(f"[ZAI Debug] Response keys: {list(data.keys())}")
 
+                                if self.is_truncated(data):
+                                    return await self._retry_truncated(text, prompt, payload["max_tokens"])
+
                                 # Extract processed text from response
                                 # Try Anthropic format first
                                 if "content" in data and data["content"]:
@@ -139,6 +157,7 @@ class ZAIProcessor(AIProcessor):
                             elif response.status == 429:
                                 # Rate limited, wait and retry
                                 if attempt < max_retries:
+                                    self.retries += 1
                                     await asyncio.sleep(2 ** attempt)  # Exponential backoff
                                     continue
                                 print("[ZAI Error] Rate limit exceeded")
@@ -170,6 +189,7 @@ class ZAIProcessor(AIProcessor):
                                     print(error_text)
                                 print("=" * 50)
                                 if attempt < max_retries:
+                                    self.retries += 1
                                     await asyncio.sleep(1)
                                     continue
                                 return None
@@ -177,6 +197,7 @@ class ZAIProcessor(AIProcessor):
                 except asyncio.TimeoutError:
                     if attempt < max_retries:
                         print(f"[ZAI Error] Request timed out, retrying... (attempt {attempt + 1}/{max_retries})")
+                        self.retries += 1
                         await asyncio.sleep(1)
                         continue
                     print("[ZAI Error] Request timed out after retries")
@@ -192,6 +213,48 @@ class ZAIProcessor(AIProcessor):
             traceback.print_exc()
             return None
 
+    async def _retry_truncated(self, text: str, prompt: str, max_tokens: int) -> Optional[str]:
+        """Retry a truncated request once at the model cap; None if that is cut off too"""
+        if max_tokens < self.max_tokens:
+            print(f"[ZAI] Output truncated at max_tokens={max_tokens}, retrying with {self.max_tokens}")
+            return await self.process_text(text, prompt, max_tokens=self.max_tokens)
+        print(f"[ZAI Error] Output truncated at max_tokens={max_tokens}")
+        return None
+
+    async def stream_text(self, text: str, prompt: str, max_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        """
+        Process text using ZAI API, yielding output as it is generated
+
+        Args:
+            text: Input text to process
+            prompt: Processing prompt
+            max_tokens: Output token budget (uses self.max_tokens if None)
+
+        Yields:
+            Fragments of processed text
+        """
+        if not self.is_configured():
+            raise ValueError("ZAI API key not configured")
+
+        if not prompt:
+            yield text
+            return
+
+        payload = self._build_payload(text, prompt, stream=True, max_tokens=max_tokens)
+        async with self.open_session(self.base_url) as session:
+            async with session.post(self.base_url, json=payload, headers=self._build_headers(),
+                                    # No total limit: a steady stream may outlast it; stalls are
+                                    # caught per read here and per fragment by the service
+                                    timeout=aiohttp.ClientTimeout(total=None, sock_connect=self.attempt_timeout(),
+                                                                  sock_read=self.timeout)) as response:
+                if response.status != 200:
+                    error_text = await response.text()
+                    print(f"[ZAI Error] Stream HTTP {response.status}: {error_text}")
+                    return
+
+                async for delta in iter_text_deltas(response):
+                    yield delta
+
     async def __aenter__(self):
         return self
 
@@ -3,8 +3,14 @@
 import os
 from pathlib import Path
 
+_env_loaded = False
+
 def load_env():
-    """Load .env file from project root"""
+    """Load .env file from project root (only the first call has an effect)"""
+    global _env_loaded
+    if _env_loaded:
+        return
+    _env_loaded = True
     try:
         from dotenv import load_dotenv
 
@@ -0,0 +1,158 @@
+"""Ordered injection queue for clipboard and keystroke operations"""
+
+import os
+import time
+import asyncio
+import threading
+import concurrent.futures
+from typing import Dict, Optional, Set
+
+import metrics
+
+
+class InjectionQueueFull(Exception):
+    """Raised when too many requests are already waiting to inject text"""
+
+
+class InjectionQueue:
+    """Serializes clipboard + keystroke injection in request arrival order.
+
+    Each request reserves a ticket as soon as it arrives, runs its AI
+    processing concurrently with other requests, then waits for its turn
+    before touching the clipboard or keyboard. Turns are granted strictly in
+    ticket order and only one ticket holds the turn at a time; a ticket that
+    is released without ever being served (e.g. the request failed early) is
+    skipped.
+
+    Waiting uses thread-safe futures, so requests may run on different event
+    loops (the Flask backend runs every request on its own loop).
+    """
+
+    def __init__(self, max_depth: Optional[int] = None):
+        """
+        Initialize injection queue
+
+        Args:
+            max_depth: Maximum outstanding requests before new ones are rejected
+                (if None, will try to get from environment)
+        """
+        self.max_depth = max_depth or int(os.getenv("AIPUT_INJECTION_QUEUE_SIZE", "8"))
+
+        self._lock = threading.Lock()
+        self._next_ticket = 0
+        self._serving = 0
+        self._active: Optional[int] = None
+        self._reserved_at: Dict[int, float] = {}
+        self._acquired_at: Dict[int, float] = {}
+        self._waiters: Dict[int, concurrent.futures.Future] = {}
+        self._abandoned: Set[int] = set()
+
+        # Statistics
+        self.completed = 0
+        self.rejected = 0
+        self.peak_depth = 0
+        self._waits = 0
+        self._wait_total = 0.0
+        self._last_wait = 0.0
+
+    def reserve(self) -> int:
+        """
+        Reserve a place in the injection order
+
+        Returns:
+            Ticket to pass to acquire() and release()
+
+        Raises:
+            InjectionQueueFull: If max_depth requests are already outstanding
+        """
+        with self._lock:
+            if len(self._reserved_at) >= self.max_depth:
+                self.rejected += 1
+                raise InjectionQueueFull(f"{len(self._reserved_at)} requests already queued")
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            self._reserved_at[ticket] = time.monotonic()
+            self.peak_depth = max(self.peak_depth, len(self._reserved_at))
+            return ticket
+
+    def position(self, ticket: int) -> int:
+        """Number of outstanding requests ahead of a ticket"""
+        with self._lock:
+            return sum(1 for other in self._reserved_at if other < ticket)
+
+    async def acquire(self, ticket: int):
+        """
+        Wait until it is this ticket's turn to inject
+
+        Calling it again once the turn is held returns immediately.
+        """
+        with self._lock:
+            if self._active == ticket:
+                return
+            self._acquired_at[ticket] = time.monotonic()
+            if self._serving == ticket:
+                self._grant(ticket)
+                return
+            waiter = concurrent.futures.Future()
+            self._waiters[ticket] = waiter
+        await asyncio.wrap_future(waiter)
+
+    def release(self, ticket: int):
+        """
+        Finish a ticket, handing the turn to the next one in order
+
+        Safe to call for a ticket that never acquired its turn; it is then
+        skipped when its turn comes. Calling it twice is a no-op.
+        """
+        with self._lock:
+            if self._reserved_at.pop(ticket, None) is None:
+                return
+            self._waiters.pop(ticket, None)
+            self._acquired_at.pop(ticket, None)
+            if ticket != self._serving:
+                self._abandoned.add(ticket)
+                return
+            if self._active == ticket:
+                self.completed += 1
+            self._active = None
+            self._advance()
+
+    def _advance(self):
+        """Move to the next ticket that has not been abandoned (lock held)"""
+        self._serving += 1
+        while self._serving in self._abandoned:
+            self._abandoned.discard(self._serving)
+            self._serving += 1
+        waiter = self._waiters.pop(self._serving, None)
+        if waiter is not None:
+            self._grant(self._serving)
+            waiter.set_result(None)
+
+    def _grant(self, ticket: int):
+        """Give the turn to a ticket and record how long it waited for it (lock held)"""
+        now = time.monotonic()
+        self._active = ticket
+        self._last_wait = now - self._acquired_at.pop(ticket, now)
+        self._waits += 1
+        self._wait_total += self._last_wait
+        metrics.observe('aiput_stage_seconds', self._last_wait, stage='queue_wait')
+
+    def depth(self) -> int:
+        """Number of outstanding requests (processing, waiting or injecting)"""
+        with self._lock:
+            return len(self._reserved_at)
+
+    def stats(self) -> Dict[str, object]:
+        """Return queue depth and wait statistics"""
+        with self._lock:
+            return {
+                "depth": len(self._reserved_at),
+                "waiting": len(self._waiters),
+                "injecting": self._active is not None,
+                "max_depth": self.max_depth,
+                "peak_depth": self.peak_depth,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_wait_ms": round(self._wait_total / self._waits * 1000, 1) if self._waits else 0.0,
+                "last_wait_ms": round(self._last_wait * 1000, 1),
+            }
@@ -0,0 +1,229 @@
+"""In-process metrics: latency histograms and counters
+
+Usage::
+
+    import metrics
+
+    with metrics.timer('aiput_stage_seconds', stage='paste'):
+        await keyboard.send_paste_command()
+    metrics.inc('aiput_errors_total', stage='paste')
+
+Histograms use log-linear buckets (HDR style): every power of two from
+~0.12ms to ~65s is split into 4 equal sub-buckets, so percentiles are
+accurate to within ~25% anywhere in that range at a fixed memory cost.
+``snapshot()`` returns JSON-friendly summaries (count, sum, min, max,
+p50/p90/p99); ``render_prometheus()`` returns the Prometheus text format.
+
+Values gathered elsewhere (e.g. AI retry counters) can be exported at
+scrape time with ``register_collector()``.
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Bucket upper bounds in seconds: 2**e * (1 + k/4) for e in [-13, 6), k in [0, 4)
+SUB_BUCKETS = 4
+BUCKET_BOUNDS: List[float] = [
+    2.0 ** exp * (1 + k / SUB_BUCKETS) for exp in range(-13, 6) for k in range(SUB_BUCKETS)
+] + [2.0 ** 6]
+
+# Every other bound is exported to Prometheus to keep the output compact
+PROMETHEUS_BOUNDS = BUCKET_BOUNDS[::2]
+
+HELP = {
+    'aiput_stage_seconds': 'Duration of each /type pipeline stage',
+    'aiput_ai_seconds': 'AI processing time per provider (until the last token)',
+    'aiput_ai_first_token_seconds': 'Time to the first streamed AI sentence per provider',
+    'aiput_tool_seconds': 'Duration of one clipboard or keyboard tool invocation',
+    'aiput_requests_total': '/type requests by outcome',
+    'aiput_errors_total': 'Failed pipeline stages',
+    'aiput_fallbacks_total': 'Times a faster method failed and a slower one was tried',
+    'aiput_tool_errors_total': 'Failed tool invocations by reason',
+    'aiput_ai_retries_total': 'AI request attempts retried by a provider',
+    'aiput_ai_hedges_total': 'Hedged AI requests sent to a backup provider',
+    'aiput_ai_hedge_wins_total': 'Hedged AI requests answered first by the backup',
+    'aiput_ai_reroutes_total': 'AI requests rerouted away from an open circuit',
+    'aiput_ai_coalesced_total': 'Identical AI requests served by one in-flight call',
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Log-linear latency histogram"""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """Estimate a percentile by interpolating inside its bucket"""
+        if not self.count:
+            return None
+        rank = percent / 100 * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = BUCKET_BOUNDS[index - 1] if index > 0 else 0.0
+                upper = BUCKET_BOUNDS[index] if index < len(BUCKET_BOUNDS) else self.max
+                value = lower + (upper - lower) * (rank - seen) / bucket_count
+                return min(max(value, self.min), self.max)
+            seen += bucket_count
+        return self.max
+
+    def summary(self) -> Dict[str, object]:
+        def ms(value):
+            return None if value is None else round(value * 1000, 2)
+        return {
+            'count': self.count,
+            'sum_ms': ms(self.sum),
+            'min_ms': ms(self.min),
+            'p50_ms': ms(self.percentile(50)),
+            'p90_ms': ms(self.percentile(90)),
+            'p99_ms': ms(self.percentile(99)),
+            'max_ms': ms(self.max),
+        }
+
+    def cumulative(self, bounds: Iterable[float]) -> List[Tuple[float, int]]:
+        """Cumulative counts at the given bucket bounds (must be BUCKET_BOUNDS entries)"""
+        result = []
+        total = 0
+        index = 0
+        for bound in bounds:
+            while index < len(BUCKET_BOUNDS) and BUCKET_BOUNDS[index] <= bound:
+                total += self.counts[index]
+                index += 1
+            result.append((bound, total))
+        return result
+
+
+class MetricsRegistry:
+    """Thread-safe set of labelled histograms and counters"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._collectors: List[Callable[[], Iterable[Tuple[str, Dict[str, str], float]]]] = []
+
+    @staticmethod
+    def _labels(labels: Dict[str, object]) -> Labels:
+        return tuple(sorted((key, str(value)) for key, value in labels.items() if value is not None))
+
+    def observe(self, name: str, seconds: float, **labels):
+        """Record one duration in seconds"""
+        key = self._labels(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+            histogram.observe(seconds)
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        """Increase a counter"""
+        key = self._labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """Observe how long the enclosed block takes (also when it raises)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def register_collector(self, collector: Callable[[], Iterable[Tuple[str, Dict[str, str], float]]]):
+        """Add a callable returning ``(counter name, labels, value)`` at scrape time"""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def _collected(self) -> Dict[str, Dict[Labels, float]]:
+        collected: Dict[str, Dict[Labels, float]] = {}
+        for collector in list(self._collectors):
+            try:
+                for name, labels, value in collector():
+                    collected.setdefault(name, {})[self._labels(labels)] = value
+            except Exception:
+                # A failing collector must not break the endpoint
+                continue
+        return collected
+
+    def snapshot(self) -> Dict[str, object]:
+        """JSON-friendly view: histogram summaries and counter values"""
+        with self._lock:
+            histograms = {name: {key: hist.summary() for key, hist in series.items()}
+                          for name, series in self._histograms.items()}
+            counters = {name: dict(series) for name, series in self._counters.items()}
+        counters.update(self._collected())
+
+        def label_text(key: Labels) -> str:
+            return ','.join(f"{k}={v}" for k, v in key) or '_'
+
+        return {
+            'histograms': {name: {label_text(key): value for key, value in series.items()}
+                           for name, series in sorted(histograms.items())},
+            'counters': {name: {label_text(key): value for key, value in series.items()}
+                         for name, series in sorted(counters.items())},
+        }
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        def fmt_labels(key: Labels, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+            pairs = list(key) + list(extra)
+            if not pairs:
+                return ''
+            escaped = (v.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"') for _, v in pairs)
+            return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + '}'
+
+        lines = []
+        with self._lock:
+            histograms = {name: {key: (hist.cumulative(PROMETHEUS_BOUNDS), hist.count, hist.sum)
+                                 for key, hist in series.items()}
+                          for name, series in self._histograms.items()}
+            counters = {name: dict(series) for name, series in self._counters.items()}
+        counters.update(self._collected())
+
+        for name, series in sorted(histograms.items()):
+            lines.append(f"# HELP {name} {HELP.get(name, name)}")
+            lines.append(f"# TYPE {name} histogram")
+            for key, (buckets, count, total) in sorted(series.items()):
+                for bound, cumulative in buckets:
+                    lines.append(f"{name}_bucket{fmt_labels(key, (('le', repr(bound)),))} {cumulative}")
+                lines.append(f"{name}_bucket{fmt_labels(key, (('le', '+Inf'),))} {count}")
+                lines.append(f"{name}_sum{fmt_labels(key)} {total}")
+                lines.append(f"{name}_count{fmt_labels(key)} {count}")
+
+        for name, series in sorted(counters.items()):
+            lines.append(f"# HELP {name} {HELP.get(name, name)}")
+            lines.append(f"# TYPE {name} counter")
+            for key, value in sorted(series.items()):
+                lines.append(f"{name}{fmt_labels(key)} {value}")
+
+        return '\n'.join(lines) + '\n'
+
+
+# Process-wide registry
+registry = MetricsRegistry()
+observe = registry.observe
+inc = registry.inc
+timer = registry.timer
+register_collector = registry.register_collector
+snapshot = registry.snapshot
+render_prometheus = registry.render_prometheus
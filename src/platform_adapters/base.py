@@ -2,6 +2,7 @@
 Abstract base classes for platform adapters.
 """
 
+import asyncio
 from abc import ABC, abstractmethod
 from typing import Optional, List, Dict, Any, Callable
 from dataclasses import dataclass
@@ -120,6 +121,78 @@ class ClipboardAdapter(ABC):
         """
         pass
 
+    def copy_confirmed(self) -> bool:
+        """Check whether the last successful copy_text() is already pasteable.
+
+        Returns:
+            bool: True if other applications are guaranteed to see the new
+            contents; False (default) if callers should let the clipboard
+            settle before pasting.
+        """
+        return False
+
+    async def read_text(self) -> Optional[str]:
+        """Read the current clipboard text.
+
+        Returns:
+            Optional[str]: Clipboard text ('' if empty or not yet available),
+            or None if reading is not supported.
+        """
+        return None
+
+    async def wait_until_readable(self, text: str, ceiling: float) -> float:
+        """Wait until the clipboard holds ``text``.
+
+        Confirmed copies return immediately. Otherwise the clipboard is read
+        back with exponential backoff (5ms, 10ms, 20ms, ...) until it matches
+        or ``ceiling`` seconds have passed; adapters that cannot read the
+        clipboard wait the full ceiling.
+
+        Args:
+            text: Text that was just copied.
+            ceiling: Maximum seconds to wait.
+
+        Returns:
+            float: Seconds actually waited.
+        """
+        if self.copy_confirmed():
+            return 0.0
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        delay = 0.005
+        while True:
+            current = await self.read_text()
+            elapsed = loop.time() - start
+            if current is None:
+                await asyncio.sleep(max(0.0, ceiling - elapsed))
+                return loop.time() - start
+            if current.rstrip('\n') == text.rstrip('\n') or elapsed >= ceiling:
+                return elapsed
+            await asyncio.sleep(min(delay, ceiling - elapsed))
+            delay *= 2
+
+    def paste_sent(self, since: float) -> None:
+        """Note that a paste keystroke for the current contents was sent.
+
+        Args:
+            since: time.monotonic() taken just before the keystroke; only
+                clipboard requests from then on count as the paste.
+        """
+        pass
+
+    async def wait_paste_consumed(self, timeout: float) -> Optional[float]:
+        """Wait until the target application has fetched the pasted contents.
+
+        Args:
+            timeout: Maximum seconds to wait.
+
+        Returns:
+            Optional[float]: Seconds waited, or None if this cannot be
+            observed (callers then fall back to a fixed delay).
+        """
+        return None
+
 
 class SystemTrayAdapter(ABC):
     """Abstract interface for system tray integration."""
@@ -169,6 +242,33 @@ class SystemTrayAdapter(ABC):
         pass  # Optional implementation
 
 
+class NullSystemTrayAdapter(SystemTrayAdapter):
+    """System tray adapter that does nothing (headless runs, unsupported platforms)."""
+
+    def __init__(self, platform_info=None):
+        self.platform_info = platform_info
+
+    def create_tray_icon(self, menu_items: List[MenuItem]) -> bool:
+        """Create system tray icon (not supported)."""
+        return False
+
+    def is_supported(self) -> bool:
+        """Check if system tray is supported."""
+        return False
+
+    def hide_window(self) -> None:
+        """Hide window."""
+        pass
+
+    def show_window(self) -> None:
+        """Show window."""
+        pass
+
+    def stop(self) -> None:
+        """Stop tray icon."""
+        pass
+
+
 class ResourceAdapter(ABC):
     """Abstract interface for resource management."""
 
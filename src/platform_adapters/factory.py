@@ -3,23 +3,24 @@ Factory for creating platform-specific adapters.
 """
 
 import os
+import importlib
 import subprocess
 from typing import Dict, Type, Optional, Any
 from platform_detection.detector import PlatformDetector, PlatformInfo
+from platform_detection.tools import find_tool, has_module
 from platform_detection.capabilities import PlatformCapabilities
 from platform_adapters.base import (
     KeyboardAdapter, ClipboardAdapter, SystemTrayAdapter,
-    ResourceAdapter, NotificationAdapter
+    ResourceAdapter, NotificationAdapter, NullSystemTrayAdapter
 )
-from platform_adapters.linux.adapter import LinuxAdapter
-from platform_adapters.windows.adapter import WindowsAdapter
-from platform_adapters.macos.adapter import MacOSAdapter
+from platform_adapters.process import run_blocking
+from platform_adapters.optional import load_pyautogui
 
 
 class GenericAdapter:
     """Generic fallback adapter for unsupported platforms."""
 
-    def __init__(self, platform_info: PlatformInfo):
+    def __init__(self, platform_info: PlatformInfo, headless: bool = False):
         self.platform_info = platform_info
         self.keyboard = GenericKeyboardAdapter(platform_info)
         self.clipboard = GenericClipboardAdapter(platform_info)
@@ -37,27 +38,19 @@ class GenericKeyboardAdapter(KeyboardAdapter):
 
     def __init__(self, platform_info: PlatformInfo):
         self.platform_info = platform_info
-        try:
-            import pyautogui
-            pyautogui.PAUSE = 0.1
-            pyautogui.FAILSAFE = False
-            self._pyautogui = pyautogui
-            self._available = True
-        except (ImportError, Exception) as e:
-            # 捕获 ImportError 和 X11 连接错误
-            self._pyautogui = None
-            self._available = False
 
     async def send_paste_command(self) -> bool:
         """Send paste command using generic method."""
-        if self._available and self._pyautogui:
+        # pyautogui is imported on first use (it loads tkinter)
+        pyautogui = load_pyautogui()
+        if pyautogui:
             try:
                 # Try both Shift+Insert and Ctrl+V
-                self._pyautogui.hotkey('shift', 'insert')
+                pyautogui.hotkey('shift', 'insert')
                 return True
             except:
                 try:
-                    self._pyautogui.hotkey('ctrl', 'v')
+                    pyautogui.hotkey('ctrl', 'v')
                     return True
                 except:
                     pass
@@ -65,11 +58,11 @@ class GenericKeyboardAdapter(KeyboardAdapter):
 
     def is_available(self) -> bool:
         """Check if keyboard simulation is available."""
-        return self._available
+        return load_pyautogui() is not None
 
     def get_available_methods(self) -> list:
         """Get available methods."""
-        return ['pyautogui'] if self._available else []
+        return ['pyautogui'] if has_module('pyautogui') else []
 
 
 class GenericClipboardAdapter(ClipboardAdapter):
@@ -98,6 +91,15 @@ class GenericClipboardAdapter(ClipboardAdapter):
                 pass
         return False
 
+    async def read_text(self) -> Optional[str]:
+        """Read clipboard text back."""
+        if self._pyperclip:
+            try:
+                return await run_blocking(self._pyperclip.paste)
+            except Exception:
+                pass
+        return None
+
     def is_available(self) -> bool:
         """Check if clipboard is available."""
         return self._pyperclip is not None
@@ -107,32 +109,9 @@ class GenericClipboardAdapter(ClipboardAdapter):
         return 'pyperclip' if self._pyperclip else None
 
 
-class GenericSystemTrayAdapter(SystemTrayAdapter):
+class GenericSystemTrayAdapter(NullSystemTrayAdapter):
     """Generic system tray adapter (no-op implementation)."""
 
-    def __init__(self, platform_info: PlatformInfo):
-        self.platform_info = platform_info
-
-    def create_tray_icon(self, menu_items) -> bool:
-        """Create system tray icon (not supported)."""
-        return False
-
-    def is_supported(self) -> bool:
-        """Check if system tray is supported."""
-        return False
-
-    def hide_window(self) -> None:
-        """Hide window."""
-        pass
-
-    def show_window(self) -> None:
-        """Show window."""
-        pass
-
-    def stop(self) -> None:
-        """Stop tray icon."""
-        pass
-
 
 class GenericResourceAdapter(ResourceAdapter):
     """Generic resource adapter."""
@@ -222,9 +201,11 @@ class GenericNotificationAdapter(NotificationAdapter):
         for player in players:
             try:
                 # Check if player is available
-                subprocess.run(['which', player], capture_output=True, check=True)
+                player_path = find_tool(player)
+                if not player_path:
+                    continue
                 print(f"[DEBUG] Playing custom sound with {player}...")
-                subprocess.Popen([player, self._custom_sound],
+                subprocess.Popen([player_path, self._custom_sound],
                                stdout=subprocess.DEVNULL,
                                stderr=subprocess.DEVNULL)
                 return True
@@ -242,20 +223,32 @@ class GenericNotificationAdapter(NotificationAdapter):
 class AdapterFactory:
     """Factory for creating platform-specific adapters."""
 
-    _adapter_map: Dict[str, Type] = {
-        'Linux': LinuxAdapter,
-        'Windows': WindowsAdapter,
-        'Darwin': MacOSAdapter,  # macOS reports as Darwin
+    # Imported on demand so only the current platform's adapter module (and
+    # its optional dependencies) is loaded
+    _adapter_map: Dict[str, str] = {
+        'Linux': 'platform_adapters.linux.adapter:LinuxAdapter',
+        'Windows': 'platform_adapters.windows.adapter:WindowsAdapter',
+        'Darwin': 'platform_adapters.macos.adapter:MacOSAdapter',  # macOS reports as Darwin
     }
 
     _instances: Dict[str, Any] = {}
 
     @classmethod
-    def create_adapters(cls, platform_info: Optional[PlatformInfo] = None):
+    def _load_adapter_class(cls, os_name: str) -> Type:
+        """Import the adapter class for an OS, or return GenericAdapter."""
+        target = cls._adapter_map.get(os_name)
+        if not target:
+            return GenericAdapter
+        module_name, class_name = target.split(':')
+        return getattr(importlib.import_module(module_name), class_name)
+
+    @classmethod
+    def create_adapters(cls, platform_info: Optional[PlatformInfo] = None, headless: bool = False):
         """Create appropriate adapters for the current platform.
 
         Args:
             platform_info: Optional pre-detected platform info
+            headless: Skip the system tray (no pystray/PIL imports)
 
         Returns:
             Adapter instance with keyboard, clipboard, system_tray, and resources
@@ -265,17 +258,18 @@ class AdapterFactory:
             platform_info = PlatformDetector.detect()
 
         # Create cache key
-        cache_key = f"{platform_info.os_name}_{platform_info.display_protocol}_{platform_info.desktop_environment}"
+        cache_key = (f"{platform_info.os_name}_{platform_info.display_protocol}_"
+                     f"{platform_info.desktop_environment}_{headless}")
 
         # Return cached instance if available
         if cache_key in cls._instances:
             return cls._instances[cache_key]
 
         # Get adapter class for platform
-        adapter_class = cls._adapter_map.get(platform_info.os_name, GenericAdapter)
+        adapter_class = cls._load_adapter_class(platform_info.os_name)
 
         # Create and cache instance
-        adapter = adapter_class(platform_info)
+        adapter = adapter_class(platform_info, headless=headless)
         adapter.initialize()
 
         cls._instances[cache_key] = adapter
@@ -10,17 +10,6 @@ import time
 from typing import List, Optional, Dict, Any
 from pathlib import Path
 
-try:
-    import pyautogui
-    pyautogui.PAUSE = 0.1
-    pyautogui.FAILSAFE = False
-    PYAUTOGUI_AVAILABLE = True
-except (ImportError, Exception) as e:
-    # 捕获 ImportError 和 X11 连接错误
-    # 在某些环境下，pyautogui 导入时会尝试连接 X11 display
-    PYAUTOGUI_AVAILABLE = False
-    pyautogui = None
-
 try:
     import pyperclip
     PIPERCLIP_AVAILABLE = True
@@ -30,11 +19,18 @@ except (ImportError, Exception):
 
 from platform_adapters.base import (
     KeyboardAdapter, ClipboardAdapter, SystemTrayAdapter,
-    ResourceAdapter, NotificationAdapter, MenuItem
+    ResourceAdapter, NotificationAdapter, MenuItem, NullSystemTrayAdapter
 )
 from platform_detection.detector import PlatformInfo
+from platform_detection.tools import has_tool, has_module, resolve_command
+from platform_detection.cache import get_app_data_dir
+from platform_adapters.process import run_tool, read_tool, run_blocking
+from platform_adapters.optional import load_pyautogui
 from platform_adapters.linux.wayland import WaylandKeyboardAdapter
 from platform_adapters.linux.x11 import X11KeyboardAdapter
+from platform_adapters.linux.x11_selection import X11SelectionOwner, XLIB_AVAILABLE
+from platform_adapters.linux.wayland_selection import WaylandSelectionOwner, PYWAYLAND_AVAILABLE
+import metrics
 
 
 class LinuxKeyboardAdapter(KeyboardAdapter):
@@ -60,10 +56,11 @@ class LinuxKeyboardAdapter(KeyboardAdapter):
         if self._specific_adapter:
             return await self._specific_adapter.send_paste_command()
 
-        # Fallback to pyautogui if available
-        if PYAUTOGUI_AVAILABLE:
+        # Fallback to pyautogui if available (imported on first use; it loads tkinter)
+        pyautogui = load_pyautogui()
+        if pyautogui:
             try:
-                pyautogui.hotkey('shift', 'insert')
+                await run_blocking(pyautogui.hotkey, 'shift', 'insert')
                 return True
             except Exception:
                 pass
@@ -76,9 +73,10 @@ class LinuxKeyboardAdapter(KeyboardAdapter):
             return await self._specific_adapter.send_ctrl_enter()
 
         # Fallback to pyautogui if available
-        if PYAUTOGUI_AVAILABLE:
+        pyautogui = load_pyautogui()
+        if pyautogui:
             try:
-                pyautogui.hotkey('ctrl', 'enter')
+                await run_blocking(pyautogui.hotkey, 'ctrl', 'enter')
                 return True
             except Exception:
                 pass
@@ -89,7 +87,7 @@ class LinuxKeyboardAdapter(KeyboardAdapter):
         """Check if keyboard simulation is available."""
         if self._specific_adapter:
             return self._specific_adapter.is_available()
-        return PYAUTOGUI_AVAILABLE
+        return load_pyautogui() is not None
 
     def get_available_methods(self) -> List[str]:
         """Get list of available keyboard simulation methods."""
@@ -98,11 +96,17 @@ class LinuxKeyboardAdapter(KeyboardAdapter):
         if self._specific_adapter:
             methods.extend(self._specific_adapter.get_available_methods())
 
-        if PYAUTOGUI_AVAILABLE:
+        if has_module('pyautogui'):
             methods.append('pyautogui')
 
         return methods
 
+    def get_stats(self) -> dict:
+        """Get keystroke helper statistics from the specific adapter."""
+        if self._specific_adapter and hasattr(self._specific_adapter, 'get_stats'):
+            return self._specific_adapter.get_stats()
+        return {}
+
     async def send_text(self, text: str) -> bool:
         """Send text directly using the specific adapter if available."""
         if self._specific_adapter:
@@ -129,9 +133,21 @@ class LinuxClipboardAdapter(ClipboardAdapter):
         self._is_x11 = platform_info.display_protocol == 'X11'
         self._preferred_tool = None
         self._available_tools = platform_info.additional_info.get('clipboard_tools', [])
+        self._selection_owner = None
+        self._last_copy_confirmed = False
 
     def setup(self) -> None:
         """Initialize clipboard support."""
+        # Own the clipboard selection in-process instead of spawning tools
+        if (self._is_x11 and XLIB_AVAILABLE
+                and os.getenv('AIPUT_X11_SELECTION_OWNER', 'true').lower() == 'true'):
+            self._selection_owner = X11SelectionOwner()
+            self._selection_owner.start()
+        elif (self._is_wayland and PYWAYLAND_AVAILABLE
+                and os.getenv('AIPUT_WAYLAND_SELECTION_OWNER', 'true').lower() == 'true'):
+            self._selection_owner = WaylandSelectionOwner()
+            self._selection_owner.start()
+
         # Choose preferred tool based on environment
         if self._is_wayland:
             # Prefer Wayland-native tools
@@ -149,31 +165,32 @@ class LinuxClipboardAdapter(ClipboardAdapter):
 
     async def copy_text(self, text: str) -> bool:
         """Copy text to clipboard."""
+        self._last_copy_confirmed = False
+        if self._selection_owner:
+            if await self._selection_owner.copy_text(text):
+                self._last_copy_confirmed = True
+                return True
+            metrics.inc('aiput_fallbacks_total', component='clipboard', method=self.get_preferred_tool())
+
         # Try tool-specific method first
         if self._preferred_tool:
             try:
                 if self._preferred_tool == 'wl-copy':
-                    subprocess.run(['wl-copy'], input=text.encode(), check=True)
-                    return True
+                    if await run_tool(['wl-copy'], input=text.encode()) == 0:
+                        return True
                 elif self._preferred_tool == 'xclip':
-                    proc = subprocess.Popen(['xclip', '-selection', 'clipboard'],
-                                         stdin=subprocess.PIPE)
-                    proc.communicate(text.encode())
-                    return proc.returncode == 0
+                    return await run_tool(['xclip', '-selection', 'clipboard'], input=text.encode()) == 0
                 elif self._preferred_tool == 'xsel':
-                    proc = subprocess.Popen(['xsel', '--clipboard', '--input'],
-                                         stdin=subprocess.PIPE)
-                    proc.communicate(text.encode())
-                    return proc.returncode == 0
+                    return await run_tool(['xsel', '--clipboard', '--input'], input=text.encode()) == 0
             except Exception:
                 pass
+            metrics.inc('aiput_fallbacks_total', component='clipboard', method=self._preferred_tool)
 
         # Fallback to pyperclip
         if PIPERCLIP_AVAILABLE:
             try:
-                pyperclip.copy(text)
-                # Give it a moment to take effect
-                await asyncio.sleep(0.1)
+                with metrics.timer('aiput_tool_seconds', tool='pyperclip'):
+                    await run_blocking(pyperclip.copy, text)
                 return True
             except Exception:
                 pass
@@ -186,8 +203,48 @@ class LinuxClipboardAdapter(ClipboardAdapter):
 
     def get_preferred_tool(self) -> Optional[str]:
         """Get the preferred clipboard tool being used."""
+        if isinstance(self._selection_owner, WaylandSelectionOwner):
+            return 'wayland-data-control'
+        if self._selection_owner:
+            return 'x11-selection-owner'
         return self._preferred_tool or ('pyperclip' if PIPERCLIP_AVAILABLE else None)
 
+    def copy_confirmed(self) -> bool:
+        """True if the last copy was confirmed by taking selection ownership."""
+        return self._last_copy_confirmed
+
+    async def read_text(self) -> Optional[str]:
+        """Read the clipboard back with the matching paste tool."""
+        read_commands = {
+            'wl-copy': ['wl-paste', '--no-newline'],
+            'xclip': ['xclip', '-selection', 'clipboard', '-o'],
+            'xsel': ['xsel', '--clipboard', '--output'],
+        }
+        try:
+            if self._preferred_tool in read_commands:
+                output = await read_tool(read_commands[self._preferred_tool], timeout=1)
+                return output.decode('utf-8', errors='replace') if output is not None else ''
+            if PIPERCLIP_AVAILABLE:
+                return await run_blocking(pyperclip.paste)
+        except Exception:
+            pass
+        return None
+
+    def paste_sent(self, since: float) -> None:
+        """Arm paste tracking on the selection owner."""
+        if self._last_copy_confirmed:
+            self._selection_owner.arm_served(since)
+
+    async def wait_paste_consumed(self, timeout: float) -> Optional[float]:
+        """Wait until an application fetched the text after the paste keystroke."""
+        if not self._last_copy_confirmed or not self._selection_owner.is_armed():
+            # Not observable: the caller falls back to a fixed delay
+            return None
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await self._selection_owner.wait_served(timeout)
+        return loop.time() - start
+
 
 class LinuxSystemTrayAdapter(SystemTrayAdapter):
     """Linux system tray adapter using pystray."""
@@ -341,13 +398,8 @@ class LinuxResourceAdapter(ResourceAdapter):
 
     def get_app_data_dir(self) -> Optional[str]:
         """Get application data directory."""
-        # Follow XDG Base Directory Specification
-        xdg_data_home = os.environ.get('XDG_DATA_HOME')
-        if xdg_data_home:
-            return os.path.join(xdg_data_home, 'aiput')
-
-        # Fallback to ~/.local/share
-        return os.path.expanduser('~/.local/share/aiput')
+        # Shared with the platform detection cache
+        return get_app_data_dir()
 
 
 class LinuxNotificationAdapter(NotificationAdapter):
@@ -363,13 +415,31 @@ class LinuxNotificationAdapter(NotificationAdapter):
         # Use custom sound file
         self._custom_sound = '/home/newbe36524/repos/newbe36524/qaa-airtype/src/assets/029_Decline_09.wav'
 
+        # Longest wait for a player to fail on start-up
+        self._start_check = float(os.getenv('AIPUT_SOUND_START_CHECK', '0.1'))
+
     def _check_command(self, command: str) -> bool:
         """Check if a command is available."""
+        return has_tool(command)
+
+    def _player_started(self, proc: subprocess.Popen, player: str) -> bool:
+        """Check that a sound player did not fail immediately.
+
+        Returns as soon as the player exits, or after the start-up check
+        ceiling if it is still playing.
+        """
         try:
-            subprocess.run(['which', command], capture_output=True, check=True)
+            proc.wait(timeout=self._start_check)
+        except subprocess.TimeoutExpired:
+            print(f"[DEBUG] ✓ {player} started successfully")
             return True
-        except:
-            return False
+        _, stderr = proc.communicate()
+        if proc.returncode == 0:
+            # Short sound already finished
+            return True
+        if stderr:
+            print(f"[DEBUG] ✗ {player} error: {stderr.decode()}")
+        return False
 
     def show_notification(self, title: str, message: str, duration: int = 5000) -> bool:
         """Show a Linux notification (not implemented for now)."""
@@ -399,20 +469,12 @@ class LinuxNotificationAdapter(NotificationAdapter):
         if self._aplay_available:
             try:
                 print(f"[DEBUG] Playing custom sound with aplay...")
-                proc = subprocess.Popen(['aplay', self._custom_sound],
+                proc = subprocess.Popen(resolve_command(['aplay', self._custom_sound]),
                                        stdout=subprocess.DEVNULL,
                                        stderr=subprocess.PIPE)
-                # Give it a moment to start
-                import time
-                time.sleep(0.1)
-                if proc.poll() is None:
-                    print("[DEBUG] ✓ aplay started successfully")
+                if self._player_started(proc, 'aplay'):
                     # Let it run in background
                     return True
-                else:
-                    _, stderr = proc.communicate()
-                    if stderr:
-                        print(f"[DEBUG] ✗ aplay error: {stderr.decode()}")
             except Exception as e:
                 print(f"[DEBUG] aplay exception: {e}")
 
@@ -420,17 +482,11 @@ class LinuxNotificationAdapter(NotificationAdapter):
         if self._paplay_available:
             try:
                 print(f"[DEBUG] Playing custom sound with paplay...")
-                proc = subprocess.Popen(['paplay', self._custom_sound],
+                proc = subprocess.Popen(resolve_command(['paplay', self._custom_sound]),
                                        stdout=subprocess.DEVNULL,
                                        stderr=subprocess.PIPE)
-                time.sleep(0.1)
-                if proc.poll() is None:
-                    print("[DEBUG] ✓ paplay started successfully")
+                if self._player_started(proc, 'paplay'):
                     return True
-                else:
-                    _, stderr = proc.communicate()
-                    if stderr:
-                        print(f"[DEBUG] ✗ paplay error: {stderr.decode()}")
             except Exception as e:
                 print(f"[DEBUG] paplay exception: {e}")
 
@@ -446,11 +502,12 @@ class LinuxNotificationAdapter(NotificationAdapter):
 class LinuxAdapter:
     """Main Linux adapter combining all sub-adapters."""
 
-    def __init__(self, platform_info: PlatformInfo):
+    def __init__(self, platform_info: PlatformInfo, headless: bool = False):
         self.platform_info = platform_info
         self.keyboard = LinuxKeyboardAdapter(platform_info)
         self.clipboard = LinuxClipboardAdapter(platform_info)
-        self.system_tray = LinuxSystemTrayAdapter(platform_info)
+        # Headless runs have no tray; pystray would import PIL and a GUI backend
+        self.system_tray = NullSystemTrayAdapter(platform_info) if headless else LinuxSystemTrayAdapter(platform_info)
         self.resources = LinuxResourceAdapter(platform_info)
         self.notifications = LinuxNotificationAdapter(platform_info)
 
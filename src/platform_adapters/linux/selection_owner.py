@@ -0,0 +1,202 @@
+"""
+Shared machinery for in-process clipboard selection owners.
+"""
+
+import os
+import asyncio
+import time
+import select
+import threading
+import concurrent.futures
+from abc import ABC, abstractmethod
+from typing import List, Optional
+import metrics
+
+# Larger payloads are left to the clipboard tools (X11 would need INCR);
+# subclasses may lower the limit once connected (max_bytes)
+MAX_INLINE_BYTES = 256 * 1024
+
+
+class SelectionOwner(ABC):
+    """Owns the clipboard selection from a background thread.
+
+    The thread keeps one display connection open and serves paste requests
+    from memory. copy_text() updates the stored text, asks the thread to
+    claim the selection and returns once the display server confirms the
+    claim, so the new contents are pasteable as soon as it returns.
+
+    Subclasses implement the display protocol: _connect(), _fileno(),
+    _claim(), _dispatch() and _disconnect(). They call _mark_served() when
+    an application fetched the text.
+
+    Clipboard managers fetch the text as soon as it is claimed, so paste
+    tracking is armed separately with arm_served() once the paste keystroke
+    is sent, and only requests from that point on count as the paste.
+    """
+
+    available = False
+    label = 'Clipboard'
+
+    def __init__(self, timeout: Optional[float] = None):
+        """Initialize the selection owner; call start() to connect.
+
+        Args:
+            timeout: Seconds to wait for ownership.
+        """
+        self.timeout = timeout or 1.0
+        self._data = b''
+        self._claims: List[concurrent.futures.Future] = []
+        self._lock = threading.Lock()
+        self._ready = concurrent.futures.Future()
+        self._thread = None
+        self._running = False
+        self._wake_r, self._wake_w = None, None
+        self.max_bytes = MAX_INLINE_BYTES
+        self._served: Optional[concurrent.futures.Future] = None
+        self._last_served: Optional[float] = None
+        self.owned = False
+
+    def start(self):
+        """Connect to the display server on a background thread."""
+        if self._thread is not None or not self.available:
+            return
+        self._wake_r, self._wake_w = os.pipe()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name=f'{self.label.lower()}-clipboard-owner',
+                                        daemon=True)
+        self._thread.start()
+
+    async def copy_text(self, text: str) -> bool:
+        """Publish text as the clipboard selection.
+
+        Returns:
+            bool: True once ownership is confirmed; False if the owner is not
+            running or the text is too large (callers fall back to tools).
+        """
+        data = text.encode('utf-8')
+        if self._thread is None or len(data) > MAX_INLINE_BYTES:
+            return False
+
+        try:
+            if not await asyncio.wait_for(asyncio.wrap_future(self._ready), self.timeout):
+                return False
+            if len(data) > self.max_bytes:
+                return False
+            claim = concurrent.futures.Future()
+            with self._lock:
+                self._data = data
+                self._claims.append(claim)
+                # New text: paste tracking starts again with the next arm_served()
+                self._served = None
+            start = time.perf_counter()
+            os.write(self._wake_w, b'c')
+            claimed = await asyncio.wait_for(asyncio.wrap_future(claim), self.timeout)
+            if claimed:
+                metrics.observe('aiput_tool_seconds', time.perf_counter() - start,
+                                tool=f'{self.label.lower()}-selection-owner')
+            return claimed
+        except (asyncio.TimeoutError, OSError):
+            return False
+
+    def arm_served(self, since: float):
+        """Start tracking the paste of the current text.
+
+        Args:
+            since: time.monotonic() taken just before the paste keystroke;
+                earlier requests (e.g. a clipboard manager) are ignored.
+        """
+        with self._lock:
+            self._served = concurrent.futures.Future()
+            if self._last_served is not None and self._last_served >= since:
+                self._served.set_result(None)
+
+    def is_armed(self) -> bool:
+        """True if arm_served() was called since the last copy."""
+        with self._lock:
+            return self._served is not None
+
+    async def wait_served(self, timeout: float) -> bool:
+        """Wait until some application has fetched the current text.
+
+        Returns:
+            bool: True if a text request was answered since arm_served();
+            False on timeout or if paste tracking is not armed.
+        """
+        with self._lock:
+            served = self._served
+        if served is None:
+            return False
+        try:
+            await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(served)), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def close(self):
+        """Stop the owner thread and close the display connection."""
+        self._running = False
+        if self._wake_w is not None:
+            try:
+                os.write(self._wake_w, b'q')
+            except OSError:
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+
+    def _run(self):
+        """Owner thread: connect, then serve claims and selection requests."""
+        try:
+            self._connect()
+        except Exception as e:
+            print(f"[{self.label}Clipboard] Cannot connect to display server ({e}), using clipboard tools")
+            self._ready.set_result(False)
+            return
+
+        self._ready.set_result(True)
+        try:
+            while self._running:
+                readable, _, _ = select.select([self._fileno(), self._wake_r], [], [], 1.0)
+                if self._wake_r in readable:
+                    os.read(self._wake_r, 64)
+                    with self._lock:
+                        claims, self._claims = self._claims, []
+                        data = self._data
+                    if claims:
+                        self.owned = self._claim(data)
+                        for claim in claims:
+                            claim.set_result(self.owned)
+                self._dispatch(self._fileno() in readable)
+        finally:
+            self._disconnect()
+
+    def _mark_served(self):
+        """Record that an application fetched the current text."""
+        with self._lock:
+            self._last_served = time.monotonic()
+            if self._served is not None and not self._served.done():
+                self._served.set_result(None)
+
+    @abstractmethod
+    def _connect(self):
+        """Open the display connection (owner thread); raise on failure."""
+        pass
+
+    @abstractmethod
+    def _fileno(self) -> int:
+        """File descriptor of the display connection."""
+        pass
+
+    @abstractmethod
+    def _claim(self, data: bytes) -> bool:
+        """Take the selection with data; return True if ownership is confirmed."""
+        pass
+
+    @abstractmethod
+    def _dispatch(self, readable: bool):
+        """Handle pending display events; readable means the fd has input."""
+        pass
+
+    @abstractmethod
+    def _disconnect(self):
+        """Close the display connection."""
+        pass
@@ -0,0 +1,239 @@
+"""
+Native key injection through the ydotoold socket or a /dev/uinput keyboard.
+"""
+
+import os
+import time
+import fcntl
+import select
+import socket
+import struct
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+import metrics
+from platform_adapters.process import run_blocking
+
+# linux/input-event-codes.h
+EV_SYN = 0x00
+EV_KEY = 0x01
+SYN_REPORT = 0
+
+KEY_ENTER = 28
+KEY_LEFTCTRL = 29
+KEY_LEFTSHIFT = 42
+KEY_SCROLLLOCK = 70
+KEY_INSERT = 110
+
+# struct input_event: struct timeval, __u16 type, __u16 code, __s32 value
+INPUT_EVENT = struct.Struct('llHHi')
+
+# linux/uinput.h
+UI_DEV_CREATE = 0x5501
+UI_DEV_DESTROY = 0x5502
+UI_DEV_SETUP = 0x405c5503
+UI_SET_EVBIT = 0x40045564
+UI_SET_KEYBIT = 0x40045565
+BUS_VIRTUAL = 0x06
+# struct uinput_setup: struct input_id (4 x __u16), char name[80], __u32 ff_effects_max
+UINPUT_SETUP = struct.Struct('HHHH80sI')
+
+# Expose the usual keyboard range so compositors classify the device as a keyboard
+KEYBOARD_KEYS = range(1, 249)
+
+# Longest wait for room in ydotoold's socket queue (net.unix.max_dgram_qlen is often 10)
+SEND_WAIT = 0.05
+
+# Pause between key events, like ydotool's --key-delay (12ms by default);
+# some applications miss modifiers that arrive in the same instant as the key
+KEY_DELAY = 0.012
+
+
+def chord(*keys: int) -> List[Tuple[int, int]]:
+    """Press keys in order and release them in reverse, as (code, value) pairs."""
+    return [(key, 1) for key in keys] + [(key, 0) for key in reversed(keys)]
+
+
+def _ydotool_socket_path() -> str:
+    # Same lookup as ydotool 1.x
+    return os.getenv('YDOTOOL_SOCKET') or '/tmp/.ydotool_socket'
+
+
+class KeyInjector:
+    """Writes key events to ydotoold's socket, or to our own uinput keyboard.
+
+    ydotoold reads raw ``struct input_event`` datagrams from its socket and
+    forwards them to its uinput device, so the ydotool CLI is only a
+    process around a few socket writes. This class keeps the socket
+    connected and writes the events itself. Without a reachable daemon it
+    creates a virtual keyboard on /dev/uinput once (needs write access).
+    Either way the kernel delivers the keys, whatever the compositor.
+
+    Writes pause between key events and may wait for the socket queue, so
+    async callers use press(), which runs them on a worker thread.
+    """
+
+    def __init__(self, socket_path: Optional[str] = None):
+        """Initialize the injector; call open() to connect.
+
+        Args:
+            socket_path: ydotoold socket (if None, will try to get from environment).
+        """
+        self.enabled = os.getenv('AIPUT_NATIVE_KEYS', 'true').lower() == 'true'
+        self.socket_path = socket_path or _ydotool_socket_path()
+        self.backend = None
+        self._sock = None
+        self._uinput_fd = None
+        self.key_delay = float(os.getenv('AIPUT_KEY_DELAY', str(KEY_DELAY)))
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.chords = 0
+        self.failures = 0
+        self.reconnects = 0
+        self._latency_total = 0.0
+        self.last_latency = 0.0
+        self.max_latency = 0.0
+
+    def open(self) -> bool:
+        """Connect to ydotoold, or create the uinput keyboard.
+
+        Returns:
+            bool: True if a backend is ready.
+        """
+        if not self.enabled:
+            return False
+        if self._connect_socket():
+            self.backend = 'ydotoold'
+        elif os.getenv('AIPUT_UINPUT_KEYBOARD', 'true').lower() == 'true' and self._create_uinput():
+            self.backend = 'uinput'
+        return self.backend is not None
+
+    async def press(self, keys: Sequence[Tuple[int, int]]) -> bool:
+        """Send key events from a worker thread, without blocking the event loop.
+
+        Returns:
+            bool: True if all events were written; False means fall back.
+        """
+        if self.backend is None:
+            return False
+        return await run_blocking(self.send, keys)
+
+    def send(self, keys: Sequence[Tuple[int, int]]) -> bool:
+        """Send (code, value) key events, each followed by a SYN_REPORT.
+
+        Blocks for key_delay between events; use press() from async code.
+
+        Returns:
+            bool: True if all events were written; False means fall back.
+        """
+        if self.backend is None:
+            return False
+
+        with self._lock:
+            start = time.perf_counter()
+            ok = self._write(keys)
+            if not ok and self.backend == 'ydotoold':
+                # The daemon may have restarted; reconnect once and retry
+                self.reconnects += 1
+                ok = self._connect_socket() and self._write(keys)
+            elapsed = time.perf_counter() - start
+
+            if not ok:
+                self.failures += 1
+                metrics.inc('aiput_fallbacks_total', component='keyboard', method=self.backend)
+                return False
+            self.chords += 1
+            metrics.observe('aiput_tool_seconds', elapsed, tool=self.backend)
+            self._latency_total += elapsed
+            self.last_latency = elapsed
+            self.max_latency = max(self.max_latency, elapsed)
+            return True
+
+    def close(self):
+        """Disconnect from ydotoold and destroy the uinput keyboard."""
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+        if self._uinput_fd is not None:
+            try:
+                fcntl.ioctl(self._uinput_fd, UI_DEV_DESTROY)
+            except OSError:
+                pass
+            os.close(self._uinput_fd)
+            self._uinput_fd = None
+        self.backend = None
+
+    def stats(self) -> Dict[str, object]:
+        """Return backend state and per-chord write latency statistics."""
+        return {
+            'backend': self.backend,
+            'chords': self.chords,
+            'failures': self.failures,
+            'reconnects': self.reconnects,
+            'avg_us': round(self._latency_total / self.chords * 1e6, 1) if self.chords else 0.0,
+            'last_us': round(self.last_latency * 1e6, 1),
+            'max_us': round(self.max_latency * 1e6, 1),
+        }
+
+    @staticmethod
+    def _event(ev_type: int, code: int, value: int) -> bytes:
+        now = time.time()
+        return INPUT_EVENT.pack(int(now), int(now % 1 * 1e6), ev_type, code, value)
+
+    def _write(self, keys: Sequence[Tuple[int, int]]) -> bool:
+        try:
+            for index, (code, value) in enumerate(keys):
+                if index and self.key_delay > 0:
+                    time.sleep(self.key_delay)
+                # Timestamps are taken when each event is actually written
+                for event in (self._event(EV_KEY, code, value), self._event(EV_SYN, SYN_REPORT, 0)):
+                    if self._sock is not None:
+                        self._send_datagram(event)
+                    else:
+                        os.write(self._uinput_fd, event)
+            return True
+        except OSError:
+            return False
+
+    def _send_datagram(self, event: bytes):
+        try:
+            self._sock.send(event)
+        except BlockingIOError:
+            # Queue full: give the daemon a moment to drain it
+            select.select([], [self._sock], [], SEND_WAIT)
+            self._sock.send(event)
+
+    def _connect_socket(self) -> bool:
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+        if not os.path.exists(self.socket_path):
+            return False
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            return False
+        sock.setblocking(False)
+        self._sock = sock
+        return True
+
+    def _create_uinput(self) -> bool:
+        try:
+            fd = os.open('/dev/uinput', os.O_WRONLY | os.O_NONBLOCK)
+        except OSError:
+            return False
+        try:
+            fcntl.ioctl(fd, UI_SET_EVBIT, EV_KEY)
+            for key in KEYBOARD_KEYS:
+                fcntl.ioctl(fd, UI_SET_KEYBIT, key)
+            setup = UINPUT_SETUP.pack(BUS_VIRTUAL, 0x1, 0x1, 1, b'AIPut virtual keyboard', 0)
+            fcntl.ioctl(fd, UI_DEV_SETUP, setup)
+            fcntl.ioctl(fd, UI_DEV_CREATE)
+        except OSError as e:
+            print(f"[KeyInjector] Cannot create uinput keyboard ({e})")
+            os.close(fd)
+            return False
+        self._uinput_fd = fd
+        return True
@@ -8,6 +8,13 @@ import subprocess
 from typing import List
 from platform_detection.detector import PlatformInfo
 from platform_adapters.base import KeyboardAdapter
+from platform_adapters.process import run_tool
+from platform_adapters.linux.xdo_session import XdoSession
+from platform_adapters.linux.uinput import (
+    KeyInjector, chord, KEY_ENTER, KEY_LEFTCTRL, KEY_LEFTSHIFT, KEY_SCROLLLOCK, KEY_INSERT
+)
+
+NATIVE_METHODS = {'ydotoold': 'ydotoold socket', 'uinput': 'uinput'}
 
 
 class WaylandKeyboardAdapter(KeyboardAdapter):
@@ -17,12 +24,20 @@ class WaylandKeyboardAdapter(KeyboardAdapter):
         self.platform_info = platform_info
         self._is_kde = platform_info.desktop_environment == 'KDE'
         self._available_methods = []
+        # Kernel-level key events: no process per chord and independent of the compositor
+        self._keys = KeyInjector()
         self._detect_methods()
+        # One persistent helper instead of an xdotool process per keystroke
+        self._xdo = XdoSession() if 'xdotool (KDE Wayland)' in self._available_methods else None
 
     def _detect_methods(self):
         """Detect available Wayland keyboard simulation methods."""
         tools = self.platform_info.additional_info.get('keyboard_tools', [])
 
+        # Prefer writing input events ourselves (ydotoold socket or uinput)
+        if self._keys.open():
+            self._available_methods.append(NATIVE_METHODS[self._keys.backend])
+
         # Check for Wayland-native tools
         if 'wtype' in tools:
             self._available_methods.append('wtype')
@@ -35,11 +50,16 @@ class WaylandKeyboardAdapter(KeyboardAdapter):
 
     async def send_paste_command(self) -> bool:
         """Send paste command using Wayland-compatible methods."""
+        if self._keys.backend and await self._keys.press(chord(KEY_LEFTSHIFT, KEY_INSERT)):
+            return True
+
         # Try xdotool first on KDE Wayland (最可靠的方法)
         if 'xdotool (KDE Wayland)' in self._available_methods:
+            sent = await self._xdo.send_keys('shift+Insert')
+            if sent is not None:
+                return sent
             try:
-                subprocess.run(['xdotool', 'key', 'shift+Insert'],
-                             check=False, timeout=1)
+                await run_tool(['xdotool', 'key', 'shift+Insert'], timeout=1)
                 return True
             except (subprocess.SubprocessError, subprocess.TimeoutExpired):
                 pass
@@ -49,8 +69,7 @@ class WaylandKeyboardAdapter(KeyboardAdapter):
             try:
                 # wtype: -M shift -P Insert
                 # wtype 会自动处理按键释放，不需要额外的命令
-                subprocess.run(['wtype', '-M', 'shift', '-P', 'Insert'],
-                             check=False, timeout=1)
+                await run_tool(['wtype', '-M', 'shift', '-P', 'Insert'], timeout=1)
                 return True
             except (subprocess.SubprocessError, subprocess.TimeoutExpired):
                 pass
@@ -58,9 +77,8 @@ class WaylandKeyboardAdapter(KeyboardAdapter):
         # Try ydotool (works on Wayland)
         if 'ydotool' in self._available_methods:
             try:
-                # ydotool key codes: 42=Shift, 118=Insert
-                subprocess.run(['ydotool', 'key', '42:1', '118:1', '118:0', '42:0'],
-                             check=False, timeout=1)
+                # ydotool key codes: 42=Shift, 110=Insert
+                await run_tool(['ydotool', 'key', '42:1', '110:1', '110:0', '42:0'], timeout=1)
                 return True
             except (subprocess.SubprocessError, subprocess.TimeoutExpired):
                 pass
@@ -69,11 +87,16 @@ class WaylandKeyboardAdapter(KeyboardAdapter):
 
     async def send_ctrl_enter(self) -> bool:
         """Send Ctrl+Enter key combination using Wayland-compatible methods."""
+        if self._keys.backend and await self._keys.press(chord(KEY_LEFTCTRL, KEY_ENTER)):
+            return True
+
         # Try xdotool first on KDE Wayland (最可靠的方法)
         if 'xdotool (KDE Wayland)' in self._available_methods:
+            sent = await self._xdo.send_keys('Ctrl+Return')
+            if sent is not None:
+                return sent
             try:
-                subprocess.run(['xdotool', 'key', 'Ctrl+Return'],
-                             check=False, timeout=1)
+                await run_tool(['xdotool', 'key', 'Ctrl+Return'], timeout=1)
                 return True
             except (subprocess.SubprocessError, subprocess.TimeoutExpired):
                 pass
@@ -82,8 +105,7 @@ class WaylandKeyboardAdapter(KeyboardAdapter):
         if 'wtype' in self._available_methods:
             try:
                 # wtype: -M ctrl -P Return
-                subprocess.run(['wtype', '-M', 'ctrl', '-P', 'Return'],
-                             check=False, timeout=1)
+                await run_tool(['wtype', '-M', 'ctrl', '-P', 'Return'], timeout=1)
                 return True
             except (subprocess.SubprocessError, subprocess.TimeoutExpired):
                 pass
@@ -92,8 +114,7 @@ class WaylandKeyboardAdapter(KeyboardAdapter):
         if 'ydotool' in self._available_methods:
             try:
                 # ydotool key codes: 29=Ctrl, 28=Return
-                subprocess.run(['ydotool', 'key', '29:1', '28:1', '28:0', '29:0'],
-                             check=False, timeout=1)
+                await run_tool(['ydotool', 'key', '29:1', '28:1', '28:0', '29:0'], timeout=1)
                 return True
             except (subprocess.SubprocessError, subprocess.TimeoutExpired):
                 pass
@@ -108,13 +129,19 @@ class WaylandKeyboardAdapter(KeyboardAdapter):
         """Get list of available keyboard simulation methods."""
         return self._available_methods.copy()
 
+    def get_stats(self) -> dict:
+        """Get native key injection and persistent xdo helper statistics."""
+        stats = {'key_injector': self._keys.stats()} if self._keys.backend else {}
+        if self._xdo:
+            stats['xdo_session'] = self._xdo.stats()
+        return stats
+
     async def send_text(self, text: str) -> bool:
         """Send text directly using wtype if available."""
         if 'wtype' in self._available_methods:
             try:
                 # wtype can type text directly
-                subprocess.run(['wtype', text],
-                             check=False, timeout=5)
+                await run_tool(['wtype', text], timeout=5)
                 return True
             except (subprocess.SubprocessError, subprocess.TimeoutExpired):
                 pass
@@ -126,14 +153,22 @@ class WaylandKeyboardAdapter(KeyboardAdapter):
         Returns:
             bool: True if keep-alive was performed successfully, False otherwise.
         """
+        if self._keys.backend and await self._keys.press(chord(KEY_SCROLLLOCK)):
+            await asyncio.sleep(0.1)
+            return await self._keys.press(chord(KEY_SCROLLLOCK))
+
         # Try xdotool on KDE Wayland (via Xwayland)
         if 'xdotool (KDE Wayland)' in self._available_methods:
+            sent = await self._xdo.send_keys('Scroll_Lock')
+            if sent is not None:
+                if not sent:
+                    return False
+                await asyncio.sleep(0.1)
+                return bool(await self._xdo.send_keys('Scroll_Lock'))
             try:
-                subprocess.run(['xdotool', 'key', 'Scroll_Lock'],
-                             check=False, timeout=1)
+                await run_tool(['xdotool', 'key', 'Scroll_Lock'], timeout=1)
                 await asyncio.sleep(0.1)
-                subprocess.run(['xdotool', 'key', 'Scroll_Lock'],
-                             check=False, timeout=1)
+                await run_tool(['xdotool', 'key', 'Scroll_Lock'], timeout=1)
                 return True
             except (subprocess.SubprocessError, subprocess.TimeoutExpired):
                 pass
@@ -142,11 +177,9 @@ class WaylandKeyboardAdapter(KeyboardAdapter):
         if 'wtype' in self._available_methods:
             try:
                 # wtype -P Scroll_Lock (press and release)
-                subprocess.run(['wtype', '-P', 'Scroll_Lock'],
-                             check=False, timeout=1)
+                await run_tool(['wtype', '-P', 'Scroll_Lock'], timeout=1)
                 await asyncio.sleep(0.1)
-                subprocess.run(['wtype', '-P', 'Scroll_Lock'],
-                             check=False, timeout=1)
+                await run_tool(['wtype', '-P', 'Scroll_Lock'], timeout=1)
                 return True
             except (subprocess.SubprocessError, subprocess.TimeoutExpired):
                 pass
@@ -155,11 +188,9 @@ class WaylandKeyboardAdapter(KeyboardAdapter):
         if 'ydotool' in self._available_methods:
             try:
                 # ydotool key code for Scroll Lock is 70
-                subprocess.run(['ydotool', 'key', '70:1', '70:0'],
-                             check=False, timeout=1)
+                await run_tool(['ydotool', 'key', '70:1', '70:0'], timeout=1)
                 await asyncio.sleep(0.1)
-                subprocess.run(['ydotool', 'key', '70:1', '70:0'],
-                             check=False, timeout=1)
+                await run_tool(['ydotool', 'key', '70:1', '70:0'], timeout=1)
                 return True
             except (subprocess.SubprocessError, subprocess.TimeoutExpired):
                 pass
@@ -0,0 +1,156 @@
+"""
+In-process Wayland clipboard owner using the data-control protocols.
+"""
+
+import os
+import logging
+import threading
+from typing import Optional
+
+from platform_adapters.linux.selection_owner import SelectionOwner
+
+try:
+    from pywayland.client import Display
+    from pywayland.protocol.wayland import WlSeat
+    PYWAYLAND_AVAILABLE = True
+except (ImportError, Exception):
+    # pywayland (and libwayland-client) are optional
+    PYWAYLAND_AVAILABLE = False
+
+# Data-control managers in order of preference. Both protocols have the same
+# requests and events. ext-data-control-v1 ships with pywayland; bindings for
+# wlroots' zwlr-data-control-v1 exist only if generated from wlr-protocols
+# with pywayland-scanner.
+DATA_CONTROL_MANAGERS = []
+if PYWAYLAND_AVAILABLE:
+    try:
+        from pywayland.protocol.ext_data_control_v1 import ExtDataControlManagerV1
+        DATA_CONTROL_MANAGERS.append(ExtDataControlManagerV1)
+    except ImportError:
+        pass
+    try:
+        from pywayland.protocol.wlr_data_control_unstable_v1 import ZwlrDataControlManagerV1
+        DATA_CONTROL_MANAGERS.append(ZwlrDataControlManagerV1)
+    except ImportError:
+        pass
+
+# Global interface names, also checked when the bindings are missing
+EXT_DATA_CONTROL = 'ext_data_control_manager_v1'
+WLR_DATA_CONTROL = 'zwlr_data_control_manager_v1'
+
+TEXT_MIME_TYPES = ('text/plain;charset=utf-8', 'text/plain', 'UTF8_STRING', 'STRING', 'TEXT')
+
+
+class WaylandSelectionOwner(SelectionOwner):
+    """Owns the Wayland clipboard through one long-lived data-control client.
+
+    Instead of a wl-copy process per message (connect to the compositor,
+    fork, serve, exit), the thread keeps its compositor connection and
+    data-control device, and each copy just offers a new data source. The
+    claim is confirmed with a roundtrip, after which the compositor has
+    made our source the selection. Paste requests are written from memory.
+
+    Needs a compositor with ext-data-control-v1 (wlroots 0.19+, KDE 6.2+)
+    or, when its pywayland bindings are installed, zwlr-data-control-v1
+    (older wlroots/sway). Otherwise the owner logs which protocol is missing
+    and wl-copy is used.
+    """
+
+    available = PYWAYLAND_AVAILABLE
+    label = 'Wayland'
+
+    def __init__(self, timeout: Optional[float] = None):
+        """Initialize the selection owner; call start() to connect.
+
+        Args:
+            timeout: Seconds to wait for ownership (if None, will try to get from environment).
+        """
+        super().__init__(timeout or float(os.getenv('AIPUT_WAYLAND_SELECTION_TIMEOUT', '1')))
+        self._display = None
+        self._manager = None
+        self._device = None
+        self._source = None
+
+    def _connect(self):
+        display = Display()
+        display.connect()
+        globals_ = {}
+
+        def on_global(registry, name, interface, version):
+            globals_.setdefault(interface, (name, version))
+
+        registry = display.get_registry()
+        registry.dispatcher['global'] = on_global
+        display.roundtrip()
+
+        manager_cls = next((cls for cls in DATA_CONTROL_MANAGERS if cls.name in globals_), None)
+        if manager_cls is None or WlSeat.name not in globals_:
+            display.disconnect()
+            raise RuntimeError(self._missing_protocol(globals_))
+
+        name, version = globals_[manager_cls.name]
+        self._manager = registry.bind(name, manager_cls, min(version, manager_cls.version))
+        name, version = globals_[WlSeat.name]
+        seat = registry.bind(name, WlSeat, min(version, WlSeat.version))
+        self._device = self._manager.get_data_device(seat)
+        display.roundtrip()
+        self._display = display
+
+    @staticmethod
+    def _missing_protocol(globals_: dict) -> str:
+        """Explain why no data-control manager could be bound."""
+        if WlSeat.name not in globals_:
+            return 'compositor has no wl_seat'
+        if EXT_DATA_CONTROL in globals_:
+            return 'pywayland has no ext-data-control-v1 bindings (needs pywayland 0.4.18+)'
+        if WLR_DATA_CONTROL in globals_:
+            return ('compositor only offers zwlr-data-control-v1 and pywayland has no bindings '
+                    'for it (generate wlr_data_control_unstable_v1 with pywayland-scanner)')
+        return 'compositor supports neither ext-data-control-v1 nor zwlr-data-control-v1'
+
+    def _fileno(self) -> int:
+        return self._display.get_fd()
+
+    def _claim(self, data: bytes) -> bool:
+        source = self._manager.create_data_source()
+        for mime_type in TEXT_MIME_TYPES:
+            source.offer(mime_type)
+        source.dispatcher['send'] = lambda src, mime_type, fd: self._send(data, fd)
+        source.dispatcher['cancelled'] = self._on_cancelled
+        self._device.set_selection(source)
+        self._source = source
+        # Once the compositor answered, our source is the selection
+        self._display.roundtrip()
+        return self._source is source
+
+    def _dispatch(self, readable: bool):
+        display = self._display
+        # dispatch(block=True) is wl_display_dispatch(): prepare to read, read
+        # the socket and dispatch. It only waits when nothing is readable,
+        # so it is used just after select() reported input.
+        display.dispatch(block=readable)
+        display.flush()
+
+    def _disconnect(self):
+        self._display.disconnect()
+
+    def _on_cancelled(self, source):
+        """Our source was replaced (by us or another application)."""
+        if source is self._source:
+            self._source = None
+            self.owned = False
+        source.destroy()
+
+    def _send(self, data: bytes, fd: int):
+        """Write the text to a paste request's pipe without stalling the thread."""
+        self._mark_served()
+        threading.Thread(target=self._write_fd, args=(data, fd), daemon=True).start()
+
+    @staticmethod
+    def _write_fd(data: bytes, fd: int):
+        try:
+            with os.fdopen(fd, 'wb') as pipe:
+                pipe.write(data)
+        except OSError as e:
+            # The requesting application closed the pipe early
+            logging.debug(f"Wayland clipboard owner write failed: {e}")
@@ -8,6 +8,8 @@ import subprocess
 from typing import List
 from platform_detection.detector import PlatformInfo
 from platform_adapters.base import KeyboardAdapter
+from platform_adapters.process import run_tool
+from platform_adapters.linux.xdo_session import XdoSession, typing_time
 
 
 class X11KeyboardAdapter(KeyboardAdapter):
@@ -17,6 +19,8 @@ class X11KeyboardAdapter(KeyboardAdapter):
         self.platform_info = platform_info
         self._available_methods = []
         self._detect_methods()
+        # One persistent helper instead of an xdotool process per keystroke
+        self._xdo = XdoSession() if 'xdotool' in self._available_methods else None
 
     def _detect_methods(self):
         """Detect available X11 keyboard simulation methods."""
@@ -35,9 +39,11 @@ class X11KeyboardAdapter(KeyboardAdapter):
         """Send paste command using X11-compatible methods."""
         # Try xdotool first (most reliable)
         if 'xdotool' in self._available_methods:
+            sent = await self._xdo.send_keys('Shift+Insert')
+            if sent is not None:
+                return sent
             try:
-                subprocess.run(['xdotool', 'key', 'Shift+Insert'],
-                             check=False, timeout=1)
+                await run_tool(['xdotool', 'key', 'Shift+Insert'], timeout=1)
                 return True
             except (subprocess.SubprocessError, subprocess.TimeoutExpired):
                 pass
@@ -45,8 +51,7 @@ class X11KeyboardAdapter(KeyboardAdapter):
         # Try xte (xautomation package)
         if 'xte' in self._available_methods:
             try:
-                subprocess.run(['xte', 'key Shift_L Insert'],
-                             check=False, timeout=1)
+                await run_tool(['xte', 'key Shift_L Insert'], timeout=1)
                 return True
             except (subprocess.SubprocessError, subprocess.TimeoutExpired):
                 pass
@@ -54,8 +59,7 @@ class X11KeyboardAdapter(KeyboardAdapter):
         # Try xvkbd
         if 'xvkbd' in self._available_methods:
             try:
-                subprocess.run(['xvkbd', '-text', r'\[Shift]\[Insert]'],
-                             check=False, timeout=1)
+                await run_tool(['xvkbd', '-text', r'\[Shift]\[Insert]'], timeout=1)
                 return True
             except (subprocess.SubprocessError, subprocess.TimeoutExpired):
                 pass
@@ -66,9 +70,11 @@ class X11KeyboardAdapter(KeyboardAdapter):
         """Send Ctrl+Enter key combination using X11-compatible methods."""
         # Try xdotool first (most reliable)
         if 'xdotool' in self._available_methods:
+            sent = await self._xdo.send_keys('Ctrl+Return')
+            if sent is not None:
+                return sent
             try:
-                subprocess.run(['xdotool', 'key', 'Ctrl+Return'],
-                             check=False, timeout=1)
+                await run_tool(['xdotool', 'key', 'Ctrl+Return'], timeout=1)
                 return True
             except (subprocess.SubprocessError, subprocess.TimeoutExpired):
                 pass
@@ -76,8 +82,7 @@ class X11KeyboardAdapter(KeyboardAdapter):
         # Try xte (xautomation package)
         if 'xte' in self._available_methods:
             try:
-                subprocess.run(['xte', 'key Control_L Return'],
-                             check=False, timeout=1)
+                await run_tool(['xte', 'key Control_L Return'], timeout=1)
                 return True
             except (subprocess.SubprocessError, subprocess.TimeoutExpired):
                 pass
@@ -85,8 +90,7 @@ class X11KeyboardAdapter(KeyboardAdapter):
         # Try xvkbd
         if 'xvkbd' in self._available_methods:
             try:
-                subprocess.run(['xvkbd', '-text', r'\[Control]\[Return]'],
-                             check=False, timeout=1)
+                await run_tool(['xvkbd', '-text', r'\[Control]\[Return]'], timeout=1)
                 return True
             except (subprocess.SubprocessError, subprocess.TimeoutExpired):
                 pass
@@ -101,14 +105,22 @@ class X11KeyboardAdapter(KeyboardAdapter):
         """Get list of available keyboard simulation methods."""
         return self._available_methods.copy()
 
+    def get_stats(self) -> dict:
+        """Get persistent xdo helper statistics (empty if not used)."""
+        return {'xdo_session': self._xdo.stats()} if self._xdo else {}
+
     async def send_text(self, text: str) -> bool:
         """Send text directly using X11 tools."""
         # Try xdotool for typing
         if 'xdotool' in self._available_methods:
+            # A helper that took the text may have typed part of it: never retype
+            typed = await self._xdo.type_text(text, delay_ms=50)
+            if typed is not None:
+                return typed
             try:
                 # xdotool type --delay 50 "text"
-                subprocess.run(['xdotool', 'type', '--delay', '50', text],
-                             check=False, timeout=5)
+                await run_tool(['xdotool', 'type', '--delay', '50', text],
+                               timeout=5 + typing_time(text, 50))
                 return True
             except (subprocess.SubprocessError, subprocess.TimeoutExpired):
                 pass
@@ -117,8 +129,7 @@ class X11KeyboardAdapter(KeyboardAdapter):
         if 'xte' in self._available_methods:
             try:
                 # xte types with built-in delay
-                subprocess.run(['xte', f'type {text}'],
-                             check=False, timeout=5)
+                await run_tool(['xte', f'type {text}'], timeout=5)
                 return True
             except (subprocess.SubprocessError, subprocess.TimeoutExpired):
                 pass
@@ -133,12 +144,16 @@ class X11KeyboardAdapter(KeyboardAdapter):
         """
         # Try xdotool
         if 'xdotool' in self._available_methods:
+            sent = await self._xdo.send_keys('Scroll_Lock')
+            if sent is not None:
+                if not sent:
+                    return False
+                await asyncio.sleep(0.1)
+                return bool(await self._xdo.send_keys('Scroll_Lock'))
             try:
-                subprocess.run(['xdotool', 'key', 'Scroll_Lock'],
-                             check=False, timeout=1)
+                await run_tool(['xdotool', 'key', 'Scroll_Lock'], timeout=1)
                 await asyncio.sleep(0.1)
-                subprocess.run(['xdotool', 'key', 'Scroll_Lock'],
-                             check=False, timeout=1)
+                await run_tool(['xdotool', 'key', 'Scroll_Lock'], timeout=1)
                 return True
             except (subprocess.SubprocessError, subprocess.TimeoutExpired):
                 pass
@@ -146,11 +161,9 @@ class X11KeyboardAdapter(KeyboardAdapter):
         # Try xte
         if 'xte' in self._available_methods:
             try:
-                subprocess.run(['xte', 'key Scroll_Lock'],
-                             check=False, timeout=1)
+                await run_tool(['xte', 'key Scroll_Lock'], timeout=1)
                 await asyncio.sleep(0.1)
-                subprocess.run(['xte', 'key Scroll_Lock'],
-                             check=False, timeout=1)
+                await run_tool(['xte', 'key Scroll_Lock'], timeout=1)
                 return True
             except (subprocess.SubprocessError, subprocess.TimeoutExpired):
                 pass
@@ -158,11 +171,9 @@ class X11KeyboardAdapter(KeyboardAdapter):
         # Try xvkbd
         if 'xvkbd' in self._available_methods:
             try:
-                subprocess.run(['xvkbd', '-text', '\\[Scroll_Lock]'],
-                             check=False, timeout=1)
+                await run_tool(['xvkbd', '-text', '\\[Scroll_Lock]'], timeout=1)
                 await asyncio.sleep(0.1)
-                subprocess.run(['xvkbd', '-text', '\\[Scroll_Lock]'],
-                             check=False, timeout=1)
+                await run_tool(['xvkbd', '-text', '\\[Scroll_Lock]'], timeout=1)
                 return True
             except (subprocess.SubprocessError, subprocess.TimeoutExpired):
                 pass
@@ -0,0 +1,127 @@
+"""
+In-process X11 CLIPBOARD selection owner.
+"""
+
+import os
+import logging
+from typing import Optional
+
+from platform_adapters.linux.selection_owner import SelectionOwner, MAX_INLINE_BYTES
+
+try:
+    from Xlib import X, Xatom, display as xdisplay
+    from Xlib.protocol import event as xevent
+    XLIB_AVAILABLE = True
+except (ImportError, Exception):
+    # python-xlib is installed alongside pyautogui on Linux, but is optional
+    XLIB_AVAILABLE = False
+
+# Size of a ChangeProperty request before its data
+CHANGE_PROPERTY_HEADER = 24
+
+
+class X11SelectionOwner(SelectionOwner):
+    """Owns the CLIPBOARD selection from a background thread.
+
+    The thread keeps one X connection and a hidden window, and answers
+    SelectionRequest events (TARGETS, UTF8_STRING, STRING, TEXT) from memory.
+    Text is sent in a single property change (no INCR transfers), so larger
+    payloads than the server's maximum request size are left to the tools.
+    """
+
+    available = XLIB_AVAILABLE
+    label = 'X11'
+
+    def __init__(self, timeout: Optional[float] = None):
+        """Initialize the selection owner; call start() to connect.
+
+        Args:
+            timeout: Seconds to wait for ownership (if None, will try to get from environment).
+        """
+        super().__init__(timeout or float(os.getenv('AIPUT_X11_SELECTION_TIMEOUT', '1')))
+        self._disp = None
+        self._window = None
+
+    def _connect(self):
+        disp = xdisplay.Display()
+        disp.set_error_handler(self._on_error)
+        screen = disp.screen()
+        # PropertyNotify events on our window carry server timestamps
+        self._window = screen.root.create_window(0, 0, 1, 1, 0, screen.root_depth,
+                                                 event_mask=X.PropertyChangeMask)
+        atoms = {name: disp.intern_atom(name) for name in
+                 ('CLIPBOARD', 'TARGETS', 'UTF8_STRING', 'TEXT', 'text/plain;charset=utf-8',
+                  'AIPUT_TIMESTAMP')}
+        self._disp = disp
+        # Without BIG-REQUESTS one request carries at most max_request_length
+        # 4-byte units, including the ChangeProperty header
+        self.max_bytes = min(MAX_INLINE_BYTES, disp.info.max_request_length * 4 - CHANGE_PROPERTY_HEADER)
+        self._timestamp_atom = atoms['AIPUT_TIMESTAMP']
+        self._clipboard = atoms['CLIPBOARD']
+        self._targets_atom = atoms['TARGETS']
+        self._text_targets = {atoms['UTF8_STRING'], atoms['TEXT'], atoms['text/plain;charset=utf-8'], Xatom.STRING}
+        self._targets = [atoms['TARGETS']] + sorted(self._text_targets)
+
+    def _fileno(self) -> int:
+        return self._disp.fileno()
+
+    def _claim(self, data: bytes) -> bool:
+        # Requests are answered from self._data, which copy_text() already updated.
+        # ICCCM forbids CurrentTime here, so use a real server timestamp.
+        self._window.set_selection_owner(self._clipboard, self._server_time())
+        owner = self._disp.get_selection_owner(self._clipboard)
+        return getattr(owner, 'id', owner) == self._window.id
+
+    def _server_time(self) -> int:
+        """Get a current server timestamp from a zero-length property append."""
+        self._window.change_property(self._timestamp_atom, Xatom.STRING, 8, b'', mode=X.PropModeAppend)
+        self._disp.flush()
+        while True:
+            ev = self._disp.next_event()
+            if (ev.type == X.PropertyNotify and ev.atom == self._timestamp_atom
+                    and getattr(ev.window, 'id', ev.window) == self._window.id):
+                return ev.time
+            self._handle(ev)
+
+    def _dispatch(self, readable: bool):
+        disp = self._disp
+        while disp.pending_events():
+            self._handle(disp.next_event())
+
+    def _handle(self, ev):
+        """Handle one event from the X connection."""
+        if ev.type == X.SelectionClear and ev.atom == self._clipboard:
+            # Another application took over the clipboard
+            self.owned = False
+        elif ev.type == X.SelectionRequest:
+            self._answer(ev)
+
+    def _disconnect(self):
+        self._disp.close()
+
+    def _answer(self, ev):
+        """Reply to one SelectionRequest from the stored text."""
+        prop = ev.property if ev.property != X.NONE else ev.target
+        if ev.target == self._targets_atom:
+            ev.requestor.change_property(prop, Xatom.ATOM, 32, self._targets)
+        elif ev.target in self._text_targets:
+            with self._lock:
+                data = self._data
+            ev.requestor.change_property(prop, ev.target, 8, data)
+        else:
+            prop = X.NONE
+
+        notify = xevent.SelectionNotify(
+            time=ev.time, requestor=ev.requestor, selection=ev.selection,
+            target=ev.target, property=prop
+        )
+        ev.requestor.send_event(notify)
+        self._disp.flush()
+
+        if ev.target in self._text_targets:
+            self._mark_served()
+
+    @staticmethod
+    def _on_error(error, request):
+        # Typically a requestor window that went away before we answered
+        logging.debug(f"X11 clipboard owner error: {error}")
@@ -0,0 +1,81 @@
+"""
+Long-lived keystroke helper holding one X display connection via libxdo.
+
+Started by XdoSession as ``python xdo_helper.py``; stdlib only so it can run
+outside the package. Protocol, one JSON object per line:
+
+    stdin:  {"cmd": "key", "keys": "Shift+Insert"}
+            {"cmd": "type", "text": "...", "delay_ms": 50}
+    stdout: "ready" once after start-up (or "error <reason>" and exit),
+            then "ok" or "error <reason>" for every command
+"""
+
+import sys
+import json
+import ctypes
+import ctypes.util
+
+# Window value libxdo uses for "the currently focused window"
+CURRENTWINDOW = 0
+
+# Same default inter-key delay as the xdotool command line (12 ms)
+DEFAULT_KEY_DELAY_US = 12000
+
+
+def _load_libxdo():
+    """Load libxdo and declare the functions we use."""
+    path = ctypes.util.find_library('xdo') or 'libxdo.so.3'
+    lib = ctypes.CDLL(path)
+    lib.xdo_new.argtypes = [ctypes.c_char_p]
+    lib.xdo_new.restype = ctypes.c_void_p
+    lib.xdo_send_keysequence_window.argtypes = [
+        ctypes.c_void_p, ctypes.c_ulong, ctypes.c_char_p, ctypes.c_uint
+    ]
+    lib.xdo_send_keysequence_window.restype = ctypes.c_int
+    lib.xdo_enter_text_window.argtypes = [
+        ctypes.c_void_p, ctypes.c_ulong, ctypes.c_char_p, ctypes.c_uint
+    ]
+    lib.xdo_enter_text_window.restype = ctypes.c_int
+    return lib
+
+
+def _reply(line):
+    sys.stdout.write(line + '\n')
+    sys.stdout.flush()
+
+
+def main():
+    try:
+        lib = _load_libxdo()
+    except OSError as e:
+        _reply(f'error libxdo unavailable: {e}')
+        return 1
+
+    xdo = lib.xdo_new(None)
+    if not xdo:
+        _reply('error cannot open display')
+        return 1
+    _reply('ready')
+
+    for line in sys.stdin:
+        try:
+            request = json.loads(line)
+            cmd = request.get('cmd')
+            if cmd == 'key':
+                rc = lib.xdo_send_keysequence_window(
+                    xdo, CURRENTWINDOW, request['keys'].encode(), DEFAULT_KEY_DELAY_US)
+            elif cmd == 'type':
+                delay_us = int(request.get('delay_ms', 12)) * 1000
+                rc = lib.xdo_enter_text_window(
+                    xdo, CURRENTWINDOW, request['text'].encode(), delay_us)
+            else:
+                _reply(f'error unknown command {cmd!r}')
+                continue
+            _reply('ok' if rc == 0 else f'error xdo returned {rc}')
+        except Exception as e:
+            _reply(f'error {e}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
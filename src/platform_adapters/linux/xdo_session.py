@@ -0,0 +1,190 @@
+"""
+Persistent xdo helper session shared by X11 keystroke calls.
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+import subprocess
+from typing import Dict, Optional
+
+import metrics
+from platform_adapters.process import run_blocking
+
+HELPER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'xdo_helper.py')
+
+
+def typing_time(text: str, delay_ms: int) -> float:
+    """Seconds xdo needs to type ``text`` with ``delay_ms`` between keys."""
+    return len(text) * delay_ms / 1000
+
+
+class XdoSession:
+    """Long-lived xdo helper process holding one X display connection.
+
+    Fork, exec and the X connection happen once; each keystroke is then one
+    line over a pipe. A helper that crashes or stops answering is killed and
+    restarted on the next command. If the helper cannot start at all (no
+    libxdo, no display, frozen build) the session disables itself and
+    callers fall back to running the xdotool command line.
+
+    Commands return None only when nothing reached the helper. Once a command
+    was written it may already have been typed, so a failure after that is
+    reported as False and must not be retried through the command line.
+    """
+
+    def __init__(self, timeout: Optional[float] = None, helper_cmd: Optional[list] = None):
+        """Initialize the session; the helper is started on first use.
+
+        Args:
+            timeout: Seconds to wait for a reply (if None, will try to get from environment).
+            helper_cmd: Helper command line (default: this interpreter running xdo_helper.py).
+        """
+        self.enabled = (os.getenv('AIPUT_XDO_SESSION', 'true').lower() == 'true'
+                        and not getattr(sys, 'frozen', False))
+        self.timeout = timeout or float(os.getenv('AIPUT_XDO_TIMEOUT', '2'))
+        self._cmd = helper_cmd or [sys.executable, HELPER_PATH]
+        self._proc = None
+        self._started = False
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.commands = 0
+        self.failures = 0
+        self.restarts = 0
+        self._latency_total = 0.0
+        self.last_latency = 0.0
+        self.max_latency = 0.0
+
+    async def send_keys(self, keys: str) -> Optional[bool]:
+        """Send a key sequence (xdotool ``key`` syntax, e.g. ``Shift+Insert``).
+
+        Returns:
+            Optional[bool]: True if the helper executed it, False if it failed,
+            None if the helper is unavailable and the caller should fall back.
+        """
+        return await self._send({'cmd': 'key', 'keys': keys}, self.timeout)
+
+    async def type_text(self, text: str, delay_ms: int = 12) -> Optional[bool]:
+        """Type text (like ``xdotool type --delay``).
+
+        The helper only replies once the last key is typed, so the reply
+        timeout grows with the text: ``len(text) * delay_ms`` plus the usual
+        command timeout as margin.
+
+        Returns:
+            Optional[bool]: True if the helper executed it, False if it failed,
+            None if the helper is unavailable and the caller should fall back.
+        """
+        timeout = self.timeout + typing_time(text, delay_ms)
+        return await self._send({'cmd': 'type', 'text': text, 'delay_ms': delay_ms}, timeout)
+
+    async def _send(self, request: dict, timeout: float) -> Optional[bool]:
+        if not self.enabled:
+            return None
+        # The pipe round trip is short but blocking; keep it off the event loop
+        return await run_blocking(self._call, request, timeout)
+
+    def _call(self, request: dict, timeout: float) -> Optional[bool]:
+        """Send one command and wait for its reply (worker thread)."""
+        with self._lock:
+            proc = self._ensure_started()
+            if proc is None:
+                return None
+
+            start = time.perf_counter()
+            try:
+                proc.stdin.write(json.dumps(request) + '\n')
+                proc.stdin.flush()
+                reply = self._readline(proc, timeout)
+            except (OSError, ValueError):
+                reply = None
+            elapsed = time.perf_counter() - start
+
+            if reply is None:
+                # Helper crashed or hung; restart on the next command
+                print("[XdoSession] Helper stopped responding, restarting on next command")
+                self._stop()
+                self.failures += 1
+                metrics.inc('aiput_fallbacks_total', component='keyboard', method='xdo-session')
+                return False
+
+            self.commands += 1
+            metrics.observe('aiput_tool_seconds', elapsed, tool='xdo-session')
+            self._latency_total += elapsed
+            self.last_latency = elapsed
+            self.max_latency = max(self.max_latency, elapsed)
+            if reply != 'ok':
+                self.failures += 1
+                metrics.inc('aiput_fallbacks_total', component='keyboard', method='xdo-session')
+                return False
+            return True
+
+    def _ensure_started(self):
+        """Return a running helper, starting (or restarting) it if needed."""
+        if self._proc is not None and self._proc.poll() is None:
+            return self._proc
+        self._proc = None
+        if self._started:
+            self.restarts += 1
+
+        start = time.perf_counter()
+        try:
+            proc = subprocess.Popen(self._cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                    stderr=subprocess.DEVNULL, text=True, bufsize=1)
+        except OSError as e:
+            self._disable(str(e))
+            return None
+
+        ready = self._readline(proc, max(self.timeout, 5))
+        if ready != 'ready':
+            if proc.poll() is None:
+                proc.kill()
+            self._disable(ready or 'no response')
+            return None
+
+        print(f"[XdoSession] Helper started in {(time.perf_counter() - start) * 1000:.0f}ms")
+        self._proc = proc
+        self._started = True
+        return proc
+
+    @staticmethod
+    def _readline(proc, timeout: float) -> Optional[str]:
+        """Read one reply line, killing the helper if it takes too long."""
+        timer = threading.Timer(timeout, proc.kill)
+        timer.start()
+        try:
+            line = proc.stdout.readline()
+        finally:
+            timer.cancel()
+        return line.strip() if line else None
+
+    def _disable(self, reason: str):
+        print(f"[XdoSession] Persistent helper unavailable ({reason}), using xdotool per command")
+        self.enabled = False
+
+    def _stop(self):
+        if self._proc is not None:
+            if self._proc.poll() is None:
+                self._proc.kill()
+            self._proc = None
+
+    def close(self):
+        """Stop the helper process."""
+        with self._lock:
+            self._stop()
+
+    def stats(self) -> Dict[str, object]:
+        """Return helper state and round-trip latency statistics."""
+        return {
+            'enabled': self.enabled,
+            'running': self._proc is not None and self._proc.poll() is None,
+            'commands': self.commands,
+            'failures': self.failures,
+            'restarts': self.restarts,
+            'avg_ms': round(self._latency_total / self.commands * 1000, 2) if self.commands else 0.0,
+            'last_ms': round(self.last_latency * 1000, 2),
+            'max_ms': round(self.max_latency * 1000, 2),
+        }
@@ -9,16 +9,6 @@ import subprocess
 from typing import List, Optional, Dict, Any
 from pathlib import Path
 
-try:
-    import pyautogui
-    pyautogui.PAUSE = 0.1
-    pyautogui.FAILSAFE = False
-    PYAUTOGUI_AVAILABLE = True
-except (ImportError, Exception):
-    # 捕获 ImportError 和其他异常（例如 X11 连接错误）
-    PYAUTOGUI_AVAILABLE = False
-    pyautogui = None
-
 try:
     import pyperclip
     PIPERCLIP_AVAILABLE = True
@@ -26,21 +16,15 @@ except (ImportError, Exception):
     PIPERCLIP_AVAILABLE = False
     pyperclip = None
 
-try:
-    import pystray
-    from PIL import Image
-    PYSTRAY_AVAILABLE = True
-except (ImportError, Exception):
-    # pystray 在导入时会尝试连接 X11，在 Linux 上可能失败
-    PYSTRAY_AVAILABLE = False
-    pystray = None
-    Image = None
-
 from platform_adapters.base import (
     KeyboardAdapter, ClipboardAdapter, SystemTrayAdapter,
-    ResourceAdapter, NotificationAdapter, MenuItem
+    ResourceAdapter, NotificationAdapter, MenuItem, NullSystemTrayAdapter
 )
 from platform_detection.detector import PlatformInfo
+from platform_adapters.optional import load_pyautogui, load_pystray, load_pil_image
+from platform_detection.tools import has_tool, has_module, resolve_command
+from platform_detection.cache import get_app_data_dir
+from platform_adapters.process import run_tool, run_blocking
 
 
 class MacOSKeyboardAdapter(KeyboardAdapter):
@@ -53,7 +37,8 @@ class MacOSKeyboardAdapter(KeyboardAdapter):
 
     def _detect_methods(self):
         """Detect available keyboard input methods."""
-        if PYAUTOGUI_AVAILABLE:
+        # pyautogui itself is imported on first use (it loads tkinter)
+        if has_module('pyautogui'):
             self._methods.append('pyautogui')
 
         # Check for AppKit
@@ -76,9 +61,10 @@ class MacOSKeyboardAdapter(KeyboardAdapter):
     async def send_paste_command(self) -> bool:
         """Send paste command (Cmd+V on macOS)."""
         # Try pyautogui first
-        if 'pyautogui' in self._methods:
+        pyautogui = load_pyautogui() if 'pyautogui' in self._methods else None
+        if pyautogui:
             try:
-                pyautogui.hotkey('command', 'v')
+                await run_blocking(pyautogui.hotkey, 'command', 'v')
                 return True
             except Exception:
                 pass
@@ -91,7 +77,7 @@ class MacOSKeyboardAdapter(KeyboardAdapter):
                     keystroke "v" using command down
                 end tell
                 '''
-                subprocess.run(['osascript', '-e', script], check=False)
+                await run_tool(['osascript', '-e', script])
                 return True
             except Exception:
                 pass
@@ -101,9 +87,10 @@ class MacOSKeyboardAdapter(KeyboardAdapter):
     async def send_ctrl_enter(self) -> bool:
         """Send Ctrl+Enter key combination on macOS."""
         # Try pyautogui first
-        if 'pyautogui' in self._methods:
+        pyautogui = load_pyautogui() if 'pyautogui' in self._methods else None
+        if pyautogui:
             try:
-                pyautogui.hotkey('ctrl', 'enter')
+                await run_blocking(pyautogui.hotkey, 'ctrl', 'enter')
                 return True
             except Exception:
                 pass
@@ -116,7 +103,7 @@ class MacOSKeyboardAdapter(KeyboardAdapter):
                     keystroke return using control down
                 end tell
                 '''
-                subprocess.run(['osascript', '-e', script], check=False)
+                await run_tool(['osascript', '-e', script])
                 return True
             except Exception:
                 pass
@@ -133,9 +120,10 @@ class MacOSKeyboardAdapter(KeyboardAdapter):
 
     async def send_text(self, text: str) -> bool:
         """Send text directly."""
-        if 'pyautogui' in self._methods:
+        pyautogui = load_pyautogui() if 'pyautogui' in self._methods else None
+        if pyautogui:
             try:
-                pyautogui.typewrite(text)
+                await run_blocking(pyautogui.typewrite, text)
                 return True
             except Exception:
                 pass
@@ -172,17 +160,14 @@ class MacOSClipboardAdapter(ClipboardAdapter):
         # Try pyperclip first
         if PIPERCLIP_AVAILABLE:
             try:
-                pyperclip.copy(text)
-                await asyncio.sleep(0.1)
+                await run_blocking(pyperclip.copy, text)
                 return True
             except Exception:
                 pass
 
         # Try pbcopy command
         try:
-            proc = subprocess.Popen(['pbcopy'], stdin=subprocess.PIPE)
-            proc.communicate(text.encode())
-            return proc.returncode == 0
+            return await run_tool(['pbcopy'], input=text.encode()) == 0
         except Exception:
             pass
 
@@ -192,6 +177,10 @@ class MacOSClipboardAdapter(ClipboardAdapter):
         """Check if clipboard is available."""
         return True  # macOS always has clipboard
 
+    def copy_confirmed(self) -> bool:
+        """Clipboard writes are synchronous here; no settle delay is needed."""
+        return True
+
     def get_preferred_tool(self) -> Optional[str]:
         """Get preferred tool."""
         if PIPERCLIP_AVAILABLE:
@@ -210,6 +199,7 @@ class MacOSSystemTrayAdapter(SystemTrayAdapter):
         """Create system tray icon."""
         if not self.is_supported():
             return False
+        pystray = load_pystray()
 
         try:
             # Create menu items
@@ -243,7 +233,7 @@ class MacOSSystemTrayAdapter(SystemTrayAdapter):
 
     def is_supported(self) -> bool:
         """Check if system tray is supported."""
-        return PYSTRAY_AVAILABLE
+        return load_pystray() is not None
 
     def hide_window(self) -> None:
         """Hide the main window."""
@@ -261,6 +251,7 @@ class MacOSSystemTrayAdapter(SystemTrayAdapter):
 
     def _create_icon_image(self):
         """Create macOS-style icon."""
+        Image = load_pil_image()
         if Image:
             # Create a macOS-style icon
             image = Image.new('RGBA', (64, 64), (0, 0, 0, 0))
@@ -316,6 +307,7 @@ class MacOSResourceAdapter(ResourceAdapter):
 
     def load_image(self, path: str) -> Any:
         """Load an image file."""
+        Image = load_pil_image()
         if Image:
             try:
                 return Image.open(path)
@@ -325,9 +317,8 @@ class MacOSResourceAdapter(ResourceAdapter):
 
     def get_app_data_dir(self) -> Optional[str]:
         """Get application data directory."""
-        # Use ~/Library/Application Support on macOS
-        home = os.path.expanduser('~')
-        return os.path.join(home, 'Library', 'Application Support', 'AIPut')
+        # Shared with the platform detection cache
+        return get_app_data_dir()
 
 
 class MacOSNotificationAdapter(NotificationAdapter):
@@ -344,11 +335,7 @@ class MacOSNotificationAdapter(NotificationAdapter):
 
     def _check_afplay(self) -> bool:
         """Check if afplay command is available."""
-        try:
-            subprocess.run(['afplay', '--help'], capture_output=True, check=True)
-            return True
-        except:
-            return False
+        return has_tool('afplay')
 
     def show_notification(self, title: str, message: str, duration: int = 5000) -> bool:
         """Show a macOS notification (not implemented for now)."""
@@ -373,7 +360,7 @@ class MacOSNotificationAdapter(NotificationAdapter):
             try:
                 print(f"[DEBUG] Playing custom sound with afplay...")
                 # Play sound in background
-                subprocess.Popen(['afplay', self._custom_sound],
+                subprocess.Popen(resolve_command(['afplay', self._custom_sound]),
                                stdout=subprocess.DEVNULL,
                                stderr=subprocess.DEVNULL)
                 return True
@@ -388,7 +375,7 @@ class MacOSNotificationAdapter(NotificationAdapter):
         # Try osascript to play system sound
         try:
             script = 'beep'
-            subprocess.Popen(['osascript', '-e', script],
+            subprocess.Popen(resolve_command(['osascript', '-e', script]),
                            stdout=subprocess.DEVNULL,
                            stderr=subprocess.DEVNULL)
             return True
@@ -416,11 +403,12 @@ class MacOSNotificationAdapter(NotificationAdapter):
 class MacOSAdapter:
     """Main macOS adapter combining all sub-adapters."""
 
-    def __init__(self, platform_info: PlatformInfo):
+    def __init__(self, platform_info: PlatformInfo, headless: bool = False):
         self.platform_info = platform_info
         self.keyboard = MacOSKeyboardAdapter(platform_info)
         self.clipboard = MacOSClipboardAdapter(platform_info)
-        self.system_tray = MacOSSystemTrayAdapter(platform_info)
+        # Headless runs have no tray; pystray would import PIL and a GUI backend
+        self.system_tray = NullSystemTrayAdapter(platform_info) if headless else MacOSSystemTrayAdapter(platform_info)
         self.resources = MacOSResourceAdapter(platform_info)
         self.notifications = MacOSNotificationAdapter(platform_info)
 
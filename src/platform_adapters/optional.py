@@ -0,0 +1,51 @@
+"""
+On-demand imports of optional GUI-bound modules (pyautogui, pystray, PIL).
+
+Importing pyautogui loads pymsgbox and with it tkinter, and pystray loads
+PIL and a GUI backend, so adapters import them on first use instead of at
+module level. Headless runs never touch them unless a fallback is needed.
+"""
+
+import threading
+from typing import Any, Callable, Dict
+
+_modules: Dict[str, Any] = {}
+_lock = threading.Lock()
+
+
+def _load(name: str, loader: Callable[[], Any]) -> Any:
+    """Import once and cache the module, or None if the import failed."""
+    with _lock:
+        if name not in _modules:
+            try:
+                _modules[name] = loader()
+            except Exception:
+                # ImportError, or a display connection error raised at import
+                _modules[name] = None
+        return _modules[name]
+
+
+def load_pyautogui() -> Any:
+    """Return the configured pyautogui module, or None if it cannot be imported."""
+    def loader():
+        import pyautogui
+        pyautogui.PAUSE = 0.1
+        pyautogui.FAILSAFE = False
+        return pyautogui
+    return _load('pyautogui', loader)
+
+
+def load_pystray() -> Any:
+    """Return the pystray module, or None if it cannot be imported."""
+    def loader():
+        import pystray
+        return pystray
+    return _load('pystray', loader)
+
+
+def load_pil_image() -> Any:
+    """Return the PIL.Image module, or None if Pillow is not installed."""
+    def loader():
+        from PIL import Image
+        return Image
+    return _load('PIL.Image', loader)
@@ -0,0 +1,134 @@
+"""
+Non-blocking helpers for running external tools from async adapter methods.
+
+Tools are spawned by the absolute path resolved during platform detection,
+and every invocation is timed as ``aiput_tool_seconds{tool=...}``.
+"""
+
+import os
+import time
+import asyncio
+import subprocess
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional
+import metrics
+from platform_detection.tools import resolve_command
+
+
+# Small dedicated pool for in-process blocking calls (pyperclip, pyautogui),
+# so they cannot starve the default executor
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="platform-tools")
+
+
+@contextmanager
+def _measure(args: List[str]):
+    """Record a tool invocation's duration and, if it failed, the reason.
+
+    The body appends the exit code to the yielded list when the tool ran.
+    """
+    tool = os.path.basename(args[0])
+    outcome: List[int] = []
+    start = time.perf_counter()
+    try:
+        yield outcome
+    except subprocess.TimeoutExpired:
+        metrics.inc('aiput_tool_errors_total', tool=tool, reason='timeout')
+        raise
+    except OSError:
+        metrics.inc('aiput_tool_errors_total', tool=tool, reason='start')
+        raise
+    finally:
+        metrics.observe('aiput_tool_seconds', time.perf_counter() - start, tool=tool)
+    if outcome and outcome[0] != 0:
+        metrics.inc('aiput_tool_errors_total', tool=tool, reason='exit')
+
+
+async def run_tool(args: List[str], input: Optional[bytes] = None,
+                   timeout: Optional[float] = None) -> int:
+    """Run an external tool without blocking the event loop.
+
+    Mirrors ``subprocess.run(args, input=input, timeout=timeout, check=False)``:
+    output is inherited, the process is killed on timeout and
+    ``subprocess.TimeoutExpired`` is raised.
+
+    Args:
+        args: Command line.
+        input: Optional bytes written to the tool's stdin.
+        timeout: Seconds to wait for the tool to exit (None = no limit).
+
+    Returns:
+        int: The tool's exit code.
+
+    Raises:
+        subprocess.TimeoutExpired: If the tool did not exit in time.
+        OSError: If the tool could not be started.
+    """
+    args = resolve_command(args)
+    with _measure(args) as outcome:
+        proc = await asyncio.create_subprocess_exec(
+            *args,
+            stdin=asyncio.subprocess.PIPE if input is not None else asyncio.subprocess.DEVNULL
+        )
+        try:
+            await asyncio.wait_for(proc.communicate(input), timeout)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            raise subprocess.TimeoutExpired(args, timeout)
+        except asyncio.CancelledError:
+            if proc.returncode is None:
+                proc.kill()
+            raise
+        outcome.append(proc.returncode)
+    return proc.returncode
+
+
+async def read_tool(args: List[str], timeout: Optional[float] = None) -> Optional[bytes]:
+    """Run an external tool and capture its standard output.
+
+    Args:
+        args: Command line.
+        timeout: Seconds to wait for the tool to exit (None = no limit).
+
+    Returns:
+        Optional[bytes]: The tool's output, or None if it exited non-zero.
+
+    Raises:
+        subprocess.TimeoutExpired: If the tool did not exit in time.
+        OSError: If the tool could not be started.
+    """
+    args = resolve_command(args)
+    with _measure(args) as outcome:
+        proc = await asyncio.create_subprocess_exec(
+            *args,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        try:
+            stdout, _ = await asyncio.wait_for(proc.communicate(), timeout)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            raise subprocess.TimeoutExpired(args, timeout)
+        except asyncio.CancelledError:
+            if proc.returncode is None:
+                proc.kill()
+            raise
+        outcome.append(proc.returncode)
+    return stdout if proc.returncode == 0 else None
+
+
+async def run_blocking(func: Callable[..., Any], *args: Any) -> Any:
+    """Run a blocking in-process call (e.g. pyperclip.copy) on a worker thread.
+
+    Args:
+        func: Callable to run.
+        *args: Positional arguments for ``func``.
+
+    Returns:
+        Whatever ``func`` returns; exceptions propagate to the caller.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, func, *args)
@@ -10,16 +10,6 @@ import time
 from typing import List, Optional, Dict, Any
 from pathlib import Path
 
-try:
-    import pyautogui
-    pyautogui.PAUSE = 0.1
-    pyautogui.FAILSAFE = False
-    PYAUTOGUI_AVAILABLE = True
-except (ImportError, Exception):
-    # 捕获 ImportError 和其他异常（例如 X11 连接错误）
-    PYAUTOGUI_AVAILABLE = False
-    pyautogui = None
-
 try:
     import pyperclip
     PIPERCLIP_AVAILABLE = True
@@ -27,21 +17,14 @@ except (ImportError, Exception):
     PIPERCLIP_AVAILABLE = False
     pyperclip = None
 
-try:
-    import pystray
-    from PIL import Image
-    PYSTRAY_AVAILABLE = True
-except (ImportError, Exception):
-    # pystray 在导入时会尝试连接 X11，在 Linux 上可能失败
-    PYSTRAY_AVAILABLE = False
-    pystray = None
-    Image = None
-
 from platform_adapters.base import (
     KeyboardAdapter, ClipboardAdapter, SystemTrayAdapter,
-    ResourceAdapter, NotificationAdapter, MenuItem
+    ResourceAdapter, NotificationAdapter, MenuItem, NullSystemTrayAdapter
 )
 from platform_detection.detector import PlatformInfo
+from platform_detection.tools import has_module
+from platform_detection.cache import get_app_data_dir
+from platform_adapters.optional import load_pyautogui, load_pystray, load_pil_image
 
 
 class WindowsKeyboardAdapter(KeyboardAdapter):
@@ -54,7 +37,8 @@ class WindowsKeyboardAdapter(KeyboardAdapter):
 
     def _detect_methods(self):
         """Detect available keyboard input methods."""
-        if PYAUTOGUI_AVAILABLE:
+        # pyautogui itself is imported on first use (it loads tkinter)
+        if has_module('pyautogui'):
             self._methods.append('pyautogui')
 
         # Check for win32api
@@ -75,7 +59,8 @@ class WindowsKeyboardAdapter(KeyboardAdapter):
     async def send_paste_command(self) -> bool:
         """Send paste command (Ctrl+V on Windows, with Shift+Insert as fallback)."""
         # Try pyautogui first with Ctrl+V (more common on Windows)
-        if 'pyautogui' in self._methods:
+        pyautogui = load_pyautogui() if 'pyautogui' in self._methods else None
+        if pyautogui:
             try:
                 pyautogui.hotkey('ctrl', 'v')
                 return True
@@ -112,7 +97,8 @@ class WindowsKeyboardAdapter(KeyboardAdapter):
     async def send_ctrl_enter(self) -> bool:
         """Send Ctrl+Enter key combination on Windows."""
         # Try pyautogui first
-        if 'pyautogui' in self._methods:
+        pyautogui = load_pyautogui() if 'pyautogui' in self._methods else None
+        if pyautogui:
             try:
                 pyautogui.hotkey('ctrl', 'enter')
                 return True
@@ -150,7 +136,8 @@ class WindowsKeyboardAdapter(KeyboardAdapter):
 
     async def send_text(self, text: str) -> bool:
         """Send text directly."""
-        if 'pyautogui' in self._methods:
+        pyautogui = load_pyautogui() if 'pyautogui' in self._methods else None
+        if pyautogui:
             try:
                 pyautogui.typewrite(text)
                 return True
@@ -190,7 +177,6 @@ class WindowsClipboardAdapter(ClipboardAdapter):
         if PIPERCLIP_AVAILABLE:
             try:
                 pyperclip.copy(text)
-                await asyncio.sleep(0.1)
                 return True
             except Exception:
                 pass
@@ -219,6 +205,10 @@ class WindowsClipboardAdapter(ClipboardAdapter):
         """Check if clipboard is available."""
         return True  # Windows always has clipboard
 
+    def copy_confirmed(self) -> bool:
+        """Clipboard writes are synchronous here; no settle delay is needed."""
+        return True
+
     def get_preferred_tool(self) -> Optional[str]:
         """Get preferred tool."""
         if PIPERCLIP_AVAILABLE:
@@ -237,6 +227,7 @@ class WindowsSystemTrayAdapter(SystemTrayAdapter):
         """Create system tray icon."""
         if not self.is_supported():
             return False
+        pystray = load_pystray()
 
         try:
             # Create menu items
@@ -270,7 +261,7 @@ class WindowsSystemTrayAdapter(SystemTrayAdapter):
 
     def is_supported(self) -> bool:
         """Check if system tray is supported."""
-        return PYSTRAY_AVAILABLE
+        return load_pystray() is not None
 
     def hide_window(self) -> None:
         """Hide the main window."""
@@ -290,6 +281,7 @@ class WindowsSystemTrayAdapter(SystemTrayAdapter):
 
     def _create_icon_image(self):
         """Create icon image."""
+        Image = load_pil_image()
         if Image:
             # Create a Windows-style icon
             image = Image.new('RGB', (64, 64), color='#007AFF')
@@ -341,6 +333,7 @@ class WindowsResourceAdapter(ResourceAdapter):
 
     def load_image(self, path: str) -> Any:
         """Load an image file."""
+        Image = load_pil_image()
         if Image:
             try:
                 return Image.open(path)
@@ -350,11 +343,8 @@ class WindowsResourceAdapter(ResourceAdapter):
 
     def get_app_data_dir(self) -> Optional[str]:
         """Get application data directory."""
-        # Use %APPDATA% on Windows
-        app_data = os.environ.get('APPDATA')
-        if app_data:
-            return os.path.join(app_data, 'AIPut')
-        return None
+        # Shared with the platform detection cache
+        return get_app_data_dir()
 
 
 class WindowsNotificationAdapter(NotificationAdapter):
@@ -441,11 +431,12 @@ class WindowsNotificationAdapter(NotificationAdapter):
 class WindowsAdapter:
     """Main Windows adapter combining all sub-adapters."""
 
-    def __init__(self, platform_info: PlatformInfo):
+    def __init__(self, platform_info: PlatformInfo, headless: bool = False):
         self.platform_info = platform_info
         self.keyboard = WindowsKeyboardAdapter(platform_info)
         self.clipboard = WindowsClipboardAdapter(platform_info)
-        self.system_tray = WindowsSystemTrayAdapter(platform_info)
+        # Headless runs have no tray; pystray would import PIL and a GUI backend
+        self.system_tray = NullSystemTrayAdapter(platform_info) if headless else WindowsSystemTrayAdapter(platform_info)
         self.resources = WindowsResourceAdapter(platform_info)
         self.notifications = WindowsNotificationAdapter(platform_info)
 
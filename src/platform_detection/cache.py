@@ -0,0 +1,150 @@
+"""
+Persistent cache of PlatformInfo, keyed on an environment fingerprint.
+"""
+
+import os
+import sys
+import json
+import hashlib
+import platform
+import dataclasses
+from typing import Callable, Dict, List, Optional
+
+# Bump when PlatformInfo or the detection logic changes shape
+CACHE_VERSION = 2
+
+# Environment variables that decide the display protocol and desktop
+DISPLAY_VARIABLES = (
+    'WAYLAND_DISPLAY', 'DISPLAY', 'XDG_SESSION_TYPE', 'XDG_CURRENT_DESKTOP',
+    'XDG_SESSION_DESKTOP', 'KDE_SESSION_VERSION', 'I3SOCK', 'YDOTOOL_SOCKET',
+)
+
+
+def get_app_data_dir() -> Optional[str]:
+    """Per-user application data directory for AIPut.
+
+    The resource adapters return this directory too; it is resolved here
+    because the platform cache is read before any adapter exists.
+
+    Returns:
+        Optional[str]: The directory, or None if it cannot be determined.
+    """
+    system = platform.system()
+    if system == 'Windows':
+        # Use %APPDATA% on Windows
+        app_data = os.environ.get('APPDATA')
+        return os.path.join(app_data, 'AIPut') if app_data else None
+    if system == 'Darwin':
+        # Use ~/Library/Application Support on macOS
+        return os.path.join(os.path.expanduser('~'), 'Library', 'Application Support', 'AIPut')
+    # Follow XDG Base Directory Specification, falling back to ~/.local/share
+    xdg_data_home = os.environ.get('XDG_DATA_HOME')
+    if xdg_data_home:
+        return os.path.join(xdg_data_home, 'aiput')
+    return os.path.expanduser('~/.local/share/aiput')
+
+
+def _mtime(path: str) -> Optional[float]:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def _search_dirs() -> List[str]:
+    """Directories whose contents decide which tools and modules are found."""
+    dirs = os.environ.get('PATH', '').split(os.pathsep)
+    dirs += [entry for entry in sys.path if entry and os.path.isdir(entry)]
+    return dirs
+
+
+def environment_fingerprint() -> str:
+    """Hash of everything detection depends on, computed with stat calls only.
+
+    Covers PATH and sys.path (plus their directories' mtimes, which change
+    when a tool or package is installed or removed), the display variables,
+    the interpreter and the OS release.
+    """
+    state = {
+        'version': CACHE_VERSION,
+        'python': [sys.executable, sys.version],
+        'os': [platform.system(), platform.release()],
+        'display': {name: os.environ.get(name) for name in DISPLAY_VARIABLES},
+        'dirs': [[path, _mtime(path)] for path in _search_dirs()],
+    }
+    return hashlib.sha256(json.dumps(state, sort_keys=True).encode()).hexdigest()
+
+
+def tool_mtimes(tool_paths: Dict[str, str]) -> Dict[str, Optional[float]]:
+    """Modification times of resolved tools (None if the tool is gone)."""
+    return {path: _mtime(path) for path in tool_paths.values()}
+
+
+class PlatformCache:
+    """Reads and writes detected PlatformInfo as JSON in the app data directory."""
+
+    def __init__(self, path: Optional[str] = None):
+        """Initialize the cache.
+
+        Args:
+            path: Cache file (default: platform.json in the app data directory;
+                None disables the cache if that directory is unknown).
+        """
+        if path is None:
+            app_data_dir = get_app_data_dir()
+            path = os.path.join(app_data_dir, 'platform.json') if app_data_dir else None
+        self.path = path
+
+    def load(self, fingerprint: str, factory: Callable[..., object]):
+        """Return the cached PlatformInfo if it was saved for this fingerprint.
+
+        Args:
+            fingerprint: Current environment_fingerprint().
+            factory: PlatformInfo class, called with the stored fields.
+
+        Returns:
+            The cached PlatformInfo, or None on a miss, a stale entry or a
+            corrupt file.
+        """
+        if self.path is None:
+            return None
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            if entry.get('fingerprint') != fingerprint:
+                return None
+            info = factory(**entry['info'])
+            tool_paths = info.additional_info.get('tool_paths', {})
+            if tool_mtimes(tool_paths) != entry.get('tools', {}):
+                # A detected tool was replaced or removed in place
+                return None
+            return info
+        except (OSError, ValueError, TypeError, KeyError, AttributeError):
+            return None
+
+    def save(self, fingerprint: str, info) -> bool:
+        """Store info for fingerprint, replacing the file atomically.
+
+        Returns:
+            bool: True if the cache was written.
+        """
+        if self.path is None:
+            return False
+        entry = {
+            'fingerprint': fingerprint,
+            'info': dataclasses.asdict(info),
+            'tools': tool_mtimes(info.additional_info.get('tool_paths', {})),
+        }
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+            return True
+        except (OSError, TypeError, ValueError):
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return False
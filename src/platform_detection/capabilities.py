@@ -60,8 +60,11 @@ class PlatformCapabilities:
 
     def get_system_tray_support(self) -> str:
         """Check system tray support level."""
-        # Check if pystray is available
-        has_pystray = self.platform_info.additional_info.get('pystray_available', False)
+        # pystray must actually import (it needs a display); detection only
+        # records whether it is installed
+        from platform_adapters.optional import load_pystray
+        has_pystray = (self.platform_info.additional_info.get('pystray_installed', False)
+                       and load_pystray() is not None)
 
         if not has_pystray:
             return FeatureSupport.NOT_SUPPORTED
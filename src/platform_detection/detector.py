@@ -4,9 +4,13 @@ Platform detection module for identifying OS, display environment, and desktop e
 
 import platform
 import os
+import threading
 from dataclasses import dataclass
 from typing import Optional, Dict, Any
 
+from platform_detection.tools import find_tools, has_module, clear_tool_cache, remember_tools
+from platform_detection.cache import PlatformCache, environment_fingerprint
+
 
 @dataclass
 class PlatformInfo:
@@ -26,9 +30,66 @@ class PlatformInfo:
 class PlatformDetector:
     """Detects platform information from environment variables and system calls."""
 
+    _info: Optional[PlatformInfo] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def detect(cls, use_cache: bool = True) -> PlatformInfo:
+        """Detect the current platform.
+
+        The result is kept for the process and persisted across launches,
+        keyed on an environment fingerprint (PATH, sys.path, display
+        variables, Python and OS version). On a warm start the stored result
+        is returned at once and re-detected on a background thread; a
+        changed result replaces the stored one for the next launch.
+
+        Args:
+            use_cache: Set to False to force a fresh detection.
+        """
+        if not use_cache or os.getenv('AIPUT_PLATFORM_CACHE', 'true').lower() != 'true':
+            return cls._detect_uncached()
+
+        with cls._lock:
+            if cls._info is not None:
+                return cls._info
+
+            cache = PlatformCache()
+            fingerprint = environment_fingerprint()
+            info = cache.load(fingerprint, PlatformInfo)
+            if info is None:
+                info = cls._detect_uncached()
+                cache.save(fingerprint, info)
+            else:
+                # Adapters spawn tools by the paths resolved at the last launch
+                remember_tools(info.additional_info.get('tool_paths', {}))
+                threading.Thread(target=cls._revalidate, args=(cache, fingerprint, info),
+                                 name='platform-revalidate', daemon=True).start()
+            cls._info = info
+            return info
+
+    @classmethod
+    def _revalidate(cls, cache: PlatformCache, fingerprint: str, cached: PlatformInfo):
+        """Re-detect in the background and refresh the cache if anything changed."""
+        try:
+            fresh = cls._detect_uncached()
+        except Exception as e:
+            print(f"[PlatformDetector] Background re-detection failed: {e}")
+            return
+        if fresh != cached:
+            print("[PlatformDetector] Platform changed since the last launch; cache updated, "
+                  "restart to apply")
+            cache.save(fingerprint, fresh)
+
+    @classmethod
+    def clear_cache(cls):
+        """Forget the detected platform and resolved tool paths for this process."""
+        with cls._lock:
+            cls._info = None
+        clear_tool_cache()
+
     @staticmethod
-    def detect() -> PlatformInfo:
-        """Detect the current platform."""
+    def _detect_uncached() -> PlatformInfo:
+        """Detect the current platform from scratch."""
         os_name = platform.system()
         os_version = platform.release()
 
@@ -99,31 +160,19 @@ class PlatformDetector:
         capabilities = {}
 
         # Check for clipboard tools
-        clipboard_tools = []
-        for tool in ['xclip', 'wl-copy', 'xsel', 'wl-paste']:
-            try:
-                result = os.system(f'which {tool} > /dev/null 2>&1')
-                if result == 0:
-                    clipboard_tools.append(tool)
-            except:
-                pass
-        capabilities['clipboard_tools'] = clipboard_tools
+        clipboard_tools = find_tools(['xclip', 'wl-copy', 'xsel', 'wl-paste'])
+        capabilities['clipboard_tools'] = list(clipboard_tools)
 
         # Check for keyboard simulation tools
-        keyboard_tools = []
-        for tool in ['wtype', 'ydotool', 'xdotool', 'xte', 'xvkbd']:
-            try:
-                result = os.system(f'which {tool} > /dev/null 2>&1')
-                if result == 0:
-                    keyboard_tools.append(tool)
-            except:
-                pass
-        capabilities['keyboard_tools'] = keyboard_tools
-
-        # Check for Python packages
-        capabilities['pyautogui_available'] = PlatformDetector._check_python_module('pyautogui')
-        capabilities['pystray_available'] = PlatformDetector._check_python_module('pystray')
-        capabilities['pynput_available'] = PlatformDetector._check_python_module('pynput')
+        keyboard_tools = find_tools(['wtype', 'ydotool', 'xdotool', 'xte', 'xvkbd'])
+        capabilities['keyboard_tools'] = list(keyboard_tools)
+
+        capabilities['tool_paths'] = {**clipboard_tools, **keyboard_tools}
+
+        # Check for installed Python packages
+        capabilities['pyautogui_installed'] = PlatformDetector._check_python_module('pyautogui')
+        capabilities['pystray_installed'] = PlatformDetector._check_python_module('pystray')
+        capabilities['pynput_installed'] = PlatformDetector._check_python_module('pynput')
 
         return capabilities
 
@@ -133,12 +182,12 @@ class PlatformDetector:
         capabilities = {}
 
         # Check for Windows-specific features
-        capabilities['win32api_available'] = PlatformDetector._check_python_module('win32api')
-        capabilities['win32gui_available'] = PlatformDetector._check_python_module('win32gui')
-        capabilities['pywin32_available'] = PlatformDetector._check_python_module('win32gui') or \
+        capabilities['win32api_installed'] = PlatformDetector._check_python_module('win32api')
+        capabilities['win32gui_installed'] = PlatformDetector._check_python_module('win32gui')
+        capabilities['pywin32_installed'] = PlatformDetector._check_python_module('win32gui') or \
                                          PlatformDetector._check_python_module('win32api')
-        capabilities['pyautogui_available'] = PlatformDetector._check_python_module('pyautogui')
-        capabilities['pystray_available'] = PlatformDetector._check_python_module('pystray')
+        capabilities['pyautogui_installed'] = PlatformDetector._check_python_module('pyautogui')
+        capabilities['pystray_installed'] = PlatformDetector._check_python_module('pystray')
 
         return capabilities
 
@@ -148,21 +197,21 @@ class PlatformDetector:
         capabilities = {}
 
         # Check for macOS-specific features
-        capabilities['appkit_available'] = PlatformDetector._check_python_module('AppKit')
-        capabilities['pyobjus_available'] = PlatformDetector._check_python_module('PyObjC')
-        capabilities['pyautogui_available'] = PlatformDetector._check_python_module('pyautogui')
-        capabilities['pystray_available'] = PlatformDetector._check_python_module('pystray')
-        capabilities['pynput_available'] = PlatformDetector._check_python_module('pynput')
+        capabilities['appkit_installed'] = PlatformDetector._check_python_module('AppKit')
+        capabilities['pyobjus_installed'] = PlatformDetector._check_python_module('PyObjC')
+        capabilities['pyautogui_installed'] = PlatformDetector._check_python_module('pyautogui')
+        capabilities['pystray_installed'] = PlatformDetector._check_python_module('pystray')
+        capabilities['pynput_installed'] = PlatformDetector._check_python_module('pynput')
 
         return capabilities
 
     @staticmethod
     def _check_python_module(module_name: str) -> bool:
-        """Check if a Python module is available."""
-        try:
-            import importlib
-            importlib.import_module(module_name)
-            return True
-        except (ImportError, Exception):
-            # 捕获所有异常，包括模块导入时的 X11 连接错误
-            return False
\ No newline at end of file
+        """Check if a Python module is installed (without importing it).
+
+        Installed does not mean importable: pyautogui and pystray, for
+        example, fail to import without a display. Adapters import them
+        lazily via platform_adapters.optional.
+        """
+        # 只查找模块，不执行导入，避免 pyautogui 等在导入时连接 X11
+        return has_module(module_name)
\ No newline at end of file
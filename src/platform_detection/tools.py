@@ -0,0 +1,99 @@
+"""
+Subprocess-free discovery of command-line tools and Python modules.
+"""
+
+import os
+import shutil
+import threading
+import importlib.util
+from typing import Dict, Iterable, List, Optional
+
+_tool_paths: Dict[str, Optional[str]] = {}
+_tool_lock = threading.Lock()
+
+
+def find_tool(name: str) -> Optional[str]:
+    """Resolve a command on PATH to its absolute path.
+
+    Scans PATH in-process (no ``which`` subprocess) and caches the result,
+    including misses, for the lifetime of the process.
+
+    Args:
+        name: Command name, e.g. ``xclip``.
+
+    Returns:
+        Optional[str]: Absolute path of the executable, or None if not found.
+    """
+    with _tool_lock:
+        if name not in _tool_paths:
+            path = shutil.which(name)
+            _tool_paths[name] = os.path.abspath(path) if path else None
+        return _tool_paths[name]
+
+
+def find_tools(names: Iterable[str]) -> Dict[str, str]:
+    """Resolve several commands, returning only those found.
+
+    Returns:
+        Dict[str, str]: Command name -> absolute path, in the order given.
+    """
+    found = {}
+    for name in names:
+        path = find_tool(name)
+        if path:
+            found[name] = path
+    return found
+
+
+def remember_tools(tool_paths: Dict[str, str]):
+    """Seed the cache with paths resolved earlier (e.g. a cached detection).
+
+    Args:
+        tool_paths: Command name -> absolute path.
+    """
+    with _tool_lock:
+        _tool_paths.update(tool_paths)
+
+
+def resolve_command(args: List[str]) -> List[str]:
+    """Replace a command line's program with its resolved absolute path.
+
+    Spawning by absolute path skips the PATH search on every invocation.
+    Unknown programs are left as given, so spawning fails as it would have.
+
+    Args:
+        args: Command line, e.g. ``['xclip', '-selection', 'clipboard']``.
+
+    Returns:
+        List[str]: The command line to spawn.
+    """
+    path = find_tool(args[0]) if args and not os.path.isabs(args[0]) else None
+    return [path] + list(args[1:]) if path else list(args)
+
+
+def has_tool(name: str) -> bool:
+    """Check if a command is available on PATH."""
+    return find_tool(name) is not None
+
+
+def has_module(module_name: str) -> bool:
+    """Check if a Python module is installed, without importing it.
+
+    Uses the import system's finders only, so the module's code never runs
+    (importing pyautogui, for example, connects to the X server). An
+    installed module may still fail to import, e.g. without a display.
+
+    Args:
+        module_name: Dotted module name.
+    """
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        # Parent package missing, or a module with no __spec__
+        return False
+
+
+def clear_tool_cache():
+    """Forget resolved tool paths (e.g. after PATH changed)."""
+    with _tool_lock:
+        _tool_paths.clear()
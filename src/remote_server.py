@@ -6,6 +6,10 @@
 import os
 import sys
 
+# 启动耗时统计（--profile-startup）
+import startup_profile
+from startup_profile import span, print_report
+
 # Windows 控制台编码修复 - 设置为 UTF-8
 if sys.platform == 'win32':
     import io
@@ -32,29 +36,34 @@ if hasattr(os, 'geteuid'):  # 检测是否为 root 用户（仅 Unix 系统）
 # 修复 pyautogui 的导入问题
 # 在 Wayland 环境下不强制设置 DISPLAY，让适配器自行处理
 
-# 加载配置文件（在导入其他模块之前）
-try:
-    from config import load_env
-    load_env()
-except ImportError:
-    pass
+# 加载配置文件（在导入其他模块之前；config 导入时即加载 .env，只加载一次）
+with span('load .env'):
+    try:
+        import config
+    except ImportError:
+        pass
 
 # 现在可以安全地导入其他模块
-import socket
-import threading
-import tkinter as tk
-from tkinter import messagebox, ttk
-from flask import Flask, request, send_from_directory
-import time
-import logging
-import qrcode
-from PIL import Image, ImageTk
-import asyncio
-from typing import Optional
+# tkinter、Flask、qrcode、PIL 等较重的模块在首次使用时才导入
+with span('import stdlib'):
+    import socket
+    import threading
+    import time
+    import logging
+    import asyncio
+    import json
+    from typing import Optional
+
+# 进程内延迟直方图与计数器（/metrics、/stats）
+import metrics
 
 # 延迟导入平台相关模块
-def init_platform_adapters():
-    """延迟初始化平台适配器"""
+def init_platform_adapters(headless=False):
+    """延迟初始化平台适配器
+
+    Args:
+        headless: 无界面模式，不创建托盘图标（避免导入 pystray/PIL）
+    """
     try:
         # 将 src 目录添加到模块搜索路径
         script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -63,14 +72,17 @@ def init_platform_adapters():
         
         # 导入平台检测和适配器
         print("正在导入平台检测模块...")
-        from platform_detection.detector import PlatformDetector
+        with span('import platform_detection'):
+            from platform_detection.detector import PlatformDetector
 
         print("正在导入适配器工厂...")
-        from platform_adapters.factory import AdapterFactory
+        with span('import platform_adapters'):
+            from platform_adapters.factory import AdapterFactory
 
         # 检测平台
         print("正在检测平台...")
-        platform_info = PlatformDetector.detect()
+        with span('platform detection'):
+            platform_info = PlatformDetector.detect()
         print(f"\n=== 平台信息 ===")
         print(f"操作系统: {platform_info.os_name}")
         print(f"显示环境: {platform_info.display_protocol or '未知'}")
@@ -90,7 +102,8 @@ def init_platform_adapters():
 
         # 创建适配器
         print("\n正在创建平台适配器...")
-        adapters = AdapterFactory.create_adapters(platform_info)
+        with span('create adapters'):
+            adapters = AdapterFactory.create_adapters(platform_info, headless=headless)
         print("✓ 平台适配器创建成功！")
 
         return adapters, platform_info
@@ -104,47 +117,88 @@ def init_platform_adapters():
         print("⚠ 将使用兼容模式...")
         return None, None
 
-# Flask 应用配置
 # 获取项目根目录
 script_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.dirname(script_dir)
-app = Flask(__name__, static_folder=os.path.join(project_root, 'site'), static_url_path='/static')
-log = logging.getLogger('werkzeug')
-log.setLevel(logging.ERROR)
 
 # 全局变量
 platform_adapters = None
 platform_info = None
 processing_service = None
 keep_alive_thread = None
+prompt_registry = None
+
+# 剪贴板与按键注入队列（所有请求共享，按到达顺序执行）
+with span('import injection queue'):
+    from injection_queue import InjectionQueue, InjectionQueueFull
+    from platform_adapters.process import run_blocking
+injection_queue = InjectionQueue()
+
+# 平台适配器、提示词与 AI 服务初始化完成后置位
+services_ready = threading.Event()
+
+def init_services(headless=False):
+    """初始化平台适配器、提示词注册表和 AI 处理服务
+
+    可在后台线程中运行，与 GUI 构建并行；完成后置位 services_ready。
+
+    Args:
+        headless: 无界面模式（不创建托盘图标）
+    """
+    global platform_adapters, platform_info, prompt_registry, processing_service
+    try:
+        print("正在初始化平台适配器...")
+        with span('platform adapters'):
+            platform_adapters, platform_info = init_platform_adapters(headless)
 
-# 在创建路由之前初始化平台适配器
-print("正在初始化平台适配器...")
-platform_adapters, platform_info = init_platform_adapters()
+        # 加载提示词注册表（客户端只需发送提示词 ID）
+        with span('prompt registry'):
+            try:
+                from ai.prompt_registry import PromptRegistry
+                prompt_registry = PromptRegistry(os.path.join(project_root, 'site', 'config', 'prompts.json'))
+            except Exception as e:
+                print(f"  提示词注册表加载失败: {e}")
 
-# 初始化AI处理服务
-print("正在初始化AI处理服务...")
-try:
-    from ai.processing_service import ProcessingService
-    processing_service = ProcessingService()
-    print("  AI处理服务初始化成功")
-except Exception as e:
-    print(f"  AI处理服务初始化失败: {e}")
-    processing_service = None
+        # 初始化AI处理服务
+        print("正在初始化AI处理服务...")
+        with span('AI processing service'):
+            try:
+                from ai.processing_service import ProcessingService
+                data_dir = None
+                if platform_adapters and hasattr(platform_adapters, 'resources'):
+                    data_dir = platform_adapters.resources.get_app_data_dir()
+                processing_service = ProcessingService(data_dir=data_dir)
+                # 预先建立到 AI 服务的连接，避免首个请求承担 DNS/TLS 开销
+                processing_service.warm_up()
+                print("  AI处理服务初始化成功")
+            except Exception as e:
+                print(f"  AI处理服务初始化失败: {e}")
+                processing_service = None
+    finally:
+        services_ready.set()
+
+def start_services():
+    """在后台线程中初始化服务"""
+    thread = threading.Thread(target=init_services, name='init-services', daemon=True)
+    thread.start()
+    return thread
 
 
 class KeepAliveThread(threading.Thread):
     """Background thread that calls keep_alive() periodically."""
 
-    def __init__(self, keyboard_adapter, interval=300):
+    def __init__(self, keyboard_adapter, interval=300, processing_service=None):
         """Initialize keep-alive thread.
 
         Args:
             keyboard_adapter: Platform keyboard adapter for keep-alive.
             interval: Trigger interval in seconds (default: 300 = 5 minutes).
+            processing_service: Optional AI processing service whose provider
+                connections are kept warm on the same cadence.
         """
         super().__init__(daemon=True)
         self._keyboard_adapter = keyboard_adapter
+        self._processing_service = processing_service
         self._interval = interval
         self._stop_event = threading.Event()
         self._loop = None
@@ -182,6 +236,13 @@ class KeepAliveThread(threading.Thread):
         except Exception as e:
             logging.warning(f"Keep-alive trigger failed: {e}")
 
+        # Keep AI provider connections warm
+        if self._processing_service:
+            try:
+                self._processing_service.warm_up()
+            except Exception as e:
+                logging.warning(f"AI connection keep-warm failed: {e}")
+
     def stop(self):
         """Stop the keep-alive thread gracefully."""
         self._stop_event.set()
@@ -202,28 +263,140 @@ def get_keep_alive_interval():
     except ValueError:
         return 300
 
-@app.route('/')
-def index():
-    # Get the directory containing this script (src directory)
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    # Go up one level to project root, then to site directory
-    site_dir = os.path.join(script_dir, '..', 'site')
-    return send_from_directory(site_dir, 'index.html')
-
-@app.route('/type', methods=['POST'])
-async def type_text():
-    """处理文本输入请求，支持AI处理"""
-    global platform_adapters, processing_service
+def create_flask_app():
+    """创建 Flask 应用（AIPUT_SERVER=flask 时使用，Flask 仅在此时导入）"""
+    from flask import Flask, request, send_from_directory
 
-    try:
+    flask_app = Flask(__name__, static_folder=os.path.join(project_root, 'site'), static_url_path='/static')
+    log = logging.getLogger('werkzeug')
+    log.setLevel(logging.ERROR)
+
+    @flask_app.route('/')
+    def index():
+        # Go up one level to project root, then to site directory
+        site_dir = os.path.join(script_dir, '..', 'site')
+        return send_from_directory(site_dir, 'index.html')
+
+    @flask_app.route('/prompts')
+    def prompts():
+        return list_prompts()
+
+    @flask_app.route('/type', methods=['POST'])
+    async def type_text():
+        """处理文本输入请求，支持AI处理"""
         # 获取客户端IP地址
         client_ip = request.environ.get('HTTP_X_FORWARDED_FOR', request.environ.get('REMOTE_ADDR', 'unknown'))
+        with metrics.timer('aiput_stage_seconds', stage='parse'):
+            data = request.get_json(silent=True) or {}
+        result = await handle_type_request(data, client_ip)
+        return (result, 429) if result.get('busy') else result
+
+    @flask_app.route('/stats')
+    def stats():
+        """返回注入队列与 AI 处理服务的运行统计"""
+        return collect_stats()
+
+    @flask_app.route('/metrics')
+    def metrics_text():
+        """Prometheus 文本格式的延迟直方图与计数器"""
+        return metrics.render_prometheus(), 200, {'Content-Type': METRICS_CONTENT_TYPE}
+
+    return flask_app
+
+def list_prompts():
+    """返回提示词列表（不含提示词正文）"""
+    if not prompt_registry:
+        return {'version': '', 'prompts': []}
+    return prompt_registry.to_client()
+
+def collect_stats():
+    """汇总运行统计"""
+    result = {'injection_queue': injection_queue.stats()}
+    if platform_adapters and hasattr(platform_adapters.keyboard, 'get_stats'):
+        result['keyboard'] = platform_adapters.keyboard.get_stats()
+    if processing_service:
+        result['ai'] = processing_service.stats()
+    result['metrics'] = metrics.snapshot()
+    return result
+
+# Prometheus 文本格式 0.0.4
+METRICS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+def collect_ai_counters():
+    """在抓取 /metrics 时读取 AI 处理服务的重试、对冲与改道计数"""
+    if not processing_service:
+        return
+    stats = processing_service.stats()
+    for provider, retries in stats['retries'].items():
+        yield 'aiput_ai_retries_total', {'provider': provider}, retries
+    yield 'aiput_ai_hedges_total', {}, stats['hedged_requests']
+    yield 'aiput_ai_hedge_wins_total', {}, stats['hedge_wins']
+    yield 'aiput_ai_reroutes_total', {}, stats['rerouted_requests']
+    yield 'aiput_ai_coalesced_total', {}, stats['coalesced_requests']
+
+metrics.register_collector(collect_ai_counters)
+
+def request_outcome(result):
+    """请求结果分类：ok / warning / busy / error"""
+    if result.get('busy'):
+        return 'busy'
+    if not result.get('success'):
+        return 'error'
+    return 'warning' if result.get('warning') else 'ok'
+
+async def handle_type_request(data, client_ip, progress=None):
+    """处理 /type 请求体，HTTP 与 WebSocket 通道共用
+
+    Args:
+        data: 请求体
+        client_ip: 客户端地址
+        progress: 可选的 ``async progress(stage, **info)`` 回调，用于推送处理进度
+
+    Returns:
+        dict: 返回给手机端的 JSON 响应
+    """
+    global platform_adapters, processing_service
+
+    # 各阶段相对请求开始的耗时（毫秒），随响应返回
+    started = time.time()
+    timings = {}
+
+    async def report(stage, **info):
+        now = time.time()
+        timings[stage] = round((now - started) * 1000)
+        if progress:
+            try:
+                await progress(stage, t=round(now * 1000), elapsed_ms=timings[stage], **info)
+            except Exception as e:
+                # 进度推送失败（如客户端断开）不影响输入本身
+                logging.debug(f"Progress report failed: {e}")
+
+    # 预约注入顺序：AI 处理可并发，剪贴板与按键操作按到达顺序串行执行
+    try:
+        ticket = injection_queue.reserve()
+    except InjectionQueueFull:
+        print(f"\n  ✗ 注入队列已满 ({injection_queue.max_depth})，拒绝来自 {client_ip} 的请求")
+        metrics.inc('aiput_requests_total', outcome='busy')
+        return {'success': False, 'busy': True, 'error': '服务繁忙，请稍后重试'}
+    await report('queued', position=injection_queue.position(ticket))
 
+    try:
+        result = await process_type_request(data, client_ip, ticket, report, timings)
+    finally:
+        injection_queue.release(ticket)
+    metrics.observe('aiput_stage_seconds', time.time() - started, stage='total')
+    metrics.inc('aiput_requests_total', outcome=request_outcome(result))
+    return result
+
+async def process_type_request(data, client_ip, ticket, report, timings):
+    """处理已在注入队列中预约的 /type 请求"""
+    # 各同步等待实际耗时（毫秒），随响应返回
+    waits = {}
+    try:
         # 记录接收到的请求
         timestamp = time.strftime('%Y-%m-%d %H:%M:%S')
         print(f"\n[{timestamp}] 收到来自 {client_ip} 的请求")
 
-        data = request.get_json()
         text = data.get('text', '')
         auto_submit = data.get('auto_submit', False)  # 获取自动提交参数
 
@@ -231,6 +404,14 @@ async def type_text():
         prompt = data.get('prompt', '')
         mode = data.get('mode', '')
         provider = data.get('provider', 'zai')
+        if not prompt and mode and prompt_registry:
+            # 新版客户端只发送提示词 ID，由服务端查找提示词内容
+            template = prompt_registry.get(mode)
+            if template:
+                prompt = template.prompt
+            else:
+                print(f"  ⚠ 未知的提示词 ID: {mode}")
+        stream = data.get('stream', get_ai_streaming_default())
 
         # 输出要发送的文本（只显示前50个字符）
         display_text = text[:50] + "..." if len(text) > 50 else text
@@ -243,15 +424,35 @@ async def type_text():
 
         # AI处理逻辑
         processed_text = text
+        streamed = None
         if prompt and processing_service:
+            await report('ai_started')
+        if prompt and processing_service and stream and platform_adapters:
+            print(f"  正在使用AI流式处理文本...")
+            # 立即开始接收 AI 输出，轮到本请求注入时再逐句粘贴
+            chunks = prefetch_stream(processing_service.stream(
+                text=text,
+                prompt=prompt,
+                provider=provider,
+                mode=mode
+            ), report, provider)
+            await injection_queue.acquire(ticket)
+            streamed = await stream_and_paste(chunks, report, waits, text)
+            if streamed is not None:
+                processed_text = streamed[0]
+            else:
+                print("  ⚠ AI流式处理失败，使用原始文本")
+                metrics.inc('aiput_fallbacks_total', component='ai', method=provider)
+        elif prompt and processing_service:
             print(f"  正在使用AI处理文本...")
             try:
-                result = await processing_service.process(
-                    text=text,
-                    prompt=prompt,
-                    provider=provider,
-                    mode=mode
-                )
+                with metrics.timer('aiput_ai_seconds', provider=provider, mode='batch'):
+                    result = await processing_service.process(
+                        text=text,
+                        prompt=prompt,
+                        provider=provider,
+                        mode=mode
+                    )
                 if result is not None:
                     processed_text = result
                     # 显示处理后的文本（只显示前50个字符）
@@ -259,33 +460,47 @@ async def type_text():
                     print(f"  ✓ AI处理成功: {display_processed}")
                 else:
                     print("  ⚠ AI处理失败，使用原始文本")
+                    metrics.inc('aiput_fallbacks_total', component='ai', method=provider)
             except Exception as e:
                 print(f"  ✗ AI处理出错: {e}")
                 print("  继续使用原始文本")
+                metrics.inc('aiput_errors_total', stage='ai')
+                metrics.inc('aiput_fallbacks_total', component='ai', method=provider)
+        if prompt and processing_service:
+            await report('ai_done', ai_processed=processed_text != text)
 
-        if processed_text and platform_adapters:
-            print("  正在执行剪贴板操作...")
-            # 使用平台适配器复制到剪贴板
-            success = await platform_adapters.clipboard.copy_text(processed_text)
-            if not success:
-                print("  ✗ 剪贴板操作失败")
-                error_msg = '剪贴板操作失败'
-                if prompt:
-                    error_msg += ' (AI处理已完成)'
-                return {'success': False, 'error': error_msg}
-
-            print("  ✓ 剪贴板操作成功")
-            print("  正在发送粘贴命令...")
-            # 等待剪贴板操作完成
-            await asyncio.sleep(0.1)
+        # 等待轮到本请求操作剪贴板和键盘
+        await injection_queue.acquire(ticket)
 
-            # 使用平台适配器发送粘贴命令
-            success = await platform_adapters.keyboard.send_paste_command()
+        if processed_text and platform_adapters:
+            if streamed is not None:
+                # 流式模式下已逐句粘贴
+                success = streamed[1]
+            else:
+                print("  正在执行剪贴板操作...")
+                # 使用平台适配器复制到剪贴板
+                success = await copy_to_clipboard(processed_text)
+                if not success:
+                    print("  ✗ 剪贴板操作失败")
+                    error_msg = '剪贴板操作失败'
+                    if prompt:
+                        error_msg += ' (AI处理已完成)'
+                    return {'success': False, 'error': error_msg, 'timings': timings}
+
+                print("  ✓ 剪贴板操作成功")
+                await report('clipboard_set')
+                # 等待剪贴板内容可读（已确认取得剪贴板所有权时无需等待）
+                waits['clipboard_settle'] = await wait_clipboard_settled(processed_text)
+                print("  正在发送粘贴命令...")
+
+                # 使用平台适配器发送粘贴命令
+                success = await send_paste()
 
             if success:
                 print("  ✓ 键盘模拟成功")
+                await report('pasted', **waits)
 
-                # 播放提示音（如果启用）
+                # 播放提示音（如果启用），在后台进行，不占用提交前的等待
                 try:
                     # 检查是否禁用了声音提示
                     from config import get_config
@@ -294,11 +509,7 @@ async def type_text():
                     if sound_enabled:
                         print("  声音提示已启用，正在播放...")
                         if hasattr(platform_adapters, 'notifications') and platform_adapters.notifications:
-                            success = platform_adapters.notifications.play_notification_sound()
-                            if success:
-                                print("  ✓ 提示音播放成功")
-                            else:
-                                print("  ⚠ 提示音播放失败")
+                            asyncio.ensure_future(play_notification_sound())
                         else:
                             print("  ⚠ 通知适配器未初始化")
                     else:
@@ -306,30 +517,44 @@ async def type_text():
                 except Exception as e:
                     print(f"  ✗ 播放提示音异常: {e}")
 
+                # AI 输出中断时，粘贴内容需要用户检查，不自动提交
+                partial = streamed is not None and streamed[2]
+
                 # 如果开启勇敢模式，发送 Ctrl+Enter
-                if auto_submit:
-                    print("  正在发送 Ctrl+Enter...")
+                if auto_submit and partial:
+                    print("  ⚠ AI输出不完整，跳过 Ctrl+Enter")
+                elif auto_submit:
                     # 等待粘贴完成
-                    await asyncio.sleep(0.1)
+                    waits['submit_wait'] = await wait_paste_done()
+                    print("  正在发送 Ctrl+Enter...")
                     # 发送 Ctrl+Enter
-                    ctrl_enter_success = await platform_adapters.keyboard.send_ctrl_enter()
+                    with metrics.timer('aiput_stage_seconds', stage='ctrl_enter'):
+                        ctrl_enter_success = await platform_adapters.keyboard.send_ctrl_enter()
                     if ctrl_enter_success:
                         print("  ✓ Ctrl+Enter 发送成功")
+                        await report('submitted', submit_wait=waits['submit_wait'])
                     else:
                         print("  ⚠ Ctrl+Enter 发送失败，文本已粘贴")
+                        metrics.inc('aiput_errors_total', stage='ctrl_enter')
 
-                response = {'success': True}
+                response = {'success': True, 'timings': timings, 'waits': waits}
+                print(f"  阶段耗时: {format_timings(timings)}")
+                if waits:
+                    print(f"  同步等待: {format_timings(waits)}")
                 # 如果进行了AI处理，添加相关信息
                 if prompt and processed_text != text:
                     response['ai_processed'] = True
                     response['original_length'] = len(text)
                     response['processed_length'] = len(processed_text)
+                if partial:
+                    response['partial'] = True
+                    response['warning'] = 'AI 输出中断，已在其后粘贴原文'
 
                 return response
             else:
                 # 如果键盘模拟失败，返回警告
                 print("  ⚠ 键盘模拟失败，需要手动粘贴")
-                response = {'success': True, 'warning': '已复制到剪贴板，请手动粘贴'}
+                response = {'success': True, 'warning': '已复制到剪贴板，请手动粘贴', 'timings': timings}
                 if prompt:
                     response['warning'] += ' (AI处理已完成)'
                 return response
@@ -345,8 +570,384 @@ async def type_text():
         print(f"  ✗ 处理请求时发生错误: {e}")
         import traceback
         traceback.print_exc()
+        metrics.inc('aiput_errors_total', stage='request')
         return {'success': False}
 
+def get_server_backend():
+    """Get HTTP server backend from environment variable.
+
+    Returns:
+        str: 'aiohttp' (default, one persistent event loop) or 'flask'
+            (Werkzeug development server, one event loop per request).
+    """
+    backend = os.environ.get('AIPUT_SERVER', 'aiohttp').lower()
+    return backend if backend in ('aiohttp', 'flask') else 'aiohttp'
+
+def create_web_app():
+    """创建 aiohttp 应用，路由与 Flask 应用一致，另加 /ws 通道"""
+    from aiohttp import web
+    from ws_channel import WebSocketChannel
+
+    global websocket_channel
+    if websocket_channel is None:
+        websocket_channel = WebSocketChannel(handle_type_request)
+
+    site_dir = os.path.join(project_root, 'site')
+
+    async def index_handler(request):
+        return web.FileResponse(os.path.join(site_dir, 'index.html'))
+
+    async def prompts_handler(request):
+        return web.json_response(list_prompts())
+
+    async def stats_handler(request):
+        return web.json_response(collect_stats())
+
+    async def metrics_handler(request):
+        return web.Response(body=metrics.render_prometheus().encode('utf-8'),
+                            headers={'Content-Type': METRICS_CONTENT_TYPE})
+
+    async def type_handler(request):
+        client_ip = request.headers.get('X-Forwarded-For', request.remote or 'unknown')
+        with metrics.timer('aiput_stage_seconds', stage='parse'):
+            try:
+                data = await request.json()
+            except Exception:
+                data = {}
+        if 'text/event-stream' not in request.headers.get('Accept', ''):
+            result = await handle_type_request(data or {}, client_ip)
+            return web.json_response(result, status=429 if result.get('busy') else 200)
+
+        # SSE：先逐阶段推送 progress 事件（AI 输出中断时为 error 事件），最后推送 result 事件
+        response = web.StreamResponse(headers={'Content-Type': 'text/event-stream', 'Cache-Control': 'no-cache'})
+        await response.prepare(request)
+
+        async def progress(stage, **info):
+            payload = json.dumps(dict(info, stage=stage), ensure_ascii=False)
+            event = 'error' if stage == 'error' else 'progress'
+            await response.write(f"event: {event}\ndata: {payload}\n\n".encode('utf-8'))
+
+        result = await handle_type_request(data or {}, client_ip, progress)
+        try:
+            payload = json.dumps(result, ensure_ascii=False)
+            await response.write(f"event: result\ndata: {payload}\n\n".encode('utf-8'))
+            await response.write_eof()
+        except ConnectionError:
+            pass
+        return response
+
+    web_app = web.Application()
+    web_app.router.add_get('/', index_handler)
+    web_app.router.add_get('/prompts', prompts_handler)
+    web_app.router.add_get('/stats', stats_handler)
+    web_app.router.add_get('/metrics', metrics_handler)
+    web_app.router.add_post('/type', type_handler)
+    web_app.router.add_get('/ws', websocket_channel.handle)
+    web_app.router.add_static('/static', site_dir)
+    return web_app
+
+class WebServer:
+    """aiohttp server running on the shared AI processing event loop.
+
+    Requests, AI session pools and adapter calls all run on one persistent
+    loop instead of a fresh loop per request.
+    """
+
+    def __init__(self):
+        self._runner = None
+        self._loop = None
+        self._thread = None
+
+    def _get_loop(self):
+        """Use the processing service loop, or start a private one"""
+        if processing_service:
+            return processing_service.get_event_loop()
+        loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=loop.run_forever, name="web-server-loop", daemon=True)
+        self._thread.start()
+        return loop
+
+    def start(self, host, port, sock=None):
+        """Start listening; raises if the port cannot be bound
+
+        Args:
+            host: Address to bind
+            port: Port to bind
+            sock: Already bound listening socket (systemd socket activation);
+                host and port are ignored when given
+        """
+        self._loop = self._get_loop()
+        future = asyncio.run_coroutine_threadsafe(self._start(host, port, sock), self._loop)
+        future.result(timeout=10)
+
+    async def _start(self, host, port, sock=None):
+        from aiohttp import web
+        runner = web.AppRunner(create_web_app(), access_log=None)
+        await runner.setup()
+        try:
+            if sock is not None:
+                await web.SockSite(runner, sock).start()
+            else:
+                await web.TCPSite(runner, host, port).start()
+        except Exception:
+            await runner.cleanup()
+            raise
+        self._runner = runner
+
+    def stop(self):
+        """Stop listening and release the port"""
+        if self._runner is None:
+            return
+        future = asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop)
+        try:
+            future.result(timeout=5)
+        finally:
+            self._runner = None
+            if self._thread:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._thread = None
+
+web_server = None
+# WebSocket 会话在服务重启之间保留，便于手机端断线重连后续传
+websocket_channel = None
+
+def start_web_server(host, port, sock=None):
+    """按 AIPUT_SERVER 配置启动 HTTP 服务
+
+    sock 为 systemd 套接字激活传入的监听套接字，仅 aiohttp 后端支持
+    """
+    global web_server
+    if get_server_backend() == 'flask' and sock is None:
+        flask_app = create_flask_app()
+        t = threading.Thread(target=lambda: flask_app.run(host=host, port=port, debug=False, use_reloader=False), daemon=True)
+        t.start()
+        return
+    web_server = WebServer()
+    web_server.start(host, port, sock)
+
+def shutdown_web_server():
+    """停止 aiohttp 服务"""
+    global web_server
+    if web_server:
+        try:
+            web_server.stop()
+        except Exception as e:
+            print(f"⚠ HTTP 服务停止失败: {e}")
+        web_server = None
+
+def format_timings(timings):
+    """格式化阶段耗时，如 ``queued 0ms, ai_started 2ms, ...``"""
+    return ', '.join(f"{stage} {ms}ms" for stage, ms in timings.items())
+
+def get_wait_ceiling(name, default):
+    """Get a synchronization wait ceiling (seconds) from environment variable.
+
+    Args:
+        name: Environment variable name
+        default: Value used when the variable is unset or invalid
+    """
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return float(default)
+
+async def wait_clipboard_settled(text):
+    """等待剪贴板内容可被读取，最长 AIPUT_CLIPBOARD_SETTLE_MAX 秒
+
+    Returns:
+        int: 实际等待的毫秒数
+    """
+    ceiling = get_wait_ceiling('AIPUT_CLIPBOARD_SETTLE_MAX', '0.2')
+    waited = await platform_adapters.clipboard.wait_until_readable(text, ceiling)
+    metrics.observe('aiput_stage_seconds', waited, stage='clipboard_settle')
+    return round(waited * 1000)
+
+async def wait_paste_done():
+    """等待目标应用取走剪贴板内容后再继续按键
+
+    能观察到粘贴（本进程持有剪贴板）时最多等待 AIPUT_PASTE_CONSUME_MAX 秒，
+    否则固定等待 AIPUT_SUBMIT_DELAY 秒。
+
+    Returns:
+        int: 实际等待的毫秒数
+    """
+    waited = await platform_adapters.clipboard.wait_paste_consumed(
+        get_wait_ceiling('AIPUT_PASTE_CONSUME_MAX', '0.5'))
+    if waited is None:
+        waited = get_wait_ceiling('AIPUT_SUBMIT_DELAY', '0.1')
+        await asyncio.sleep(waited)
+    metrics.observe('aiput_stage_seconds', waited, stage='submit_wait')
+    return round(waited * 1000)
+
+async def play_notification_sound():
+    """在工作线程中播放提示音（播放可能阻塞）"""
+    try:
+        with metrics.timer('aiput_stage_seconds', stage='sound'):
+            played = await run_blocking(platform_adapters.notifications.play_notification_sound)
+        if played:
+            print("  ✓ 提示音播放成功")
+        else:
+            print("  ⚠ 提示音播放失败")
+            metrics.inc('aiput_errors_total', stage='sound')
+    except Exception as e:
+        print(f"  ✗ 播放提示音异常: {e}")
+        metrics.inc('aiput_errors_total', stage='sound')
+
+async def copy_to_clipboard(text):
+    """写入剪贴板，按剪贴板工具记录耗时与失败"""
+    tool = platform_adapters.clipboard.get_preferred_tool()
+    with metrics.timer('aiput_stage_seconds', stage='clipboard', tool=tool):
+        success = await platform_adapters.clipboard.copy_text(text)
+    if not success:
+        metrics.inc('aiput_errors_total', stage='clipboard')
+    return success
+
+async def send_paste():
+    """发送粘贴按键，记录耗时与失败（各按键方法的耗时见 aiput_tool_seconds）"""
+    sent_at = time.monotonic()
+    with metrics.timer('aiput_stage_seconds', stage='paste'):
+        success = await platform_adapters.keyboard.send_paste_command()
+    if success:
+        # 只把按键之后的剪贴板读取算作粘贴（剪贴板管理器在复制时就会读取）
+        platform_adapters.clipboard.paste_sent(sent_at)
+    else:
+        metrics.inc('aiput_errors_total', stage='paste')
+    return success
+
+def get_ai_streaming_default():
+    """Get default streaming mode from environment variable.
+
+    Returns:
+        bool: True if AI output should be streamed and pasted per sentence.
+    """
+    return os.environ.get('AI_STREAMING', 'false').lower() == 'true'
+
+async def prefetch_stream(chunks, report, provider=None):
+    """在后台持续读取 AI 流式输出，排队等待注入期间不阻塞生成
+
+    Args:
+        chunks: processing_service.stream() 返回的异步迭代器
+        report: 进度回调，收到首段输出时报告 first_token
+        provider: AI 服务商，用作耗时指标的标签
+
+    Raises:
+        StreamInterrupted: AI 输出中途失败，在已收到的各段之后抛出
+    """
+    from ai.streaming import StreamInterrupted
+
+    queue = asyncio.Queue()
+    done = object()
+
+    async def pump():
+        first = True
+        started = time.perf_counter()
+        try:
+            async for chunk in chunks:
+                if first:
+                    first = False
+                    metrics.observe('aiput_ai_first_token_seconds', time.perf_counter() - started,
+                                    provider=provider)
+                    await report('first_token')
+                queue.put_nowait(chunk)
+            metrics.observe('aiput_ai_seconds', time.perf_counter() - started, provider=provider, mode='stream')
+        except StreamInterrupted as e:
+            queue.put_nowait(e)
+        finally:
+            queue.put_nowait(done)
+
+    task = asyncio.ensure_future(pump())
+    try:
+        while True:
+            item = await queue.get()
+            if item is done:
+                break
+            if isinstance(item, StreamInterrupted):
+                raise item
+            yield item
+    finally:
+        task.cancel()
+
+async def stream_and_paste(chunks_iter, report, waits, original_text):
+    """逐句粘贴 AI 流式输出
+
+    AI 输出中途中断时，在已粘贴的部分之后再粘贴原始文本，保证内容不会丢失，
+    并通过 error 进度事件通知手机端。
+
+    Args:
+        chunks_iter: 句子级输出的异步迭代器
+        report: ``async report(stage, **info)`` 进度回调，首段写入剪贴板时报告 clipboard_set
+        waits: 累计各同步等待的毫秒数（clipboard_settle, paste_consumed）
+        original_text: 原始文本，AI 输出中断时作为补充粘贴
+
+    Returns:
+        Optional[tuple]: (已粘贴的完整文本, 粘贴是否全部成功, AI 输出是否中断)；
+            若未收到任何输出则返回 None，由调用方回退到原始文本
+    """
+    from ai.streaming import StreamInterrupted
+
+    chunks = []
+    unpasted = []
+    paste_ok = True
+    interrupted = False
+    consume_max = get_wait_ceiling('AIPUT_PASTE_CONSUME_MAX', '0.5')
+    waits.setdefault('clipboard_settle', 0)
+
+    async def pieces():
+        nonlocal interrupted
+        try:
+            async for chunk in chunks_iter:
+                yield chunk
+        except StreamInterrupted as e:
+            interrupted = True
+            print(f"  ⚠ AI流式输出中断 ({e})，补充粘贴原始文本")
+            metrics.inc('aiput_errors_total', stage='ai_stream')
+            await report('error', error='AI 输出中断', partial=True)
+            if chunks:
+                separator = '' if chunks[-1].endswith('\n') else '\n'
+                yield separator + original_text
+
+    async for chunk in pieces():
+        chunks.append(chunk)
+        if not paste_ok:
+            # 键盘模拟已失败，剩余内容稍后一次性放入剪贴板
+            unpasted.append(chunk)
+            continue
+
+        if len(chunks) > 1:
+            # 上一句被目标应用取走前不能覆盖剪贴板（无法观察时不等待）
+            consumed = await platform_adapters.clipboard.wait_paste_consumed(consume_max)
+            if consumed is not None:
+                waits['paste_consumed'] = waits.get('paste_consumed', 0) + round(consumed * 1000)
+
+        if not await copy_to_clipboard(chunk):
+            print("  ✗ 剪贴板操作失败 (流式)")
+            paste_ok = False
+            unpasted.append(chunk)
+            continue
+        if len(chunks) == 1:
+            await report('clipboard_set')
+        # 等待剪贴板内容可读（已确认取得剪贴板所有权时无需等待）
+        waits['clipboard_settle'] += await wait_clipboard_settled(chunk)
+        if not await send_paste():
+            print("  ⚠ 键盘模拟失败 (流式)")
+            paste_ok = False
+            unpasted.append(chunk)
+            continue
+        if len(chunks) == 1:
+            print("  ✓ 已粘贴首句")
+
+    if not chunks:
+        return None
+
+    if unpasted:
+        # 未能粘贴的部分留在剪贴板，供用户手动粘贴
+        await copy_to_clipboard(''.join(unpasted))
+
+    processed_text = ''.join(chunks)
+    display_processed = processed_text[:50] + "..." if len(processed_text) > 50 else processed_text
+    print(f"  ✓ AI流式处理完成 ({len(chunks)} 段): {display_processed}")
+    return processed_text, paste_ok, interrupted
+
 def get_host_ip():
     """获取主要的本机 IP 地址"""
     try:
@@ -426,6 +1027,9 @@ def get_qr_ips():
 def generate_qr_code(ip, port):
     """生成二维码图片"""
     try:
+        import qrcode
+        from PIL import Image
+
         # 构建URL
         url = f"http://{ip}:{port}"
 
@@ -450,17 +1054,98 @@ def generate_qr_code(ip, port):
         print(f"生成二维码失败: {e}")
         return None, None
 
+def import_qrcode_without_pil():
+    """导入 qrcode 但不加载 PIL
+
+    qrcode 8 导入时会顺带加载基于 PIL 的绘制器（ImportError 时自动跳过）；
+    字符二维码用不到它们，导入期间暂时屏蔽 PIL。
+    """
+    if 'PIL' in sys.modules or 'qrcode' in sys.modules:
+        import qrcode
+        return qrcode
+    sys.modules['PIL'] = None
+    try:
+        import qrcode
+    finally:
+        del sys.modules['PIL']
+    return qrcode
+
+def print_qr_code(url):
+    """在终端以字符形式打印二维码（无需 PIL）"""
+    try:
+        qrcode = import_qrcode_without_pil()
+        qr = qrcode.QRCode(border=1)
+        qr.add_data(url)
+        qr.make(fit=True)
+        qr.print_ascii(invert=True)
+    except ImportError:
+        print("  (未安装 qrcode，无法显示二维码)")
+    except Exception as e:
+        print(f"生成二维码失败: {e}")
+
+def get_default_port():
+    """Get listening port from environment variable (default: 37856)"""
+    try:
+        return int(os.environ.get('AIPUT_PORT', '37856'))
+    except ValueError:
+        return 37856
+
+def run_headless(host, port):
+    """无界面模式：不导入 tkinter/PIL，在终端显示地址与二维码
+
+    支持 systemd 套接字激活（.socket 单元）和 Type=notify 就绪通知。
+    """
+    import systemd_notify
+
+    # 初始化与 GUI 模式相同，只是不必与窗口构建并行，也不创建托盘图标
+    init_services(headless=True)
+
+    sockets = systemd_notify.listen_sockets()
+    if sockets:
+        if get_server_backend() == 'flask':
+            print("⚠ 套接字激活仅支持 aiohttp 后端，已改用 aiohttp")
+        sock = sockets[0]
+        host, port = sock.getsockname()[:2]
+        print(f"✓ 使用 systemd 传入的监听套接字 {host}:{port}")
+    else:
+        sock = None
+
+    with span('start web server'):
+        start_web_server(host, port, sock)
+
+    keep_alive = None
+    if platform_adapters and hasattr(platform_adapters, 'keyboard'):
+        interval = get_keep_alive_interval()
+        keep_alive = KeepAliveThread(platform_adapters.keyboard, interval=interval,
+                                     processing_service=processing_service)
+        keep_alive.start()
+        print(f"✓ Keep-alive 线程已启动 (间隔: {interval}秒)")
+
+    qr_ip = host if host not in ('0.0.0.0', '', '::') else (get_qr_ips() or ['127.0.0.1'])[0]
+    url = f"http://{qr_ip}:{port}"
+    print(f"✓ 服务已启动在 http://{host}:{port}")
+    print(f"手机扫码访问: {url}")
+    print_qr_code(url)
+    print_report()
+
+    systemd_notify.notify(f"READY=1\nSTATUS=Listening on {url}")
+
+    # 主线程只等待退出信号（signal_handler 调用 sys.exit）
+    watchdog = systemd_notify.watchdog_interval()
+    stop = threading.Event()
+    try:
+        while not stop.wait(watchdog):
+            systemd_notify.notify("WATCHDOG=1")
+    finally:
+        systemd_notify.notify("STOPPING=1")
+        if keep_alive:
+            keep_alive.stop()
+
 # GUI 主程序
 class ServerApp:
     def __init__(self, root):
         self.root = root
 
-        # 确保平台适配器已初始化（可能已经在 Flask 启动时初始化了）
-        global platform_adapters, platform_info
-        if platform_adapters is None:
-            print("正在初始化平台适配器...")
-            platform_adapters, platform_info = init_platform_adapters()
-
         # 设置窗口标题
         title = "AIPut (跨平台版)"
         self.root.title(title)
@@ -479,7 +1164,7 @@ class ServerApp:
 
         self.all_ips = get_all_ips()
         self.ip_var = tk.StringVar(value=self.all_ips[0])
-        self.port_var = tk.StringVar(value="37856")
+        self.port_var = tk.StringVar(value=str(get_default_port()))
         self.is_running = False
         self.auto_start_enabled = True  # 默认启用自动启动
 
@@ -495,16 +1180,9 @@ class ServerApp:
         main_frame = tk.Frame(root, padx=20, pady=20)
         main_frame.pack(expand=True, fill='both')
 
-        # 显示环境信息
-        if platform_info:
-            env_text = f"操作系统: {platform_info.os_name}"
-            if platform_info.display_protocol:
-                env_text += f" | 显示: {platform_info.display_protocol}"
-            if platform_info.desktop_environment:
-                env_text += f" | 桌面: {platform_info.desktop_environment}"
-
-            env_label = tk.Label(main_frame, text=env_text, fg="#888", font=("Arial", 9))
-            env_label.pack(anchor='w', pady=(0, 10))
+        # 显示环境信息（平台检测在后台进行，完成后填入）
+        self.env_label = tk.Label(main_frame, text="", fg="#888", font=("Arial", 9))
+        self.env_label.pack(anchor='w', pady=(0, 10))
 
         # 其余UI代码...（简化版本）
         tk.Label(main_frame, text="本机 IP:", font=("Arial", 10, "bold")).pack(anchor='w')
@@ -547,12 +1225,35 @@ class ServerApp:
         self.port_var.trace_add('write', self.on_port_change)
 
         # 显示初始二维码
-        self.root.after(200, self.update_qr_code)
+        self.root.after_idle(self.update_qr_code)
+
+        # 平台适配器与 AI 服务就绪后显示环境信息并自动启动服务
+        self.when_services_ready(self.on_services_ready)
+
+    def when_services_ready(self, callback):
+        """在后台初始化完成后于 GUI 线程中执行 callback"""
+        if services_ready.is_set():
+            callback()
+        else:
+            self.root.after(20, self.when_services_ready, callback)
+
+    def on_services_ready(self):
+        """后台初始化完成"""
+        if platform_info:
+            env_text = f"操作系统: {platform_info.os_name}"
+            if platform_info.display_protocol:
+                env_text += f" | 显示: {platform_info.display_protocol}"
+            if platform_info.desktop_environment:
+                env_text += f" | 桌面: {platform_info.desktop_environment}"
+            self.env_label.config(text=env_text)
+        else:
+            self.env_label.pack_forget()
 
         # 自动启动服务
         if self.auto_start_enabled:
-            # 延迟执行以确保UI完全加载
-            self.root.after(100, self.auto_start_service)
+            with span('start web server'):
+                self.auto_start_service()
+        self.root.after_idle(print_report)
 
     def auto_start_service(self):
         """自动启动服务"""
@@ -578,9 +1279,8 @@ class ServerApp:
             else:
                 listen_host = host_ip
 
-            # 启动 Flask
-            t = threading.Thread(target=lambda: app.run(host=listen_host, port=port, debug=False, use_reloader=False), daemon=True)
-            t.start()
+            # 启动 HTTP 服务
+            start_web_server(listen_host, port)
 
             self.is_running = True
             self.btn_start.config(text="停止服务", bg="#ff3b30")
@@ -593,7 +1293,8 @@ class ServerApp:
                     interval = get_keep_alive_interval()
                     self.keep_alive_thread = KeepAliveThread(
                         platform_adapters.keyboard,
-                        interval=interval
+                        interval=interval,
+                        processing_service=processing_service
                     )
                     self.keep_alive_thread.start()
                     print(f"✓ Keep-alive 线程已启动 (间隔: {interval}秒)")
@@ -610,6 +1311,8 @@ class ServerApp:
         """切换服务器状态"""
         global platform_adapters
         if not self.is_running:
+            # 确保后台初始化已完成
+            services_ready.wait()
             port_str = self.port_var.get()
             if not port_str.isdigit():
                 messagebox.showerror("错误", "端口必须是数字")
@@ -623,9 +1326,8 @@ class ServerApp:
             else:
                 listen_host = host_ip
 
-            # 启动 Flask
-            t = threading.Thread(target=lambda: app.run(host=listen_host, port=port, debug=False, use_reloader=False), daemon=True)
-            t.start()
+            # 启动 HTTP 服务
+            start_web_server(listen_host, port)
 
             self.is_running = True
             self.btn_start.config(text="停止服务", bg="#ff3b30")
@@ -638,7 +1340,8 @@ class ServerApp:
                     interval = get_keep_alive_interval()
                     self.keep_alive_thread = KeepAliveThread(
                         platform_adapters.keyboard,
-                        interval=interval
+                        interval=interval,
+                        processing_service=processing_service
                     )
                     self.keep_alive_thread.start()
                     print(f"✓ Keep-alive 线程已启动 (间隔: {interval}秒)")
@@ -669,11 +1372,13 @@ class ServerApp:
             qr_ip = self.qr_ip_var.get()
 
             # 生成二维码
-            img, url = generate_qr_code(qr_ip, int(port))
+            with span('QR code'):
+                img, url = generate_qr_code(qr_ip, int(port))
             if img is None:
                 return
 
             # 转换图片为 tkinter 可用的格式
+            from PIL import ImageTk
             self.qr_photo = ImageTk.PhotoImage(img)
 
             # 更新 URL
@@ -712,20 +1417,61 @@ class ServerApp:
             self.keep_alive_thread = None
         if platform_adapters and hasattr(platform_adapters, 'system_tray'):
             platform_adapters.system_tray.stop()
+        shutdown_web_server()
+        shutdown_processing_service()
         self.root.quit()
 
+def shutdown_processing_service():
+    """关闭 AI 处理服务的连接池"""
+    if processing_service:
+        try:
+            processing_service.close()
+            print("✓ AI 连接池已关闭")
+        except Exception as e:
+            print(f"⚠ AI 连接池关闭失败: {e}")
+
 def signal_handler(signum, frame):
     """处理信号"""
     print("\n收到退出信号，正在退出...")
+    shutdown_web_server()
+    shutdown_processing_service()
     sys.exit(0)
 
+def parse_args():
+    """解析命令行参数"""
+    import argparse
+    parser = argparse.ArgumentParser(description="AIPut 远程输入服务")
+    parser.add_argument('--headless', action='store_true',
+                        help="无界面运行（后台服务 / systemd），在终端显示地址与二维码")
+    parser.add_argument('--host', default=os.environ.get('AIPUT_HOST', '0.0.0.0'),
+                        help="无界面模式的监听地址（默认 AIPUT_HOST 或 0.0.0.0）")
+    parser.add_argument('--port', type=int, default=get_default_port(),
+                        help="无界面模式的监听端口（默认 AIPUT_PORT 或 37856）")
+    parser.add_argument('--profile-startup', action='store_true',
+                        help="打印启动各阶段耗时")
+    return parser.parse_args()
+
 if __name__ == '__main__':
+    args = parse_args()
+    startup_profile.enabled = args.profile_startup
+
     # 注册信号处理器
     import signal
     signal.signal(signal.SIGTERM, signal_handler)
     signal.signal(signal.SIGINT, signal_handler)
 
-    # 创建并运行 GUI
-    root = tk.Tk()
-    app_gui = ServerApp(root)
+    if args.headless:
+        run_headless(args.host, args.port)
+        sys.exit(0)
+
+    # 平台适配器与 AI 服务在后台初始化，与 GUI 构建并行
+    start_services()
+
+    # 创建并运行 GUI（tkinter 仅在此时导入）
+    with span('import tkinter'):
+        import tkinter as tk
+        from tkinter import messagebox, ttk
+    with span('build GUI'):
+        root = tk.Tk()
+        app_gui = ServerApp(root)
     root.mainloop()
\ No newline at end of file
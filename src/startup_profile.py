@@ -0,0 +1,69 @@
+"""Startup timing spans for ``--profile-startup``
+
+Usage::
+
+    with span("import flask"):
+        import flask
+
+The report lists each span's start offset and duration, measured with
+``time.perf_counter`` from the moment this module was imported (the first
+thing remote_server does). Spans may run on several threads; the thread
+name is shown so overlapping work is visible. For a per-module breakdown,
+also run the interpreter with ``-X importtime``.
+
+Spans are always recorded (a few perf_counter calls each), because the
+earliest ones close before the command line is parsed; ``enabled`` is set
+from the parsed ``--profile-startup`` option and only decides whether the
+report is printed.
+"""
+
+import sys
+import time
+import threading
+from contextlib import contextmanager
+from typing import List, Tuple
+
+_origin = time.perf_counter()
+_spans: List[Tuple[str, float, float, str]] = []
+_lock = threading.Lock()
+
+# Set by remote_server from the parsed command line
+enabled = False
+
+
+@contextmanager
+def span(name: str):
+    """Record how long the enclosed block takes"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        with _lock:
+            _spans.append((name, start - _origin, end - start, threading.current_thread().name))
+
+
+def elapsed_ms() -> float:
+    """Milliseconds since startup profiling began"""
+    return (time.perf_counter() - _origin) * 1000
+
+
+def report() -> str:
+    """Format the recorded spans, in start order"""
+    with _lock:
+        spans = sorted(_spans, key=lambda s: s[1])
+    width = max([len(name) for name, _, _, _ in spans] + [4])
+    lines = [f"=== 启动耗时 (共 {elapsed_ms():.0f}ms) ===",
+             f"{'start':>8}  {'took':>8}  {'span':<{width}}  thread"]
+    for name, start, duration, thread in spans:
+        lines.append(f"{start * 1000:7.1f}ms {duration * 1000:7.1f}ms  {name:<{width}}  {thread}")
+    if 'importtime' not in getattr(sys, '_xoptions', {}):
+        lines.append("提示: 使用 python -X importtime src/remote_server.py --profile-startup 2> imports.log "
+                     "查看逐个模块的导入耗时")
+    return '\n'.join(lines)
+
+
+def print_report():
+    """Print the report if --profile-startup was given"""
+    if enabled:
+        print(report())
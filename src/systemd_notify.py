@@ -0,0 +1,73 @@
+"""systemd integration for headless mode: socket activation and sd_notify
+
+Implemented with the standard library only (no python-systemd dependency):
+
+- ``listen_sockets()`` returns sockets passed by a ``.socket`` unit
+  (``LISTEN_FDS`` / ``LISTEN_PID``, descriptors starting at 3).
+- ``notify()`` sends ``READY=1`` / ``STATUS=...`` / ``STOPPING=1`` /
+  ``WATCHDOG=1`` datagrams to ``NOTIFY_SOCKET`` (``Type=notify`` units).
+
+Both are no-ops when not started by systemd.
+"""
+
+import os
+import socket
+from typing import List, Optional
+
+SD_LISTEN_FDS_START = 3
+
+
+def listen_sockets() -> List[socket.socket]:
+    """Sockets handed over by systemd socket activation (empty if none)"""
+    try:
+        if int(os.environ.get('LISTEN_PID', '0')) != os.getpid():
+            return []
+        count = int(os.environ.get('LISTEN_FDS', '0'))
+    except ValueError:
+        return []
+
+    # Do not pass the descriptors on to child processes (players, helpers)
+    for name in ('LISTEN_PID', 'LISTEN_FDS', 'LISTEN_FDNAMES'):
+        os.environ.pop(name, None)
+
+    sockets = []
+    for fd in range(SD_LISTEN_FDS_START, SD_LISTEN_FDS_START + count):
+        os.set_inheritable(fd, False)
+        sockets.append(socket.socket(fileno=fd))
+    return sockets
+
+
+def notify(state: str) -> bool:
+    """Send a state string to the service manager
+
+    Args:
+        state: Newline-separated assignments, e.g. ``"READY=1\\nSTATUS=Listening"``
+
+    Returns:
+        bool: True if the message was sent
+    """
+    address = os.environ.get('NOTIFY_SOCKET')
+    if not address:
+        return False
+    if address.startswith('@'):
+        # Abstract namespace socket
+        address = '\0' + address[1:]
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+            sock.connect(address)
+            sock.sendall(state.encode('utf-8'))
+        return True
+    except OSError:
+        return False
+
+
+def watchdog_interval() -> Optional[float]:
+    """Seconds between WATCHDOG=1 pings (half of WatchdogSec), or None if disabled"""
+    try:
+        usec = int(os.environ.get('WATCHDOG_USEC', '0'))
+        pid = int(os.environ.get('WATCHDOG_PID', os.getpid()))
+    except ValueError:
+        return None
+    if usec <= 0 or pid != os.getpid():
+        return None
+    return usec / 1e6 / 2
@@ -0,0 +1,179 @@
+"""WebSocket channel between the phone page and the server
+
+Frames are JSON objects with a ``type`` field:
+
+    client -> server
+        hello     {"session": <id or null>}   attach (or resume) a session
+        ping      {"t": <client timestamp>}   application-level heartbeat
+        send      {"id": <message id>, "body": {...same as POST /type...}}
+
+    server -> client
+        welcome   {"session": <id>}
+        pong      {"t": <echoed timestamp>}
+        ack       {"id": ...}                 message received
+        progress  {"id": ..., "stage": ...}   processing / paste status
+        result    {"id": ..., "data": {...same as the /type response...}}
+        busy      {"id": ..., "data": {...}}   rejected, injection queue full
+
+Messages are remembered per session by id, so a client that reconnects and
+re-sends a message it never got a result for receives the stored result
+instead of typing the text a second time.
+"""
+
+import os
+import json
+import time
+import uuid
+import asyncio
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional
+
+import metrics
+
+
+class ChannelSession:
+    """Messages of one phone page, kept across reconnects"""
+
+    def __init__(self, session_id: str, max_messages: int):
+        self.id = session_id
+        self.ws = None
+        self.tasks: "OrderedDict[str, asyncio.Task]" = OrderedDict()
+        self.last_seen = time.monotonic()
+        self.max_messages = max_messages
+
+    async def send(self, frame: dict):
+        """Send a frame to the current socket; dropped while disconnected"""
+        ws = self.ws
+        if ws is None or ws.closed:
+            return
+        try:
+            await ws.send_json(frame)
+        except (ConnectionError, RuntimeError):
+            pass
+
+    def remember(self, msg_id: str, task: asyncio.Task):
+        """Track a message, forgetting the oldest finished ones"""
+        self.tasks[msg_id] = task
+        while len(self.tasks) > self.max_messages:
+            oldest = next(iter(self.tasks.values()))
+            if not oldest.done():
+                break
+            self.tasks.popitem(last=False)
+
+    def idle(self) -> bool:
+        """True if no socket is attached and no message is in progress"""
+        return (self.ws is None or self.ws.closed) and all(task.done() for task in self.tasks.values())
+
+
+class WebSocketChannel:
+    """aiohttp WebSocket endpoint carrying send/ack/progress/result frames"""
+
+    def __init__(self, handler: Callable[..., Awaitable[dict]], heartbeat: Optional[float] = None,
+                 session_ttl: Optional[float] = None, max_messages: int = 32):
+        """
+        Initialize WebSocket channel
+
+        Args:
+            handler: ``async handler(body, client_ip, progress) -> dict``, where
+                ``progress`` is ``async progress(stage, **info)``
+            heartbeat: Seconds between protocol pings (if None, will try to get from environment)
+            session_ttl: Seconds a disconnected session is kept for resume
+                (if None, will try to get from environment)
+            max_messages: Finished messages remembered per session
+        """
+        self.handler = handler
+        self.heartbeat = heartbeat or float(os.getenv("AIPUT_WS_HEARTBEAT", "15"))
+        self.session_ttl = session_ttl or float(os.getenv("AIPUT_WS_SESSION_TTL", "600"))
+        self.max_messages = max_messages
+        self._sessions: Dict[str, ChannelSession] = {}
+
+    def _attach(self, session_id: Optional[str], ws) -> ChannelSession:
+        """Attach a socket to an existing session or a new one"""
+        self._expire()
+        session = self._sessions.get(session_id) if session_id else None
+        if session is None:
+            session = ChannelSession(session_id or uuid.uuid4().hex, self.max_messages)
+            self._sessions[session.id] = session
+        session.ws = ws
+        session.last_seen = time.monotonic()
+        return session
+
+    def _expire(self):
+        """Drop idle sessions that have not reconnected within the TTL"""
+        now = time.monotonic()
+        for session_id, session in list(self._sessions.items()):
+            if session.idle() and now - session.last_seen > self.session_ttl:
+                del self._sessions[session_id]
+
+    async def handle(self, request):
+        """aiohttp request handler for the WebSocket route"""
+        from aiohttp import web, WSMsgType
+
+        ws = web.WebSocketResponse(heartbeat=self.heartbeat)
+        await ws.prepare(request)
+        client_ip = request.headers.get("X-Forwarded-For", request.remote or "unknown")
+
+        session = None
+        try:
+            async for message in ws:
+                if message.type != WSMsgType.TEXT:
+                    continue
+                parse_started = time.perf_counter()
+                try:
+                    frame = json.loads(message.data)
+                except ValueError:
+                    continue
+                if not isinstance(frame, dict):
+                    continue
+
+                kind = frame.get("type")
+                if kind == "hello":
+                    session = self._attach(frame.get("session"), ws)
+                    await ws.send_json({"type": "welcome", "session": session.id})
+                elif kind == "ping":
+                    await ws.send_json({"type": "pong", "t": frame.get("t")})
+                elif kind == "send":
+                    metrics.observe("aiput_stage_seconds", time.perf_counter() - parse_started, stage="parse")
+                    if session is None:
+                        session = self._attach(None, ws)
+                    await self._on_send(session, frame, client_ip)
+        finally:
+            if session and session.ws is ws:
+                session.ws = None
+                session.last_seen = time.monotonic()
+        return ws
+
+    async def _on_send(self, session: ChannelSession, frame: dict, client_ip: str):
+        """Start a message, or replay the result of one already received"""
+        msg_id = str(frame.get("id") or uuid.uuid4().hex)
+        await session.send({"type": "ack", "id": msg_id})
+
+        task = session.tasks.get(msg_id)
+        if task is None:
+            body = frame.get("body")
+            task = asyncio.ensure_future(self._run(session, msg_id, body if isinstance(body, dict) else {}, client_ip))
+            session.remember(msg_id, task)
+        elif task.done():
+            await session.send({"type": "result", "id": msg_id, "data": task.result()})
+        # Otherwise the result is pushed to this socket when the task finishes
+
+    async def _run(self, session: ChannelSession, msg_id: str, body: dict, client_ip: str) -> dict:
+        """Run one message through the handler and push its result"""
+        async def progress(stage: str, **info):
+            # Non-fatal errors (e.g. an interrupted AI stream) get their own frame type
+            kind = "error" if stage == "error" else "progress"
+            await session.send(dict(info, type=kind, id=msg_id, stage=stage))
+
+        try:
+            result = await self.handler(body, client_ip, progress)
+        except Exception as e:
+            print(f"[WebSocket] Message {msg_id} failed: {str(e)}")
+            result = {"success": False}
+
+        if result.get("busy"):
+            # Rejected without side effects: forget it so a retry runs again
+            session.tasks.pop(msg_id, None)
+            await session.send({"type": "busy", "id": msg_id, "data": result})
+        else:
+            await session.send({"type": "result", "id": msg_id, "data": result})
+        return result
@@ -0,0 +1,48 @@
+from ai.chunking import split_text
+
+
+def joined(chunks):
+    return "".join(chunk.text + chunk.joiner for chunk in chunks)
+
+
+def test_short_text_is_one_chunk():
+    chunks = split_text("  hello world  ", 300)
+    assert [chunk.text for chunk in chunks] == ["hello world"]
+
+
+def test_paragraphs_are_packed_up_to_limit():
+    text = "\n\n".join(["a" * 100, "b" * 100, "c" * 100])
+    chunks = split_text(text, 210)
+    assert [chunk.text for chunk in chunks] == ["a" * 100 + "\n\n" + "b" * 100, "c" * 100]
+    assert joined(chunks) == text
+
+
+def test_long_paragraph_splits_between_sentences():
+    text = " ".join(f"Sentence number {i} is here." for i in range(40))
+    chunks = split_text(text, 200)
+    assert len(chunks) > 1
+    assert all(len(chunk.text) <= 200 for chunk in chunks)
+    assert all(chunk.text.endswith(".") for chunk in chunks)
+    assert joined(chunks) == text
+
+
+def test_run_on_sentence_splits_at_whitespace():
+    text = " ".join(["word"] * 300)
+    chunks = split_text(text, 300)
+    assert all(len(chunk.text) <= 300 for chunk in chunks)
+    assert all(chunk.text.startswith("word") and chunk.text.endswith("word") for chunk in chunks)
+    assert joined(chunks) == text
+
+
+def test_text_without_whitespace_is_cut_and_glued():
+    text = "a" * 1000
+    chunks = split_text(text, 300)
+    assert [len(chunk.text) for chunk in chunks] == [300, 300, 300, 100]
+    assert joined(chunks) == text
+
+
+def test_cjk_is_joined_without_spaces():
+    text = "这是一个很长的句子。" * 50
+    chunks = split_text(text, 100)
+    assert len(chunks) > 1
+    assert joined(chunks) == text
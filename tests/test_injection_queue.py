@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+from injection_queue import InjectionQueue, InjectionQueueFull
+
+
+def test_rejects_when_full():
+    queue = InjectionQueue(max_depth=2)
+    queue.reserve()
+    queue.reserve()
+    with pytest.raises(InjectionQueueFull):
+        queue.reserve()
+    assert queue.stats()["rejected"] == 1
+
+
+def test_turns_follow_ticket_order():
+    queue = InjectionQueue(max_depth=8)
+    order = []
+
+    async def request(ticket, delay):
+        # Later tickets finish their "AI processing" first
+        await asyncio.sleep(delay)
+        await queue.acquire(ticket)
+        order.append(ticket)
+        queue.release(ticket)
+
+    async def main():
+        tickets = [queue.reserve() for _ in range(3)]
+        await asyncio.gather(*(request(ticket, 0.03 - 0.01 * i) for i, ticket in enumerate(tickets)))
+
+    asyncio.run(main())
+    assert order == [0, 1, 2]
+    assert queue.stats()["completed"] == 3
+    assert queue.depth() == 0
+
+
+def test_released_ticket_is_skipped():
+    queue = InjectionQueue(max_depth=8)
+
+    async def main():
+        first, second, third = (queue.reserve() for _ in range(3))
+        assert queue.position(third) == 2
+        queue.release(second)
+        await queue.acquire(first)
+        waiter = asyncio.ensure_future(queue.acquire(third))
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        queue.release(first)
+        await asyncio.wait_for(waiter, 1)
+        queue.release(third)
+
+    asyncio.run(main())
+    assert queue.stats()["completed"] == 2
+
+
+def test_acquire_is_reentrant_and_release_idempotent():
+    queue = InjectionQueue(max_depth=8)
+
+    async def main():
+        ticket = queue.reserve()
+        await queue.acquire(ticket)
+        await asyncio.wait_for(queue.acquire(ticket), 1)
+        queue.release(ticket)
+        queue.release(ticket)
+
+    asyncio.run(main())
+    assert queue.stats()["completed"] == 1
@@ -0,0 +1,62 @@
+import pytest
+
+from metrics import BUCKET_BOUNDS, Histogram, MetricsRegistry
+
+
+def test_histogram_percentiles_are_within_bucket_accuracy():
+    histogram = Histogram()
+    for ms in range(1, 1001):
+        histogram.observe(ms / 1000)
+    assert histogram.count == 1000
+    assert histogram.percentile(50) == pytest.approx(0.5, rel=0.25)
+    assert histogram.percentile(99) == pytest.approx(0.99, rel=0.25)
+    assert histogram.percentile(100) == pytest.approx(1.0)
+    assert Histogram().percentile(50) is None
+
+
+def test_histogram_cumulative_counts():
+    histogram = Histogram()
+    for value in (0.001, 0.01, 0.1, 100.0):
+        histogram.observe(value)
+    cumulative = dict(histogram.cumulative(BUCKET_BOUNDS))
+    assert cumulative[BUCKET_BOUNDS[-1]] == 3
+    assert histogram.summary()["max_ms"] == 100000.0
+
+
+def test_counters_and_labels():
+    registry = MetricsRegistry()
+    registry.inc("aiput_errors_total", stage="paste")
+    registry.inc("aiput_errors_total", stage="paste")
+    registry.inc("aiput_errors_total", stage="ai", tool=None)
+    counters = registry.snapshot()["counters"]["aiput_errors_total"]
+    assert counters == {"stage=paste": 2, "stage=ai": 1}
+
+
+def test_timer_observes_when_block_raises():
+    registry = MetricsRegistry()
+    with pytest.raises(RuntimeError):
+        with registry.timer("aiput_stage_seconds", stage="paste"):
+            raise RuntimeError
+    assert registry.snapshot()["histograms"]["aiput_stage_seconds"]["stage=paste"]["count"] == 1
+
+
+def test_failing_collector_is_ignored():
+    registry = MetricsRegistry()
+    registry.register_collector(lambda: [("aiput_ai_hedges_total", {}, 4)])
+
+    def broken():
+        raise RuntimeError
+    registry.register_collector(broken)
+    assert registry.snapshot()["counters"]["aiput_ai_hedges_total"] == {"_": 4}
+
+
+def test_prometheus_exposition():
+    registry = MetricsRegistry()
+    registry.observe("aiput_stage_seconds", 0.02, stage='say "hi"')
+    registry.inc("aiput_requests_total", outcome="ok")
+    text = registry.render_prometheus()
+    assert "# TYPE aiput_stage_seconds histogram" in text
+    assert 'aiput_stage_seconds_bucket{stage="say \\"hi\\"",le="+Inf"} 1' in text
+    assert 'aiput_stage_seconds_count{stage="say \\"hi\\""} 1' in text
+    assert 'aiput_requests_total{outcome="ok"} 1' in text
+    assert text.endswith("\n")
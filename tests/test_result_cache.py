@@ -0,0 +1,83 @@
+import asyncio
+
+from ai.result_cache import ResultCache
+
+
+def get(cache, key):
+    return asyncio.run(cache.get(key))
+
+
+def test_key_depends_on_every_field():
+    base = ResultCache.make_key("zai", "glm", "prompt", "text", 0.3)
+    assert base == ResultCache.make_key("zai", "glm", "prompt", "text", 0.3)
+    assert base != ResultCache.make_key("anthropic", "glm", "prompt", "text", 0.3)
+    assert base != ResultCache.make_key("zai", "other", "prompt", "text", 0.3)
+    assert base != ResultCache.make_key("zai", "glm", "prompt", "text", 0.7)
+
+
+def test_get_put_and_stats():
+    cache = ResultCache(max_entries=8, ttl=0)
+    assert get(cache, "k") is None
+    cache.put("k", "value")
+    assert get(cache, "k") == "value"
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["memory_entries"] == 1
+
+
+def test_lru_evicts_least_recently_used():
+    cache = ResultCache(max_entries=2, ttl=0)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    get(cache, "a")
+    cache.put("c", "3")
+    assert get(cache, "b") is None
+    assert get(cache, "a") == "1"
+    assert get(cache, "c") == "3"
+
+
+def test_expired_entries_are_dropped(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("ai.result_cache.time.time", lambda: now[0])
+    cache = ResultCache(max_entries=8, ttl=10)
+    cache.put("k", "value")
+    now[0] += 11
+    assert get(cache, "k") is None
+    assert cache.stats()["memory_entries"] == 0
+
+
+def test_persistent_tier_survives_restart(tmp_path):
+    db_path = str(tmp_path / "cache" / "ai_cache.sqlite3")
+    cache = ResultCache(max_entries=8, ttl=0, db_path=db_path)
+    cache.put("k", "value")
+    cache.close()
+
+    reopened = ResultCache(max_entries=8, ttl=0, db_path=db_path)
+    assert get(reopened, "k") == "value"
+    assert reopened.stats()["disk_hits"] == 1
+    reopened.close()
+
+
+def test_persistent_tier_is_capped(tmp_path):
+    cache = ResultCache(max_entries=0, ttl=0, db_path=str(tmp_path / "c.sqlite3"), max_disk_entries=2)
+    for key in "abc":
+        cache.put(key, key)
+    cache.flush()
+    assert cache.stats()["disk_entries"] == 2
+    cache.close()
+
+
+def test_disk_hits_batch_last_used(tmp_path):
+    db_path = str(tmp_path / "c.sqlite3")
+    cache = ResultCache(max_entries=0, ttl=0, db_path=db_path, max_disk_entries=2)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    cache.flush()
+    # A disk hit on "a" makes "b" the least recently used entry on disk
+    assert get(cache, "a") == "1"
+    cache.put("c", "3")
+    cache.flush()
+    assert get(cache, "b") is None
+    assert get(cache, "a") == "1"
+    cache.close()
@@ -0,0 +1,35 @@
+from ai.streaming import SentenceBuffer
+
+
+def test_releases_complete_sentences_only():
+    buffer = SentenceBuffer()
+    assert buffer.feed("Hello wor") is None
+    assert buffer.feed("ld. How are") == "Hello world."
+    assert buffer.feed(" you?") == " How are you?"
+    assert buffer.flush() is None
+
+
+def test_decimal_point_is_not_a_boundary():
+    buffer = SentenceBuffer()
+    assert buffer.feed("Pi is 3.14") is None
+    assert buffer.flush() == "Pi is 3.14"
+
+
+def test_cjk_terminators():
+    buffer = SentenceBuffer()
+    assert buffer.feed("你好。今天") == "你好。"
+    assert buffer.feed("天气不错！还有") == "今天天气不错！"
+    assert buffer.flush() == "还有"
+
+
+def test_short_fragments_merge_with_next_sentence():
+    buffer = SentenceBuffer(min_chars=5)
+    assert buffer.feed("Hi. ") is None
+    assert buffer.feed("Welcome back. ") == "Hi. Welcome back."
+
+
+def test_flush_strips_trailing_whitespace():
+    buffer = SentenceBuffer()
+    assert buffer.feed("no terminator  ") is None
+    assert buffer.flush() == "no terminator"
+    assert buffer.flush() is None
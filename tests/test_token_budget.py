@@ -0,0 +1,30 @@
+from ai.token_budget import TokenBudget, estimate_tokens
+
+
+def test_estimate_counts_cjk_per_character():
+    assert estimate_tokens("你好世界") == 4
+
+
+def test_estimate_counts_latin_per_four_characters():
+    assert estimate_tokens("abcd efgh i") == 3
+    assert estimate_tokens("   ") == 0
+
+
+def test_budget_scales_with_mode():
+    budget = TokenBudget(context_tokens=1000, default_ratio=2.0, headroom=0, min_tokens=1)
+    text = "字" * 100
+    assert budget.max_output_tokens(text, "general-refine", 4000) == 120
+    assert budget.max_output_tokens(text, "translate-en", 4000) == 160
+    assert budget.max_output_tokens(text, None, 4000) == 200
+
+
+def test_budget_is_clamped():
+    budget = TokenBudget(context_tokens=1000, default_ratio=2.0, headroom=200, min_tokens=256)
+    assert budget.max_output_tokens("hi", None, 4000) == 256
+    assert budget.max_output_tokens("字" * 5000, None, 4000) == 4000
+
+
+def test_fits_context_window():
+    budget = TokenBudget(context_tokens=100, default_ratio=2.0, headroom=0, min_tokens=1)
+    assert budget.fits("字" * 40, "字" * 10, 50)
+    assert not budget.fits("字" * 40, "字" * 10, 51)
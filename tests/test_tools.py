@@ -0,0 +1,23 @@
+import os
+import sys
+
+from platform_detection import tools
+
+
+def test_resolve_command_uses_absolute_path():
+    tools.clear_tool_cache()
+    interpreter = os.path.basename(sys.executable)
+    tools.remember_tools({interpreter: sys.executable})
+    assert tools.resolve_command([interpreter, "-V"]) == [sys.executable, "-V"]
+    tools.clear_tool_cache()
+
+
+def test_resolve_command_keeps_unknown_and_absolute_programs():
+    assert tools.resolve_command(["aiput-no-such-tool", "x"]) == ["aiput-no-such-tool", "x"]
+    assert tools.resolve_command(["/bin/sh", "-c", "true"]) == ["/bin/sh", "-c", "true"]
+
+
+def test_has_module_does_not_import():
+    assert tools.has_module("json")
+    assert not tools.has_module("aiput_no_such_module")
+    assert not tools.has_module("aiput_no_such_package.child")
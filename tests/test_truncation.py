@@ -0,0 +1,73 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from ai.anthropic_processor import AnthropicProcessor
+from ai.zai_processor import ZAIProcessor
+
+
+class FakeResponse:
+    status = 200
+    headers = {}
+
+    def __init__(self, data):
+        self._data = data
+
+    async def json(self):
+        return self._data
+
+
+class FakeSession:
+    """Answers each POST from a list of replies, recording max_tokens"""
+
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.max_tokens = []
+
+    @asynccontextmanager
+    async def post(self, url, json, headers, timeout):
+        self.max_tokens.append(json["max_tokens"])
+        yield FakeResponse(self.replies.pop(0))
+
+
+class FakePool:
+    def __init__(self, session):
+        self.session = session
+
+    def get(self, url):
+        return self.session
+
+
+def anthropic_reply(text, stop_reason):
+    return {"content": [{"type": "text", "text": text}], "stop_reason": stop_reason}
+
+
+def _processor(cls, replies):
+    processor = cls(api_key="key")
+    session = FakeSession(replies)
+    processor.session_pool = FakePool(session)
+    return processor, session
+
+
+def test_truncated_output_is_retried_at_the_cap():
+    processor, session = _processor(AnthropicProcessor, [
+        anthropic_reply("Half an ans", "max_tokens"),
+        anthropic_reply("The whole answer.", "end_turn"),
+    ])
+    result = asyncio.run(processor.process_text("text", "prompt", max_tokens=256))
+    assert result == "The whole answer."
+    assert session.max_tokens == [256, processor.max_tokens]
+
+
+def test_output_truncated_at_the_cap_is_rejected():
+    processor, session = _processor(AnthropicProcessor, [anthropic_reply("Half an ans", "max_tokens")])
+    assert asyncio.run(processor.process_text("text", "prompt")) is None
+    assert session.max_tokens == [processor.max_tokens]
+
+
+def test_openai_finish_reason_length_is_truncation():
+    processor, session = _processor(ZAIProcessor, [
+        {"choices": [{"message": {"content": "Half"}, "finish_reason": "length"}]},
+        {"choices": [{"message": {"content": "Whole."}, "finish_reason": "stop"}]},
+    ])
+    assert asyncio.run(processor.process_text("text", "prompt", max_tokens=256)) == "Whole."
+    assert session.max_tokens == [256, processor.max_tokens]
@@ -0,0 +1,47 @@
+import asyncio
+import sys
+
+from platform_adapters.linux.xdo_session import XdoSession
+
+# Stand-in for xdo_helper.py: types at delay_ms per character, then replies
+FAKE_HELPER = r'''
+import sys, json, time
+print("ready", flush=True)
+for line in sys.stdin:
+    request = json.loads(line)
+    if request.get("cmd") == "type":
+        time.sleep(len(request["text"]) * request["delay_ms"] / 1000)
+    print("ok", flush=True)
+'''
+
+
+def _session(timeout=0.2):
+    return XdoSession(timeout=timeout, helper_cmd=[sys.executable, '-c', FAKE_HELPER])
+
+
+def test_type_timeout_scales_with_text():
+    session = _session()
+    session.enabled = True
+    try:
+        # 20 chars * 20 ms = 0.4 s, twice the plain command timeout
+        assert asyncio.run(session.type_text('x' * 20, delay_ms=20)) is True
+        assert session.failures == 0
+    finally:
+        session.close()
+
+
+def test_unavailable_helper_asks_for_fallback():
+    session = XdoSession(timeout=0.2, helper_cmd=['aiput-no-such-helper'])
+    session.enabled = True
+    assert asyncio.run(session.send_keys('Shift+Insert')) is None
+    assert not session.enabled
+
+
+def test_helper_failure_after_write_does_not_fall_back():
+    session = _session(timeout=0.2)
+    session.enabled = True
+    try:
+        # The key timeout is exceeded mid-command: failure, not "fall back"
+        assert asyncio.run(session._send({'cmd': 'type', 'text': 'x' * 20, 'delay_ms': 20}, 0.2)) is False
+    finally:
+        session.close()